@@ -0,0 +1,191 @@
+"""Time every filesystem/SQLite cleanup item against synthetic profiles.
+
+Usage (from the repository root):
+    python benchmarks/bench_cleaners.py
+    python benchmarks/bench_cleaners.py --tiers small,medium,large --repeat 5
+    python benchmarks/bench_cleaners.py --items chrome_history,temp_files
+    python benchmarks/bench_cleaners.py --compare benchmarks/results/cleaners_abc1234_....json
+
+For each size tier and item the fake environment (see synthetic_env.py) is
+rebuilt with just the data that item needs, then only the item's run() is
+timed (wall and CPU time). Results are written as JSON under
+benchmarks/results/ with the commit they were measured on; --compare prints
+the median change against an earlier results file so regressions show up
+between commits. Cleaners run on the env's SandboxBackend, so registry,
+Recycle Bin, clipboard and event log items work on its in-memory registry
+and simulated shell, never on the live machine; --in-memory also puts the
+file tree on a RAM-backed directory to take the disk out of the timings.
+"""
+
+import argparse
+import datetime
+import json
+import os
+import platform
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, "..", "src"))
+sys.path.insert(0, HERE)
+
+from cleaners import CLEANER_CATEGORIES, deletion  # noqa: E402
+from cleaners.backends import ram_directory  # noqa: E402
+from synthetic_env import ITEM_BUILDERS, TIERS, SyntheticEnv  # noqa: E402
+
+RESULTS_DIR = os.path.join(HERE, "results")
+RESULTS_VERSION = 1
+# A median this much slower than the baseline is flagged by --compare.
+REGRESSION_RATIO = 1.10
+
+
+def _git_commit():
+    try:
+        out = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=HERE,
+            capture_output=True, text=True, timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def _category_of(item):
+    for cat_key, cat in CLEANER_CATEGORIES.items():
+        if item in cat["items"]:
+            return cat_key
+    raise KeyError(item)
+
+
+def run_item(env, tier, item):
+    """Build the item's data, scan it, then time one real run. Returns a sample dict."""
+    env.reset()
+    ITEM_BUILDERS[item](env, tier)
+    cleaner_class = CLEANER_CATEGORIES[_category_of(item)]["cleaner"]
+    estimate = cleaner_class(log_callback=lambda message: None, backend=env.backend).run(
+        [item], scan_only=True,
+    )[item]
+
+    cleaner = cleaner_class(log_callback=lambda message: None, backend=env.backend)
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    result = cleaner.run([item])[item]
+    cpu = time.process_time() - cpu
+    wall = time.perf_counter() - wall
+    return {
+        "wall": wall,
+        "cpu": cpu,
+        "items": estimate.items,
+        "bytes": estimate.bytes,
+        "rows": estimate.rows,
+        "errors": len(result.errors),
+    }
+
+
+def _summarize(samples):
+    walls = [s["wall"] for s in samples]
+    cpus = [s["cpu"] for s in samples]
+    first = samples[0]
+    return {
+        "wall": [round(w, 5) for w in walls],
+        "cpu": [round(c, 5) for c in cpus],
+        "median": round(statistics.median(walls), 5),
+        "min": round(min(walls), 5),
+        "cpu_median": round(statistics.median(cpus), 5),
+        "items": first["items"],
+        "bytes": first["bytes"],
+        "rows": first["rows"],
+        "errors": max(s["errors"] for s in samples),
+    }
+
+
+def compare(baseline_path, results):
+    with open(baseline_path, encoding="utf-8") as f:
+        baseline = json.load(f)
+    print(f"\nvs. {os.path.basename(baseline_path)} (commit {baseline.get('commit')})")
+    print(f"{'tier':<7} {'item':<18} {'base ms':>9} {'now ms':>9} {'change':>8}")
+    regressions = 0
+    for tier, items in results["results"].items():
+        for item, now in items.items():
+            base = baseline.get("results", {}).get(tier, {}).get(item)
+            if not base or not base["median"]:
+                continue
+            ratio = now["median"] / base["median"]
+            flag = "  slower" if ratio > REGRESSION_RATIO else ""
+            regressions += bool(flag)
+            print(f"{tier:<7} {item:<18} {base['median'] * 1000:>9.1f} {now['median'] * 1000:>9.1f} "
+                  f"{(ratio - 1) * 100:>+7.1f}%{flag}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tiers", default="small,medium", help=f"comma-separated ({', '.join(TIERS)})")
+    parser.add_argument("--items", default=None, help="comma-separated item keys (default: all benchmarkable)")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--root", default=None, help="scratch directory (default: system temp)")
+    parser.add_argument("--in-memory", action="store_true",
+                        help="build the trees on a RAM-backed directory (/dev/shm) instead of --root")
+    parser.add_argument("--output", default=None, help="results file (default: benchmarks/results/...)")
+    parser.add_argument("--compare", default=None, metavar="BASELINE", help="earlier results file")
+    args = parser.parse_args()
+
+    tiers = [TIERS[name] for name in args.tiers.split(",")]
+    items = args.items.split(",") if args.items else list(ITEM_BUILDERS)
+    unknown = [item for item in items if item not in ITEM_BUILDERS]
+    if unknown:
+        parser.error(f"not benchmarkable: {', '.join(unknown)}")
+
+    commit = _git_commit()
+    results = {
+        "version": RESULTS_VERSION,
+        "commit": commit,
+        "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "fd_walk": deletion._FD_WALK,
+        "delete_workers": deletion.MAX_DELETE_WORKERS,
+        "repeat": args.repeat,
+        "in_memory": args.in_memory,
+        "results": {},
+    }
+    scratch = tempfile.mkdtemp(prefix="mypcnow_bench_", dir=ram_directory() if args.in_memory else args.root)
+    env = SyntheticEnv(os.path.join(scratch, "env"))
+    try:
+        with env:
+            for tier in tiers:
+                print(f"\n[{tier.name}] {tier.profiles} profile(s), {tier.history_rows} urls, "
+                      f"{tier.cache_files} cache files, {tier.temp_files} temp files")
+                print(f"{'item':<18} {'median ms':>10} {'cpu ms':>8} {'items':>8} {'rows':>9} {'MB':>8}")
+                tier_results = results["results"][tier.name] = {}
+                for item in items:
+                    summary = _summarize([run_item(env, tier, item) for _ in range(args.repeat)])
+                    tier_results[item] = summary
+                    errors = f"  ({summary['errors']} errors)" if summary["errors"] else ""
+                    print(f"{item:<18} {summary['median'] * 1000:>10.1f} {summary['cpu_median'] * 1000:>8.1f} "
+                          f"{summary['items']:>8} {summary['rows']:>9} {summary['bytes'] / 1048576:>8.1f}{errors}")
+    finally:
+        shutil.rmtree(scratch, ignore_errors=True)
+
+    output = args.output
+    if output is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+        output = os.path.join(RESULTS_DIR, f"cleaners_{commit or 'nogit'}_{stamp}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(results, f, indent=2)
+        f.write("\n")
+    print(f"\nresults: {output}")
+
+    if args.compare:
+        regressions = compare(args.compare, results)
+        if regressions:
+            print(f"{regressions} item(s) slower than {REGRESSION_RATIO:.2f}x baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Serial vs. parallel deletion on a synthetic cache/temp tree.
+
+Usage (from the repository root):
+    python benchmarks/bench_parallel_delete.py
+    python benchmarks/bench_parallel_delete.py --files 50000 --workers 1,4,8
+
+Each run rebuilds the same tree: half of the files sit flat in a
+Cache_Data-style directory, the rest are spread over nested %TEMP%-style
+subtrees. Only the delete is timed.
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from cleaners import deletion  # noqa: E402
+
+
+def build_tree(root, files, file_size=512):
+    """Create `files` files under root; returns the directory to clear."""
+    target = os.path.join(root, "target")
+    payload = b"x" * file_size
+    flat = files // 2
+    cache = os.path.join(target, "Cache_Data")
+    os.makedirs(cache)
+    for i in range(flat):
+        with open(os.path.join(cache, f"f_{i:07d}"), "wb") as f:
+            f.write(payload)
+    nested = files - flat
+    per_dir = 200
+    for d in range((nested + per_dir - 1) // per_dir):
+        sub = os.path.join(target, f"tmp{d:05d}", "a", "b")
+        os.makedirs(sub)
+        for i in range(min(per_dir, nested - d * per_dir)):
+            with open(os.path.join(sub, f"{i}.tmp"), "wb") as f:
+                f.write(payload)
+    return target
+
+
+def run_once(root, files, workers):
+    target = build_tree(root, files)
+    # Clear the flat cache dir and the temp root, like clean_chrome_cache + clean_temp_files.
+    start = time.perf_counter()
+    cache = deletion.delete_dir_contents(os.path.join(target, "Cache_Data"), workers=workers)
+    temp = deletion.delete_dir_contents(target, workers=workers)
+    elapsed = time.perf_counter() - start
+    result = cache.merge(temp)
+    shutil.rmtree(target, ignore_errors=True)
+    return elapsed, result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", type=int, default=200_000)
+    parser.add_argument("--workers", default="1,2,4,8", help="comma-separated worker counts")
+    parser.add_argument("--root", default=None, help="scratch directory (default: system temp)")
+    args = parser.parse_args()
+
+    worker_counts = [int(w) for w in args.workers.split(",")]
+    deletion.MAX_DELETE_WORKERS = max(worker_counts)
+    root = tempfile.mkdtemp(prefix="mypcnow_bench_", dir=args.root)
+    try:
+        baseline = None
+        print(f"{args.files} files, fd-relative walk: {deletion._FD_WALK}")
+        print(f"{'workers':>7}  {'seconds':>8}  {'files/s':>9}  {'speedup':>7}")
+        for workers in worker_counts:
+            elapsed, result = run_once(root, args.files, workers)
+            if baseline is None:
+                baseline = elapsed
+            rate = result.files / elapsed if elapsed > 0 else 0.0
+            print(f"{workers:>7}  {elapsed:>8.2f}  {rate:>9.0f}  {baseline / elapsed:>6.2f}x")
+            for stats in result.workers:
+                print(f"{'':>9}{stats!r}")
+            if result.errors:
+                print(f"{'':>9}{len(result.errors)} errors")
+    finally:
+        shutil.rmtree(root, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Registry MRU cleanup: the old per-value loop vs. the registry engine.
+
+Usage (from the repository root):
+    python benchmarks/bench_registry_delete.py
+    python benchmarks/bench_registry_delete.py --subkeys 100 --values 500
+
+Each run rebuilds the same OpenSavePidlMRU-shaped tree in a MemoryRegistry
+(one subkey per file extension, each holding `--values` MRU entries, plus
+the top-level list) and clears it three ways:
+
+    legacy      EnumValue(key, 0) + DeleteValue until enumeration fails,
+                recursion per subkey and a KEY_ALL_ACCESS reopen of the
+                parent for every DeleteKey (the cleaners before registry.py)
+    engine      registry.clear_tree with DeleteTree hidden (the bottom-up walk)
+    deletetree  registry.clear_tree with DeleteTree (RegDeleteTreeW)
+
+Registry calls are counted per function and the tree is checked to be
+empty afterwards. MemoryRegistry, like Windows, rescans a key's value list
+after each change, so EnumValue(key, 0) after a delete is not free.
+"""
+
+import argparse
+import collections
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from cleaners.backends import MemoryRegistry  # noqa: E402
+from cleaners.instrument import CountingRegistry  # noqa: E402
+from cleaners.registry import clear_tree  # noqa: E402
+
+MRU_KEY = r"Software\Microsoft\Windows\CurrentVersion\Explorer\ComDlg32\OpenSavePidlMRU"
+
+
+def build_registry(subkeys, values):
+    registry = MemoryRegistry()
+    hive = registry.HKEY_CURRENT_USER
+    payload = b"\x14\x00\x1f\x50" * 16
+    with registry.CreateKey(hive, MRU_KEY) as key:
+        for i in range(values):
+            registry.SetValueEx(key, str(i), 0, registry.REG_BINARY, payload)
+        registry.SetValueEx(key, "MRUListEx", 0, registry.REG_BINARY, payload)
+    for ext in range(subkeys):
+        with registry.CreateKey(hive, f"{MRU_KEY}\\ext{ext:03d}") as key:
+            for i in range(values):
+                registry.SetValueEx(key, str(i), 0, registry.REG_BINARY, payload)
+            registry.SetValueEx(key, "MRUListEx", 0, registry.REG_BINARY, payload)
+    return registry
+
+
+class _WithoutDeleteTree:
+    """A winreg that lacks DeleteTree, like the stock winreg module."""
+
+    def __init__(self, module):
+        self._module = module
+
+    def __getattr__(self, name):
+        if name == "DeleteTree":
+            raise AttributeError(name)
+        return getattr(self._module, name)
+
+
+# --- The cleaners' registry code before the engine (AppTracesCleaner) ---
+
+def _legacy_values(winreg, hive, key_path):
+    try:
+        with winreg.OpenKey(hive, key_path, 0, winreg.KEY_ALL_ACCESS) as key:
+            while True:
+                try:
+                    name, _, _ = winreg.EnumValue(key, 0)
+                    winreg.DeleteValue(key, name)
+                except OSError:
+                    break
+        return True
+    except FileNotFoundError:
+        return False
+
+
+def _legacy_subkeys(winreg, hive, key_path):
+    try:
+        with winreg.OpenKey(hive, key_path, 0, winreg.KEY_ALL_ACCESS) as key:
+            subkeys = []
+            i = 0
+            while True:
+                try:
+                    subkeys.append(winreg.EnumKey(key, i))
+                    i += 1
+                except OSError:
+                    break
+        count = 0
+        for sk in subkeys:
+            child_path = f"{key_path}\\{sk}"
+            count += _legacy_subkeys(winreg, hive, child_path)
+            _legacy_values(winreg, hive, child_path)
+            try:
+                with winreg.OpenKey(hive, key_path, 0, winreg.KEY_ALL_ACCESS) as parent:
+                    winreg.DeleteKey(parent, sk)
+                    count += 1
+            except OSError:
+                pass
+        return count
+    except FileNotFoundError:
+        return 0
+
+
+def legacy(winreg, hive, key_path):
+    _legacy_values(winreg, hive, key_path)
+    _legacy_subkeys(winreg, hive, key_path)
+
+
+def engine(winreg, hive, key_path):
+    clear_tree(_WithoutDeleteTree(winreg), hive, key_path)
+
+
+def deletetree(winreg, hive, key_path):
+    clear_tree(winreg, hive, key_path)
+
+
+STRATEGIES = {"legacy": legacy, "engine": engine, "deletetree": deletetree}
+
+
+def run_once(strategy, subkeys, values):
+    registry = build_registry(subkeys, values)
+    calls = collections.Counter()
+    winreg = CountingRegistry(registry, lambda name: calls.update((name,)))
+    start = time.perf_counter()
+    STRATEGIES[strategy](winreg, registry.HKEY_CURRENT_USER, MRU_KEY)
+    elapsed = time.perf_counter() - start
+    left = registry.count_values(registry.HKEY_CURRENT_USER, MRU_KEY)
+    with registry.OpenKey(registry.HKEY_CURRENT_USER, MRU_KEY) as key:
+        left += registry.QueryInfoKey(key)[0]
+    return elapsed, calls, left
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--subkeys", type=int, default=50, help="extension subkeys")
+    parser.add_argument("--values", type=int, default=200, help="MRU values per key")
+    parser.add_argument("--strategies", default=",".join(STRATEGIES))
+    args = parser.parse_args()
+
+    total = (args.subkeys + 1) * (args.values + 1)
+    print(f"{args.subkeys} subkeys, {total} values")
+    print(f"{'strategy':>10}  {'seconds':>8}  {'calls':>7}  {'opens':>5}  {'left':>4}  speedup")
+    baseline = None
+    for strategy in args.strategies.split(","):
+        elapsed, calls, left = run_once(strategy, args.subkeys, args.values)
+        if baseline is None:
+            baseline = elapsed
+        ops = sum(calls.values())
+        speedup = baseline / elapsed if elapsed > 0 else 0.0
+        print(f"{strategy:>10}  {elapsed:>8.3f}  {ops:>7}  {calls['OpenKey']:>5}  {left:>4}  {speedup:>6.2f}x")
+        print(f"{'':>12}{dict(calls.most_common())}")
+        if left:
+            print(f"{'':>12}[FAIL] {left} values/subkeys left behind")
+
+
+if __name__ == "__main__":
+    main()
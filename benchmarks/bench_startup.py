@@ -0,0 +1,85 @@
+"""Startup cost: importing the cleaners package, and the GUI's first frame.
+
+Usage (from the repository root):
+    python benchmarks/bench_startup.py
+    python benchmarks/bench_startup.py --repeat 20 --gui
+
+Every measurement runs in a fresh interpreter, so nothing is cached in
+sys.modules (the OS file cache is warm after the first run). The package
+import is what app.py pays before its window exists; the cleaner modules
+should only load when a category is first scanned or run. --gui also starts
+src/app.py --startup-report (needs customtkinter and a display) and prints
+its timings: imports, window, first frame and the full checkbox list.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+SRC = os.path.join(HERE, "..", "src")
+
+_IMPORT_PROBE = """
+import json, sys, time
+sys.path.insert(0, sys.argv[1])
+start = time.perf_counter()
+import cleaners
+package = time.perf_counter() - start
+loaded = sorted(name for name in sys.modules if name.startswith("cleaners."))
+start = time.perf_counter()
+for cat in cleaners.CLEANER_CATEGORIES.values():
+    cat["cleaner"].resolve()
+modules = time.perf_counter() - start
+print(json.dumps({"package": package, "cleaner_modules": modules, "loaded": loaded}))
+"""
+
+
+def probe_imports():
+    out = subprocess.run(
+        [sys.executable, "-c", _IMPORT_PROBE, SRC], capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout)
+
+
+def run_gui():
+    """The app's own --startup-report, or None if it could not start."""
+    path = os.path.join(tempfile.mkdtemp(prefix="mypcnow_startup_"), "startup.json")
+    try:
+        subprocess.run(
+            [sys.executable, os.path.join(SRC, "app.py"), f"--startup-report={path}"],
+            capture_output=True, text=True, timeout=120,
+        )
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError, subprocess.SubprocessError):
+        return None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=10)
+    parser.add_argument("--gui", action="store_true", help="also time src/app.py --startup-report")
+    args = parser.parse_args()
+
+    runs = [probe_imports() for _ in range(args.repeat)]
+    package = statistics.median(run["package"] for run in runs) * 1000
+    modules = statistics.median(run["cleaner_modules"] for run in runs) * 1000
+    print(f"import cleaners        {package:7.1f} ms  (median of {args.repeat})")
+    print(f"  loaded with it       {', '.join(runs[0]['loaded']) or '-'}")
+    print(f"cleaner modules, later {modules:7.1f} ms")
+
+    if args.gui:
+        report = run_gui()
+        if report is None:
+            print("GUI: could not start (customtkinter or a display missing?)")
+            return
+        for key, value in report.items():
+            print(f"GUI {key:<32} {value}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,157 @@
+"""Peak memory of deleting huge and deep trees: streaming walker vs. full listing.
+
+Usage (from the repository root):
+    python benchmarks/bench_walker_memory.py
+    python benchmarks/bench_walker_memory.py --files 10000,100000,400000 --depth 3000
+
+Every measurement runs in a fresh child process so peaks do not carry over:
+
+    flat   N files in one %TEMP%-style directory
+    wide   N files spread over N/100 directories, two levels deep
+    deep   a single chain of --depth nested directories (npm-cache style)
+
+and each tree is deleted twice, once with deletion.delete_dir_contents and
+once the way the cleaners used to (os.listdir of the root, then
+shutil.rmtree per directory). Reported are the peak Python heap
+(tracemalloc) and, where the platform has it, the process's peak RSS. The
+streaming walker's peaks should stay flat as N grows. Timings include the
+tracemalloc overhead; use bench_parallel_delete.py to compare speed.
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from cleaners import deletion  # noqa: E402
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def build_flat(target, files):
+    os.makedirs(target)
+    for i in range(files):
+        with open(os.path.join(target, f"tmp_{i:08d}.tmp"), "wb") as f:
+            f.write(b"x")
+
+
+def build_wide(target, files):
+    per_dir = 100
+    for d in range(max(files // per_dir, 1)):
+        sub = os.path.join(target, f"pkg{d:06d}", "lib")
+        os.makedirs(sub)
+        for i in range(per_dir):
+            with open(os.path.join(sub, f"{i}.js"), "wb") as f:
+                f.write(b"x")
+
+
+def build_deep(target, depth):
+    """A chain of `depth` directories; built fd-relative to stay under PATH_MAX."""
+    os.makedirs(target)
+    if not deletion._FD_WALK:
+        # Windows: built by path, so capped to stay within MAX_PATH
+        path = target
+        for _ in range(min(depth, 100)):
+            path = os.path.join(path, "n")
+            os.mkdir(path)
+            open(os.path.join(path, "leaf"), "wb").close()
+        return
+    fd = os.open(target, os.O_RDONLY)
+    try:
+        for _ in range(depth):
+            os.mkdir("n", dir_fd=fd)
+            child = os.open("n", os.O_RDONLY, dir_fd=fd)
+            os.close(fd)
+            fd = child
+            os.close(os.open("leaf", os.O_CREAT | os.O_WRONLY, dir_fd=fd))
+    finally:
+        os.close(fd)
+
+
+def delete_listing(target):
+    """The pre-streaming approach: list the root, rmtree each directory."""
+    errors = 0
+    for name in os.listdir(target):
+        path = os.path.join(target, name)
+        try:
+            if os.path.isdir(path) and not os.path.islink(path):
+                shutil.rmtree(path)
+            else:
+                os.unlink(path)
+        except (OSError, RecursionError):
+            errors += 1
+    return errors
+
+
+def delete_streaming(target):
+    return len(deletion.delete_dir_contents(target).errors)
+
+
+def child(method, target):
+    """Run one delete in this (fresh) process and print its measurements as JSON."""
+    tracemalloc.start()
+    start = time.perf_counter()
+    errors = (delete_streaming if method == "streaming" else delete_listing)(target)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    rss = None
+    if resource is not None:
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        rss = rss if sys.platform == "darwin" else rss * 1024  # Linux reports KiB
+    left = deletion.scan_dir_contents(target)  # os.walk recurses too (before 3.12)
+    left = left.files + left.dirs
+    print(json.dumps({"seconds": seconds, "heap": peak, "rss": rss, "errors": errors, "left": left}))
+
+
+def measure(method, target):
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", method, target],
+        capture_output=True, text=True, check=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--files", default="10000,50000,100000", help="comma-separated tree sizes")
+    parser.add_argument("--depth", type=int, default=2000)
+    parser.add_argument("--root", default=None, help="scratch directory (default: system temp)")
+    parser.add_argument("--child", nargs=2, metavar=("METHOD", "TARGET"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    if args.child:
+        child(*args.child)
+        return
+
+    shapes = [("flat", build_flat, int(n)) for n in args.files.split(",")]
+    shapes += [("wide", build_wide, int(n)) for n in args.files.split(",")]
+    shapes.append(("deep", build_deep, args.depth))
+    root = tempfile.mkdtemp(prefix="mypcnow_walk_", dir=args.root)
+    try:
+        print(f"fd-relative walk: {deletion._FD_WALK}, recursion limit {sys.getrecursionlimit()}")
+        print(f"{'tree':>6} {'size':>8}  {'method':>9}  {'seconds':>8}  {'heap MB':>8}  {'rss MB':>7}  result")
+        for shape, build, size in shapes:
+            for method in ("streaming", "listing"):
+                target = os.path.join(root, f"{shape}_{size}_{method}")
+                build(target, size)
+                m = measure(method, target)
+                deletion.delete_path(target)  # rmtree cannot remove what 'listing' left of 'deep'
+                rss = f"{m['rss'] / 1048576:>7.1f}" if m["rss"] else f"{'-':>7}"
+                status = "ok" if not m["left"] else f"{m['errors']} errors, {m['left']} entries left"
+                print(f"{shape:>6} {size:>8}  {method:>9}  {m['seconds']:>8.2f}  "
+                      f"{m['heap'] / 1048576:>8.2f}  {rss}  {status}")
+    finally:
+        deletion.delete_path(root)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,526 @@
+"""Fake Windows user environments for benchmarking the cleaners.
+
+SyntheticEnv lays out a user tree under a temp root; cleaners constructed
+with backend=env.backend (a SandboxBackend over the same tree) resolve
+LOCALAPPDATA, APPDATA, TEMP/TMP, USERPROFILE, PUBLIC and SYSTEMROOT into
+it and use its in-memory registry, Recycle Bin folder, clipboard and event
+logs, so they only ever touch the sandbox. While active the env also
+points the process environment at the tree, as a second line of defence:
+
+    root/Users/bench/AppData/Local/...    Chromium User Data, Firefox cache2,
+                                          ConnectedDevicesPlatform, Explorer
+                                          thumbcache, Temp (deep trees)
+    root/Users/bench/AppData/Roaming/...  Firefox profiles, Recent, jump lists
+    root/Users/bench/Desktop              .lnk/.url shortcuts
+    root/Windows/Temp, root/Windows/Prefetch, root/$Recycle.Bin
+    HKCU\\Software\\Microsoft\\...       RunMRU, TypedPaths, RecentDocs, UserAssist
+                                          (in the backend's MemoryRegistry)
+
+Builders are deterministic (seeded) so runs are comparable between commits.
+ITEM_BUILDERS maps each benchmarkable item key to the builder that creates
+its data.
+"""
+
+import os
+import random
+import shutil
+import sqlite3
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from cleaners.backends import MemoryRegistry, SandboxBackend  # noqa: E402
+
+CHROMIUM_USER_DATA = {
+    "chrome": ("Google", "Chrome", "User Data"),
+    "edge": ("Microsoft", "Edge", "User Data"),
+    "brave": ("BraveSoftware", "Brave-Browser", "User Data"),
+}
+_ENV_VARS = ("LOCALAPPDATA", "APPDATA", "TEMP", "TMP", "USERPROFILE", "PUBLIC", "SYSTEMROOT")
+# Chrome stores times as microseconds since 1601-01-01; this is early 2026.
+_CHROME_NOW = 13_410_000_000_000_000
+_FIREFOX_NOW = 1_767_000_000_000_000  # microseconds since the Unix epoch
+_FOLDERS = {
+    "USERPROFILE": "Users/bench", "PUBLIC": "Users/Public",
+    "APPDATA": "Users/bench/AppData/Roaming", "LOCALAPPDATA": "Users/bench/AppData/Local",
+    "TEMP": "Users/bench/AppData/Local/Temp", "TMP": "Users/bench/AppData/Local/Temp",
+    "SYSTEMROOT": "Windows",
+}
+_EXPLORER_KEY = r"Software\Microsoft\Windows\CurrentVersion\Explorer"
+
+
+class Tier:
+    """Size parameters of one synthetic environment."""
+
+    __slots__ = (
+        "name", "profiles", "history_rows", "cookie_rows", "cache_files",
+        "temp_files", "temp_depth", "shortcuts", "recent_files", "file_size",
+    )
+
+    def __init__(self, name, profiles, history_rows, cookie_rows, cache_files,
+                 temp_files, temp_depth, shortcuts, recent_files, file_size=2048):
+        self.name = name
+        self.profiles = profiles            # browser profiles per browser
+        self.history_rows = history_rows    # urls per profile (visits = 3x)
+        self.cookie_rows = cookie_rows      # cookies per profile
+        self.cache_files = cache_files      # cache entries per profile
+        self.temp_files = temp_files        # files under %TEMP% (and Windows\Temp / 4)
+        self.temp_depth = temp_depth        # nesting depth of %TEMP% subtrees
+        self.shortcuts = shortcuts          # desktop shortcuts (plus system ones)
+        self.recent_files = recent_files    # Recent .lnk entries and jump lists
+        self.file_size = file_size          # bytes per synthetic file
+
+
+TIERS = {
+    "small": Tier("small", profiles=1, history_rows=2_000, cookie_rows=500, cache_files=500,
+                  temp_files=1_000, temp_depth=3, shortcuts=20, recent_files=100),
+    "medium": Tier("medium", profiles=3, history_rows=25_000, cookie_rows=5_000, cache_files=5_000,
+                   temp_files=10_000, temp_depth=5, shortcuts=60, recent_files=500),
+    "large": Tier("large", profiles=5, history_rows=100_000, cookie_rows=20_000, cache_files=20_000,
+                  temp_files=50_000, temp_depth=8, shortcuts=200, recent_files=2_000),
+}
+
+
+class SyntheticEnv:
+    """A fake user tree under `root`; use as a context manager to activate it."""
+
+    def __init__(self, root, seed=0):
+        self.root = os.path.abspath(root)
+        self.seed = seed
+        self.userprofile = os.path.join(self.root, "Users", "bench")
+        self.public = os.path.join(self.root, "Users", "Public")
+        self.local = os.path.join(self.userprofile, "AppData", "Local")
+        self.appdata = os.path.join(self.userprofile, "AppData", "Roaming")
+        self.temp = os.path.join(self.local, "Temp")
+        self.systemroot = os.path.join(self.root, "Windows")
+        self.backend = None  # SandboxBackend, recreated by reset()
+        self._saved = None
+
+    def environ(self):
+        return {
+            "LOCALAPPDATA": self.local, "APPDATA": self.appdata,
+            "TEMP": self.temp, "TMP": self.temp,
+            "USERPROFILE": self.userprofile, "PUBLIC": self.public,
+            "SYSTEMROOT": self.systemroot,
+        }
+
+    def reset(self):
+        """Remove everything and recreate the empty skeleton and registry."""
+        shutil.rmtree(self.root, ignore_errors=True)
+        for path in (self.local, self.appdata, self.temp, self.public, self.systemroot):
+            os.makedirs(path, exist_ok=True)
+        self.backend = SandboxBackend(self.root, registry=MemoryRegistry(), folders=_FOLDERS)
+
+    def rng(self, salt):
+        return random.Random(f"{self.seed}:{salt}")
+
+    def __enter__(self):
+        self._saved = {var: os.environ.get(var) for var in _ENV_VARS}
+        os.environ.update(self.environ())
+        return self
+
+    def __exit__(self, *exc):
+        for var, value in self._saved.items():
+            if value is None:
+                os.environ.pop(var, None)
+            else:
+                os.environ[var] = value
+        self._saved = None
+
+
+# --- helpers ---
+
+def _write_files(directory, names, size, rng):
+    os.makedirs(directory, exist_ok=True)
+    payload = rng.randbytes(size)
+    for name in names:
+        with open(os.path.join(directory, name), "wb") as f:
+            f.write(payload)
+
+
+def _url(rng, i):
+    host = f"site{rng.randrange(5000)}.example.com"
+    return f"https://{host}/path/{i}/{rng.getrandbits(64):016x}?q={rng.getrandbits(32):08x}"
+
+
+def _build_sqlite(path, schema, rows_by_table):
+    """Create a database with `schema` and bulk-insert {table: iterable of rows}."""
+    if os.path.exists(path):
+        os.remove(path)
+    conn = sqlite3.connect(path)
+    try:
+        conn.executescript(schema)
+        for table, rows in rows_by_table.items():
+            rows = iter(rows)
+            first = next(rows, None)
+            if first is None:
+                continue
+            marks = ",".join("?" * len(first))
+            conn.execute(f"INSERT INTO {table} VALUES ({marks})", first)
+            conn.executemany(f"INSERT INTO {table} VALUES ({marks})", rows)
+        conn.commit()
+    finally:
+        conn.close()
+
+
+# --- Chromium ---
+
+_CHROMIUM_HISTORY_SCHEMA = """
+CREATE TABLE urls(id INTEGER PRIMARY KEY, url LONGVARCHAR, title LONGVARCHAR,
+    visit_count INTEGER DEFAULT 0, typed_count INTEGER DEFAULT 0,
+    last_visit_time INTEGER NOT NULL, hidden INTEGER DEFAULT 0);
+CREATE INDEX urls_url_index ON urls(url);
+CREATE TABLE visits(id INTEGER PRIMARY KEY, url INTEGER NOT NULL, visit_time INTEGER NOT NULL,
+    from_visit INTEGER, transition INTEGER DEFAULT 0, segment_id INTEGER,
+    visit_duration INTEGER DEFAULT 0);
+CREATE INDEX visits_url_index ON visits(url);
+CREATE INDEX visits_time_index ON visits(visit_time);
+CREATE TABLE keyword_search_terms(keyword_id INTEGER, url_id INTEGER, term LONGVARCHAR,
+    normalized_term LONGVARCHAR);
+CREATE TABLE downloads(id INTEGER PRIMARY KEY, guid VARCHAR, current_path LONGVARCHAR,
+    target_path LONGVARCHAR, start_time INTEGER, received_bytes INTEGER,
+    total_bytes INTEGER, state INTEGER, tab_url VARCHAR);
+CREATE TABLE downloads_url_chains(id INTEGER, chain_index INTEGER, url LONGVARCHAR,
+    PRIMARY KEY (id, chain_index));
+CREATE TABLE segments(id INTEGER PRIMARY KEY, name VARCHAR, url_id INTEGER);
+CREATE TABLE segment_usage(id INTEGER PRIMARY KEY, segment_id INTEGER, time_slot INTEGER,
+    visit_count INTEGER DEFAULT 0);
+"""
+
+_CHROMIUM_COOKIES_SCHEMA = """
+CREATE TABLE cookies(creation_utc INTEGER NOT NULL, host_key TEXT NOT NULL,
+    top_frame_site_key TEXT NOT NULL, name TEXT NOT NULL, value TEXT NOT NULL,
+    encrypted_value BLOB NOT NULL, path TEXT NOT NULL, expires_utc INTEGER NOT NULL,
+    is_secure INTEGER NOT NULL, is_httponly INTEGER NOT NULL,
+    last_access_utc INTEGER NOT NULL);
+CREATE UNIQUE INDEX cookies_unique_index ON cookies(host_key, top_frame_site_key, name, path);
+"""
+
+
+def _chromium_history_rows(tier, rng):
+    n = tier.history_rows
+    downloads = max(n // 50, 1)
+    return {
+        "urls": (
+            (i, _url(rng, i), f"Page {i}", 3, rng.randrange(2), _CHROME_NOW - rng.randrange(10**12), 0)
+            for i in range(1, n + 1)
+        ),
+        "visits": (
+            (i, rng.randrange(1, n + 1), _CHROME_NOW - i * 1_000_000, 0, 805306368, 0, 0)
+            for i in range(1, 3 * n + 1)
+        ),
+        "keyword_search_terms": (
+            (2, i, f"search term {i}", f"search term {i}") for i in range(1, n // 10 + 1)
+        ),
+        "downloads": (
+            (i, f"{rng.getrandbits(128):032x}", f"C:\\Users\\bench\\Downloads\\file{i}.zip",
+             f"C:\\Users\\bench\\Downloads\\file{i}.zip", _CHROME_NOW - i, 1 << 20, 1 << 20, 1, _url(rng, i))
+            for i in range(1, downloads + 1)
+        ),
+        "downloads_url_chains": ((i, 0, _url(rng, i)) for i in range(1, downloads + 1)),
+        "segments": ((i, f"segment{i}", i) for i in range(1, n // 20 + 1)),
+        "segment_usage": ((i, i, _CHROME_NOW - i, 1) for i in range(1, n // 20 + 1)),
+    }
+
+
+def _chromium_cookie_rows(tier, rng):
+    return {
+        "cookies": (
+            (_CHROME_NOW - i, f".host{i}.example.com", "", f"c{i}", "", rng.randbytes(64), "/",
+             _CHROME_NOW + 10**13, 1, 1, _CHROME_NOW)
+            for i in range(tier.cookie_rows)
+        ),
+    }
+
+
+def chromium_profiles(env, browser, tier):
+    """Profile directories ('Default', 'Profile 1', ...) for `browser`."""
+    base = os.path.join(env.local, *CHROMIUM_USER_DATA[browser])
+    names = ["Default"] + [f"Profile {i}" for i in range(1, tier.profiles)]
+    return [os.path.join(base, name) for name in names]
+
+
+def build_chromium(env, tier, browser):
+    """User Data with `tier.profiles` profiles: History, Cookies, caches."""
+    for index, profile in enumerate(chromium_profiles(env, browser, tier)):
+        rng = env.rng(f"{browser}:{index}")
+        os.makedirs(profile, exist_ok=True)
+        _build_sqlite(os.path.join(profile, "History"), _CHROMIUM_HISTORY_SCHEMA,
+                      _chromium_history_rows(tier, rng))
+        _build_sqlite(os.path.join(profile, "Cookies"), _CHROMIUM_COOKIES_SCHEMA,
+                      _chromium_cookie_rows(tier, rng))
+        # Journals stay empty (TRUNCATE mode); random bytes would look like a hot journal
+        _write_files(profile, ["History-journal", "Cookies-journal"], 0, rng)
+        _write_files(profile, ["Visited Links", "Top Sites"], 4096, rng)
+        # Flat Cache_Data plus smaller code/GPU caches and a nested Service Worker store
+        flat = tier.cache_files * 7 // 10
+        _write_files(os.path.join(profile, "Cache", "Cache_Data"),
+                     [f"f_{i:06x}" for i in range(flat)] + ["index", "data_0", "data_1"],
+                     tier.file_size, rng)
+        _write_files(os.path.join(profile, "Code Cache", "js"),
+                     [f"{rng.getrandbits(32):08x}{i:08x}_0" for i in range(tier.cache_files // 10)],
+                     tier.file_size, rng)
+        _write_files(os.path.join(profile, "GPUCache"),
+                     ["index", "data_0", "data_1", "data_2", "data_3"], tier.file_size, rng)
+        rest = tier.cache_files - flat - tier.cache_files // 10
+        for origin in range(max(rest // 50, 1)):
+            _write_files(
+                os.path.join(profile, "Service Worker", "CacheStorage", f"{origin:040x}", "cache"),
+                [f"{i:016x}_0" for i in range(50)], tier.file_size, rng,
+            )
+
+
+# --- Firefox ---
+
+_PLACES_SCHEMA = """
+CREATE TABLE moz_places(id INTEGER PRIMARY KEY, url LONGVARCHAR, title LONGVARCHAR,
+    rev_host LONGVARCHAR, visit_count INTEGER DEFAULT 0, hidden INTEGER DEFAULT 0 NOT NULL,
+    typed INTEGER DEFAULT 0 NOT NULL, frecency INTEGER DEFAULT -1 NOT NULL,
+    last_visit_date INTEGER, guid TEXT, foreign_count INTEGER DEFAULT 0 NOT NULL);
+CREATE INDEX moz_places_hostindex ON moz_places(rev_host);
+CREATE TABLE moz_historyvisits(id INTEGER PRIMARY KEY, from_visit INTEGER, place_id INTEGER,
+    visit_date INTEGER, visit_type INTEGER, session INTEGER);
+CREATE INDEX moz_historyvisits_placedateindex ON moz_historyvisits(place_id, visit_date);
+CREATE INDEX moz_historyvisits_dateindex ON moz_historyvisits(visit_date);
+CREATE TABLE moz_inputhistory(place_id INTEGER NOT NULL, input LONGVARCHAR NOT NULL,
+    use_count INTEGER, PRIMARY KEY (place_id, input));
+"""
+_FIREFOX_COOKIES_SCHEMA = """
+CREATE TABLE moz_cookies(id INTEGER PRIMARY KEY, originAttributes TEXT NOT NULL DEFAULT '',
+    name TEXT, value TEXT, host TEXT, path TEXT, expiry INTEGER, lastAccessed INTEGER,
+    creationTime INTEGER, isSecure INTEGER, isHttpOnly INTEGER);
+"""
+_FORMHISTORY_SCHEMA = """
+CREATE TABLE moz_formhistory(id INTEGER PRIMARY KEY, fieldname TEXT NOT NULL, value TEXT NOT NULL,
+    timesUsed INTEGER, firstUsed INTEGER, lastUsed INTEGER, guid TEXT);
+"""
+
+
+def build_firefox(env, tier):
+    """Roaming profiles (places, cookies, formhistory) and Local cache2 entries."""
+    profiles = os.path.join(env.appdata, "Mozilla", "Firefox", "Profiles")
+    caches = os.path.join(env.local, "Mozilla", "Firefox", "Profiles")
+    n = tier.history_rows
+    for index in range(tier.profiles):
+        rng = env.rng(f"firefox:{index}")
+        name = f"{rng.getrandbits(32):08x}.default-release"
+        profile = os.path.join(profiles, name)
+        os.makedirs(profile, exist_ok=True)
+        _build_sqlite(os.path.join(profile, "places.sqlite"), _PLACES_SCHEMA, {
+            # ~5% bookmarked (foreign_count), ~20% never visited
+            "moz_places": (
+                (i, _url(rng, i), f"Page {i}", f"moc.elpmaxe.{i}.", 0 if i % 5 == 0 else 3, 0, 0, 100,
+                 _FIREFOX_NOW - i, f"{i:012d}", 1 if i % 20 == 0 else 0)
+                for i in range(1, n + 1)
+            ),
+            "moz_historyvisits": (
+                (i, 0, rng.randrange(1, n + 1), _FIREFOX_NOW - i * 1_000_000, 1, 0)
+                for i in range(1, 3 * n + 1)
+            ),
+            "moz_inputhistory": ((i, f"in{i}", 1) for i in range(1, n // 10 + 1)),
+        })
+        _build_sqlite(os.path.join(profile, "cookies.sqlite"), _FIREFOX_COOKIES_SCHEMA, {
+            "moz_cookies": (
+                (i, "", f"c{i}", "v" * 32, f".host{i}.example.com", "/", 2_000_000_000,
+                 _FIREFOX_NOW, _FIREFOX_NOW, 1, 1)
+                for i in range(tier.cookie_rows)
+            ),
+        })
+        _build_sqlite(os.path.join(profile, "formhistory.sqlite"), _FORMHISTORY_SCHEMA, {
+            "moz_formhistory": (
+                (i, "q", f"value {i}", 1, _FIREFOX_NOW, _FIREFOX_NOW, f"{i:012d}")
+                for i in range(n // 20)
+            ),
+        })
+        cache2 = os.path.join(caches, name, "cache2")
+        _write_files(os.path.join(cache2, "entries"),
+                     [f"{rng.getrandbits(128):032X}{i:08X}" for i in range(tier.cache_files)], tier.file_size, rng)
+        _write_files(cache2, ["index"], 4096, rng)
+
+
+# --- Windows folders ---
+
+def _build_tree(root, files, depth, size, rng, per_dir=100):
+    """`files` files spread over subtrees `depth` levels deep under root."""
+    remaining = files
+    tree = 0
+    while remaining > 0:
+        # Files at every level of the chain, not only at the bottom
+        path = os.path.join(root, f"tmp{tree:04d}")
+        for level in range(depth):
+            count = min(per_dir, remaining)
+            _write_files(path, [f"{rng.getrandbits(32):08x}_{i}.tmp" for i in range(count)], size, rng)
+            remaining -= count
+            if not remaining:
+                break
+            path = os.path.join(path, f"d{level}")
+        tree += 1
+
+
+def build_temp(env, tier):
+    """%TEMP% with loose files and deep per-installer subtrees."""
+    rng = env.rng("temp")
+    loose = tier.temp_files // 5
+    _write_files(env.temp, [f"~DF{i:08X}.TMP" for i in range(loose)], tier.file_size, rng)
+    _build_tree(env.temp, tier.temp_files - loose, tier.temp_depth, tier.file_size, rng)
+
+
+def build_windows_temp(env, tier):
+    rng = env.rng("windows_temp")
+    _build_tree(os.path.join(env.systemroot, "Temp"), tier.temp_files // 4, 3, tier.file_size, rng)
+
+
+def build_prefetch(env, tier):
+    rng = env.rng("prefetch")
+    _write_files(os.path.join(env.systemroot, "Prefetch"),
+                 [f"APP{i:04d}.EXE-{rng.getrandbits(32):08X}.pf" for i in range(min(tier.recent_files, 1024))],
+                 tier.file_size * 8, rng)
+
+
+def build_thumbnails(env, tier):
+    """Explorer thumbcache/iconcache databases plus files the cleaner must keep."""
+    rng = env.rng("thumbnails")
+    explorer = os.path.join(env.local, "Microsoft", "Windows", "Explorer")
+    names = [f"thumbcache_{s}.db" for s in ("16", "32", "48", "96", "256", "768", "1280", "1920", "idx")]
+    names += [f"iconcache_{s}.db" for s in ("16", "32", "48", "96", "256", "idx")]
+    _write_files(explorer, names, tier.file_size * 64, rng)
+    _write_files(explorer, ["ExplorerStartupLog.etl", "NotifyIcon"], 4096, rng)
+
+
+def build_activity(env, tier):
+    """ConnectedDevicesPlatform account folders with ActivitiesCache.db (+ WAL)."""
+    rng = env.rng("activity")
+    base = os.path.join(env.local, "ConnectedDevicesPlatform")
+    for index in range(tier.profiles):
+        account = os.path.join(base, f"L.bench{index}")
+        os.makedirs(account, exist_ok=True)
+        _build_sqlite(os.path.join(account, "ActivitiesCache.db"), """
+            CREATE TABLE Activity(Id BLOB PRIMARY KEY, AppId TEXT, Payload BLOB,
+                LastModifiedTime INTEGER, StartTime INTEGER, EndTime INTEGER);
+        """, {
+            "Activity": (
+                (rng.randbytes(16), f'[{{"application":"app{i % 50}.exe"}}]', b"x" * 256, i, i, i)
+                for i in range(tier.history_rows // 4)
+            ),
+        })
+        _write_files(account, ["ActivitiesCache.db-wal", "ActivitiesCache.db-shm"], tier.file_size * 16, rng)
+        _write_files(account, ["Settings.dat"], 1024, rng)  # kept by the cleaner
+
+
+def build_recent(env, tier):
+    """Recent .lnk entries and Automatic/CustomDestinations jump lists."""
+    rng = env.rng("recent")
+    recent = os.path.join(env.appdata, "Microsoft", "Windows", "Recent")
+    _write_files(recent, [f"document{i}.docx.lnk" for i in range(tier.recent_files)], 1024, rng)
+    _write_files(os.path.join(recent, "AutomaticDestinations"),
+                 [f"{i:016x}.automaticDestinations-ms" for i in range(tier.recent_files // 10)],
+                 tier.file_size * 4, rng)
+    _write_files(os.path.join(recent, "CustomDestinations"),
+                 [f"{i:016x}.customDestinations-ms" for i in range(tier.recent_files // 20)],
+                 tier.file_size, rng)
+
+
+def build_desktop(env, tier):
+    """User and public desktops: user shortcuts, system shortcuts and plain files."""
+    rng = env.rng("desktop")
+    desktop = os.path.join(env.userprofile, "Desktop")
+    user = [f"App {i}.lnk" for i in range(tier.shortcuts * 3 // 4)]
+    user += [f"Site {i}.url" for i in range(tier.shortcuts - len(user))]
+    _write_files(desktop, user, 1024, rng)
+    _write_files(desktop, ["desktop.ini", "Microsoft Edge.lnk", "notes.txt"], 1024, rng)
+    _write_files(os.path.join(env.public, "Desktop"), ["desktop.ini", "Public App.lnk"], 1024, rng)
+
+
+# --- Registry and shell (SandboxBackend) ---
+
+def _set_values(registry, key_path, values):
+    with registry.CreateKey(registry.HKEY_CURRENT_USER, key_path) as key:
+        for name, value in values:
+            kind = registry.REG_BINARY if isinstance(value, bytes) else registry.REG_SZ
+            registry.SetValueEx(key, name, 0, kind, value)
+
+
+def build_explorer_mru(env, tier):
+    """RunMRU, TypedPaths and search Flighting values, `tier.recent_files` each."""
+    registry = env.backend.registry
+    n = tier.recent_files
+    _set_values(registry, rf"{_EXPLORER_KEY}\RunMRU",
+                [(f"{i:x}", f"cmd{i}\\1") for i in range(n)] + [("MRUList", "abc")])
+    _set_values(registry, rf"{_EXPLORER_KEY}\TypedPaths", [(f"url{i + 1}", f"C:\\dir{i}") for i in range(n)])
+    _set_values(registry, r"Software\Microsoft\Windows\CurrentVersion\Search\Flighting",
+                [(f"Query{i}", f"term {i}") for i in range(n)])
+
+
+def build_recent_docs(env, tier):
+    """RecentDocs (per-extension subkeys) and ComDlg32 MRU trees."""
+    rng = env.rng("recent_docs")
+    registry = env.backend.registry
+    n = tier.recent_files
+    _set_values(registry, rf"{_EXPLORER_KEY}\RecentDocs", [(str(i), rng.randbytes(64)) for i in range(n)])
+    for ext in (".docx", ".pdf", ".txt", ".xlsx", "Folder"):
+        _set_values(registry, rf"{_EXPLORER_KEY}\RecentDocs\{ext}",
+                    [(str(i), rng.randbytes(64)) for i in range(n // 5)])
+    for mru in ("OpenSavePidlMRU", "LastVisitedPidlMRU"):
+        for ext in ("*", "docx", "pdf"):
+            _set_values(registry, rf"{_EXPLORER_KEY}\ComDlg32\{mru}\{ext}",
+                        [(str(i), rng.randbytes(128)) for i in range(n // 10)])
+
+
+def build_userassist(env, tier):
+    """UserAssist GUIDs, each with a Count key of ROT13 program entries."""
+    rng = env.rng("userassist")
+    for g in range(4):
+        guid = f"{{{rng.getrandbits(128):032X}}}"
+        _set_values(env.backend.registry, rf"{_EXPLORER_KEY}\UserAssist\{guid}\Count",
+                    [(f"P:\\Cebtenz Svyrf\\ncc{i}.rkr", rng.randbytes(72)) for i in range(tier.recent_files)])
+
+
+def build_recycle_bin(env, tier):
+    rng = env.rng("recycle_bin")
+    _build_tree(env.backend.recycle_bin, tier.recent_files, 2, tier.file_size, rng)
+
+
+def build_clipboard(env, tier):
+    env.backend.clipboard = "copied text"
+
+
+def build_event_logs(env, tier):
+    env.backend.event_logs["Application"] = tier.history_rows
+
+
+def _chromium_builder(browser):
+    return lambda env, tier: build_chromium(env, tier, browser)
+
+
+ITEM_BUILDERS = {
+    "chrome_history": _chromium_builder("chrome"),
+    "chrome_cache": _chromium_builder("chrome"),
+    "chrome_cookies": _chromium_builder("chrome"),
+    "chrome_downloads": _chromium_builder("chrome"),
+    "edge_history": _chromium_builder("edge"),
+    "edge_cache": _chromium_builder("edge"),
+    "edge_cookies": _chromium_builder("edge"),
+    "edge_downloads": _chromium_builder("edge"),
+    "brave_history": _chromium_builder("brave"),
+    "brave_cache": _chromium_builder("brave"),
+    "brave_cookies": _chromium_builder("brave"),
+    "firefox_history": build_firefox,
+    "firefox_cache": build_firefox,
+    "firefox_cookies": build_firefox,
+    "temp_files": build_temp,
+    "windows_temp": build_windows_temp,
+    "prefetch": build_prefetch,
+    "thumbnail_cache": build_thumbnails,
+    "activity_timeline": build_activity,
+    "recent_files": build_recent,
+    "jump_lists": build_recent,
+    "user_shortcuts": build_desktop,
+    "search_history": build_explorer_mru,
+    "run_history": build_explorer_mru,
+    "explorer_history": build_explorer_mru,
+    "recent_docs": build_recent_docs,
+    "userassist": build_userassist,
+    "recycle_bin": build_recycle_bin,
+    "clipboard": build_clipboard,
+    "app_event_logs": build_event_logs,
+}
@@ -17,6 +17,13 @@ a = Analysis(
         'customtkinter',
         'PIL',
         'PIL._tkinter_finder',
+        # Loaded by cleaners.LazyCleaner through importlib, invisible to the analysis
+        'cleaners.browser',
+        'cleaners.windows_activity',
+        'cleaners.system_traces',
+        'cleaners.desktop',
+        'cleaners.app_traces',
+        'cleaners.sqlite_session',
     ],
     hookspath=[],
     hooksconfig={},
@@ -1,12 +1,23 @@
 """
 MyPcNow v1.1.0 - Windows 11 Privacy Cleaner
 Single-click exe: 클릭 한 번으로 PC 흔적을 안전하게 삭제합니다.
+
+Startup is kept short: cleaner modules are imported when their category
+is first scanned or run (see cleaners.LazyCleaner), the engine modules
+behind a cleanup when it starts, and the checkbox list is built one
+category per event-loop turn after the first frame is on screen.
+`--startup-report` measures that (see StartupReport) and exits.
 """
 
+import time
+
+_STARTED = time.perf_counter()
+
 import sys
 import os
+import json
 import threading
-import time
+import traceback
 import ctypes
 
 # Handle frozen exe path
@@ -42,8 +53,189 @@ def run_as_admin():
     sys.exit(0)
 
 
+_IMPORTS_STARTED = time.perf_counter()
 import customtkinter as ctk
+_CTK_IMPORTED = time.perf_counter()
 from cleaners import CLEANER_CATEGORIES
+from cleaners.history_prune import HistoryRange
+from log_sink import LogSink, default_log_dir
+_IMPORTS_DONE = time.perf_counter()
+
+STARTUP_REPORT_FLAG = "--startup-report"
+STARTUP_REPORT_FILE = "startup.json"  # in the log directory unless a path is given
+
+
+def _process_started():
+    """time.time() at which this process was created, or None if unknown.
+
+    For the frozen exe that is before the PyInstaller bootloader unpacked
+    the bundle and started the interpreter, none of which app.py can time.
+    """
+    try:
+        kernel32 = ctypes.windll.kernel32
+        times = [ctypes.c_ulonglong() for _ in range(4)]  # creation, exit, kernel, user
+        if not kernel32.GetProcessTimes(kernel32.GetCurrentProcess(), *map(ctypes.byref, times)):
+            return None
+        return times[0].value / 10_000_000 - 11_644_473_600
+    except Exception:
+        return None
+
+
+def startup_report_path(argv):
+    """Where --startup-report[=PATH] should write, or None without the flag."""
+    for arg in argv:
+        if arg == STARTUP_REPORT_FLAG:
+            return os.path.join(default_log_dir(), STARTUP_REPORT_FILE)
+        if arg.startswith(STARTUP_REPORT_FLAG + "="):
+            return arg.split("=", 1)[1]
+    return None
+
+
+class StartupReport:
+    """Startup timings in ms, counted from the first line of app.py.
+
+    Imports are timed at module level; the window marks "window" (the
+    frame without the checkbox list), "first_frame" (first event-loop turn
+    after it was drawn) and "full_ui" (every category built).
+    """
+
+    __slots__ = ("path", "marks", "loaded_at_first_frame")
+
+    def __init__(self, path=None):
+        self.path = path
+        self.marks = {}  # name -> time.perf_counter()
+        self.loaded_at_first_frame = []
+
+    def mark(self, name):
+        self.marks.setdefault(name, time.perf_counter())
+        if name == "first_frame":
+            self.loaded_at_first_frame = [
+                cat_key for cat_key, cat in CLEANER_CATEGORIES.items() if cat["cleaner"].loaded
+            ]
+
+    def to_dict(self):
+        def ms(seconds):
+            return round(seconds * 1000, 1)
+
+        created = _process_started()
+        app_started = time.time() - (time.perf_counter() - _STARTED)
+        return {
+            "before_app_ms": ms(app_started - created) if created else None,
+            "import_ms": ms(_IMPORTS_DONE - _IMPORTS_STARTED),
+            "import_customtkinter_ms": ms(_CTK_IMPORTED - _IMPORTS_STARTED),
+            **{f"{name}_ms": ms(at - _STARTED) for name, at in self.marks.items()},
+            "cleaner_modules_at_first_frame": self.loaded_at_first_frame,
+            "frozen": bool(getattr(sys, "frozen", False)),
+        }
+
+    def summary(self):
+        """One log line, e.g. '시작 시간: 가져오기 180ms (customtkinter 120ms) · 첫 화면 420ms · ...'."""
+        data = self.to_dict()
+        parts = [f"가져오기 {data['import_ms']:.0f}ms (customtkinter {data['import_customtkinter_ms']:.0f}ms)"]
+        if data["before_app_ms"] is not None:
+            parts.insert(0, f"프로세스 시작 후 {data['before_app_ms']:.0f}ms")
+        if "first_frame_ms" in data:
+            parts.append(f"첫 화면 {data['first_frame_ms']:.0f}ms")
+        if "full_ui_ms" in data:
+            parts.append(f"전체 목록 {data['full_ui_ms']:.0f}ms")
+        return "시작 시간: " + " · ".join(parts)
+
+    def save(self):
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+
+
+def format_estimate(estimate):
+    """Short label for a scan-only ItemEstimate, e.g. '1,204개 · 85.3 MB'."""
+    from cleaners.deletion import format_bytes
+    parts = []
+    if estimate.items:
+        parts.append(f"{estimate.items:,}개")
+    if estimate.bytes:
+        parts.append(format_bytes(estimate.bytes))
+    if estimate.rows:
+        parts.append(f"{estimate.rows:,}행")
+    return " · ".join(parts) if parts else "비어 있음"
+
+
+def format_result(result):
+    """Short summary of an ItemResult, e.g. '파일 1,204개 · 폴더 12개 · 85.3 MB · 사용 중 3개'."""
+    from cleaners.deletion import format_bytes
+    parts = []
+    if result.files:
+        parts.append(f"파일 {result.files:,}개")
+    if result.dirs:
+        parts.append(f"폴더 {result.dirs:,}개")
+    if result.bytes:
+        parts.append(format_bytes(result.bytes))
+    if result.rows:
+        parts.append(f"DB {result.rows:,}행")
+    if result.registry_values:
+        parts.append(f"레지스트리 {result.registry_values:,}개")
+    if result.in_use:
+        parts.append(f"사용 중 {result.in_use:,}개")
+    if result.errors:
+        parts.append(f"오류 {len(result.errors):,}개")
+    return " · ".join(parts) if parts else "삭제된 항목 없음"
+
+
+def item_labels():
+    """{item key: checkbox label} of every cleanup item."""
+    return {item: label for cat in CLEANER_CATEGORIES.values() for item, label in cat["items"].items()}
+
+
+def confirm_message(count, recoverable):
+    """Body of the cleanup confirmation: which of the selected items can be undone."""
+    if not recoverable:
+        return f"선택된 {count}개 항목이 삭제됩니다.\n이 작업은 되돌릴 수 없습니다."
+    if recoverable == count:
+        return f"선택된 {count}개 항목은 복구 저장소로 이동합니다.\n'되돌리기'로 복구할 수 있습니다."
+    return (
+        f"선택된 {count}개 항목이 삭제됩니다.\n"
+        f"바탕화면 바로가기는 '되돌리기'로 복구할 수 있지만,\n나머지 {count - recoverable}개 항목은 되돌릴 수 없습니다."
+    )
+
+
+def format_snapshot(snapshot, labels):
+    """One line of the recovery list, e.g. '2026-01-01 12:00  사용자가 만든 바로가기  12개 · 3.4 KB'."""
+    from cleaners.deletion import format_bytes
+    created = time.strftime("%Y-%m-%d %H:%M", time.localtime(snapshot["created"]))
+    label = labels.get(snapshot["item"], snapshot["item"])
+    return f"{created}  {label}  {snapshot['entries']:,}개 · {format_bytes(snapshot['bytes'])}"
+
+
+def format_eta(seconds):
+    """Remaining time label, e.g. '약 1분 20초'."""
+    seconds = int(seconds + 0.5)
+    if seconds < 1:
+        return "곧 완료"
+    if seconds < 60:
+        return f"약 {seconds}초"
+    return f"약 {seconds // 60}분 {seconds % 60}초"
+
+
+def format_progress(snapshot):
+    """Status line for a running cleanup from a ProgressSnapshot."""
+    parts = [f"정리 진행 중... {snapshot.fraction:.0%}"]
+    if snapshot.eta is not None:
+        parts.append(format_eta(snapshot.eta))
+    if snapshot.files_per_sec >= 1:
+        parts.append(f"{snapshot.files_per_sec:,.0f} 파일/초 · {snapshot.mb_per_sec:.1f} MB/초")
+    return " · ".join(parts)
+
+
+def format_item_metrics(metrics, label):
+    """One log line of the per-item timing table from an ItemMetrics."""
+    from cleaners.deletion import format_bytes
+    parts = [f"  {label:<24} {metrics.wall:6.2f}초", f"CPU {metrics.cpu:.2f}초"]
+    if metrics.files:
+        parts.append(f"{metrics.files:,}개 · {format_bytes(metrics.bytes)}")
+    if metrics.sqlite_seconds or metrics.sqlite_rows:
+        parts.append(f"SQLite {metrics.sqlite_seconds:.2f}초 · {metrics.sqlite_rows:,}행")
+    if metrics.registry_calls:
+        parts.append(f"레지스트리 {metrics.registry_calls:,}회")
+    return "  ".join(parts)
 
 
 class MyPCNow(ctk.CTk):
@@ -53,9 +245,29 @@ class MyPCNow(ctk.CTk):
     APP_VERSION = "1.1.0"
     WINDOW_WIDTH = 720
     WINDOW_HEIGHT = 780
-
-    def __init__(self):
+    LOG_FLUSH_MS = 100  # how often queued log lines are moved into the textbox
+    LOG_MAX_LINES = 2000  # textbox keeps only the newest lines; the log file has all
+    PROGRESS_POLL_MS = 250  # progress bar / ETA refresh while cleaning
+    METRICS_SHOWN = 10  # slowest items listed in the log after a run
+    # Browser history time range (label -> seconds back; None clears everything)
+    HISTORY_RANGES = {
+        "전체 기간": None,
+        "지난 1시간": 3600,
+        "지난 24시간": 24 * 3600,
+        "지난 7일": 7 * 24 * 3600,
+        "지난 4주": 28 * 24 * 3600,
+    }
+    # Temp folder cleanup policy (label -> TempPolicy arguments; None removes everything)
+    TEMP_POLICIES = {
+        "임시 파일 전체": None,
+        "24시간 지난 것만": {"older_than": 24 * 3600},
+        "7일 지난 것만": {"older_than": 7 * 24 * 3600},
+        "최근 1 GB 보존": {"keep_newest": 1024 ** 3},
+    }
+
+    def __init__(self, startup=None):
         super().__init__()
+        self.startup = startup  # StartupReport in --startup-report mode
 
         # Window setup
         self.title(f"{self.APP_NAME} v{self.APP_VERSION} - PC 프라이버시 클리너")
@@ -69,8 +281,18 @@ class MyPCNow(ctk.CTk):
 
         # State
         self.checkboxes = {}  # key -> (CTkCheckBox, IntVar)
+        self.estimate_labels = {}  # item key -> CTkLabel showing scan estimate
+        self.estimates = {}  # item key -> latest scan ItemEstimate (progress weights)
         self.is_cleaning = False
-        self.clean_results = {}  # category -> count of items cleaned
+        self.clean_results = {}  # item key -> ItemResult of the last cleanup
+        self.cancel_token = None  # CancelToken of the running cleanup
+        self.scan_token = None  # CancelToken of the latest estimate scan
+        self._scan_thread = None
+        self.log_sink = LogSink()  # worker threads -> textbox + log file
+        self.log_line_count = 0  # lines currently in the textbox
+        self.history_range_var = ctk.StringVar(value=next(iter(self.HISTORY_RANGES)))
+        self.temp_policy_var = ctk.StringVar(value=next(iter(self.TEMP_POLICIES)))
+        self._next_row = 0  # next free row of the checkbox list
 
         # Build UI
         self._build_ui()
@@ -84,16 +306,58 @@ class MyPCNow(ctk.CTk):
         # Handle window close during cleaning
         self.protocol("WM_DELETE_WINDOW", self._on_close)
 
+        # The checkbox list is built once the first frame is up
+        if self.startup is not None:
+            self.startup.mark("window")
+        self.after_idle(lambda: self.after(0, self._on_first_frame))
+        self.after(self.LOG_FLUSH_MS, self._drain_log)
+
+    def _on_first_frame(self):
+        if self.startup is not None:
+            self.startup.mark("first_frame")
+        self._build_categories(iter(CLEANER_CATEGORIES.items()))
+
+    def _build_categories(self, remaining):
+        """Build one category's rows per event-loop turn so the window stays responsive."""
+        category = next(remaining, None)
+        if category is not None:
+            self._build_category(*category)
+            self.after_idle(lambda: self.after(0, lambda: self._build_categories(remaining)))
+            return
+        for button in (self.select_all_btn, self.deselect_all_btn, self.clean_btn):
+            button.configure(state="normal")
+        # Fill in size estimates once every row is there
+        self.after(100, self._start_scan)
+        if self.startup is not None:
+            self.startup.mark("full_ui")
+            self._finish_startup_report()
+
+    def _finish_startup_report(self):
+        """Log the startup timings, save them and close the window (--startup-report)."""
+        summary = self.startup.summary()
+        self._log(summary)
+        if sys.stdout is not None:
+            print(summary)
+        try:
+            self.startup.save()
+            self._log(f"시작 시간 측정 결과: {self.startup.path}")
+        except OSError as e:
+            self._log(f"[오류] 시작 시간 측정 결과 저장: {e}")
+        self.after(self.LOG_FLUSH_MS * 2, self._on_close)
+
     def _on_close(self):
-        """Handle window close - warn if cleaning is in progress."""
+        """Handle window close - stop a running cleanup first, then exit."""
+        self._cancel_scan()
         if self.is_cleaning:
-            dialog = ctk.CTkInputDialog(title="경고", text="정리가 진행 중입니다. 정말 종료하시겠습니까?")
-            # Use a simple toplevel dialog instead
+            self._stop_cleaning()
+            self.status_label.configure(text="정리를 중지하고 종료합니다...", text_color="#FBBF24")
+            self.after(50, self._on_close)
             return
+        self.log_sink.close_file()
         self.destroy()
 
     def _build_ui(self):
-        """Build the complete user interface."""
+        """Build the window around an empty checkbox list (filled by _build_categories)."""
         self.grid_columnconfigure(0, weight=1)
         self.grid_rowconfigure(1, weight=1)
         self.grid_rowconfigure(3, weight=0)
@@ -152,6 +416,7 @@ class MyPCNow(ctk.CTk):
             command=self._select_all,
             fg_color="#2563EB",
             hover_color="#1D4ED8",
+            state="disabled",
         )
         self.select_all_btn.pack(side="left", padx=5)
 
@@ -163,6 +428,7 @@ class MyPCNow(ctk.CTk):
             command=self._deselect_all,
             fg_color="#4B5563",
             hover_color="#374151",
+            state="disabled",
         )
         self.deselect_all_btn.pack(side="left", padx=5)
 
@@ -175,52 +441,7 @@ class MyPCNow(ctk.CTk):
         self.scroll_frame.grid(row=1, column=0, padx=20, pady=10, sticky="nsew")
         self.scroll_frame.grid_columnconfigure(0, weight=1)
 
-        row_idx = 0
-        for cat_key, cat_info in CLEANER_CATEGORIES.items():
-            # Category header
-            cat_header = ctk.CTkFrame(self.scroll_frame, fg_color="#1E293B", corner_radius=8)
-            cat_header.grid(row=row_idx, column=0, sticky="ew", pady=(10, 2), padx=5)
-            cat_header.grid_columnconfigure(0, weight=1)
-
-            cat_var = ctk.IntVar(value=0)
-            cat_cb = ctk.CTkCheckBox(
-                cat_header,
-                text=f"  {cat_info['icon']}  {cat_info['name']}",
-                font=ctk.CTkFont(size=14, weight="bold"),
-                variable=cat_var,
-                command=lambda ck=cat_key, cv=cat_var: self._toggle_category(ck, cv),
-                checkbox_width=22,
-                checkbox_height=22,
-            )
-            cat_cb.grid(row=0, column=0, padx=10, pady=8, sticky="w")
-
-            # Item count label
-            count_label = ctk.CTkLabel(
-                cat_header,
-                text=f"{len(cat_info['items'])}개 항목",
-                font=ctk.CTkFont(size=11),
-                text_color="#6B7280",
-            )
-            count_label.grid(row=0, column=1, padx=10, pady=8, sticky="e")
-
-            self.checkboxes[f"__cat_{cat_key}"] = (cat_cb, cat_var)
-            row_idx += 1
-
-            # Individual items
-            for item_key, item_label in cat_info["items"].items():
-                var = ctk.IntVar(value=0)
-                cb = ctk.CTkCheckBox(
-                    self.scroll_frame,
-                    text=f"    {item_label}",
-                    font=ctk.CTkFont(size=13),
-                    variable=var,
-                    command=lambda: self._update_category_states(),
-                    checkbox_width=18,
-                    checkbox_height=18,
-                )
-                cb.grid(row=row_idx, column=0, padx=25, pady=2, sticky="w")
-                self.checkboxes[item_key] = (cb, var)
-                row_idx += 1
+        # Category rows are added by _build_category() after the first frame
 
         # --- Action area ---
         action_frame = ctk.CTkFrame(self, fg_color="transparent")
@@ -239,9 +460,23 @@ class MyPCNow(ctk.CTk):
             command=self._start_cleaning,
             fg_color="#DC2626",
             hover_color="#B91C1C",
+            state="disabled",
         )
         self.clean_btn.grid(row=1, column=0, sticky="ew", padx=(0, 5))
 
+        self.stop_btn = ctk.CTkButton(
+            action_frame,
+            text="중지",
+            font=ctk.CTkFont(size=14, weight="bold"),
+            width=110,
+            height=45,
+            command=self._stop_cleaning,
+            fg_color="#4B5563",
+            hover_color="#374151",
+            state="disabled",
+        )
+        self.stop_btn.grid(row=1, column=1, sticky="e")
+
         self.status_label = ctk.CTkLabel(
             action_frame,
             text="항목을 선택하고 '지금 정리하기'를 클릭하세요",
@@ -266,6 +501,18 @@ class MyPCNow(ctk.CTk):
         )
         log_label.grid(row=0, column=0, sticky="w")
 
+        self.restore_btn = ctk.CTkButton(
+            log_header,
+            text="되돌리기",
+            width=90,
+            height=24,
+            font=ctk.CTkFont(size=12),
+            command=self._show_recovery_dialog,
+            fg_color="#4B5563",
+            hover_color="#374151",
+        )
+        self.restore_btn.grid(row=0, column=1, sticky="e")
+
         self.log_text = ctk.CTkTextbox(
             self.log_frame,
             height=150,
@@ -274,6 +521,149 @@ class MyPCNow(ctk.CTk):
         )
         self.log_text.grid(row=1, column=0, padx=10, pady=(5, 10), sticky="ew")
 
+    def _build_category(self, cat_key, cat_info):
+        """Add a category header and its item rows to the checkbox list."""
+        # Category header
+        cat_header = ctk.CTkFrame(self.scroll_frame, fg_color="#1E293B", corner_radius=8)
+        cat_header.grid(row=self._next_row, column=0, columnspan=2, sticky="ew", pady=(10, 2), padx=5)
+        cat_header.grid_columnconfigure(0, weight=1)
+
+        cat_var = ctk.IntVar(value=0)
+        cat_cb = ctk.CTkCheckBox(
+            cat_header,
+            text=f"  {cat_info['icon']}  {cat_info['name']}",
+            font=ctk.CTkFont(size=14, weight="bold"),
+            variable=cat_var,
+            command=lambda ck=cat_key, cv=cat_var: self._toggle_category(ck, cv),
+            checkbox_width=22,
+            checkbox_height=22,
+        )
+        cat_cb.grid(row=0, column=0, padx=10, pady=8, sticky="w")
+
+        # Item count label
+        count_label = ctk.CTkLabel(
+            cat_header,
+            text=f"{len(cat_info['items'])}개 항목",
+            font=ctk.CTkFont(size=11),
+            text_color="#6B7280",
+        )
+        count_label.grid(row=0, column=2, padx=10, pady=8, sticky="e")
+
+        if cat_key == "browser":
+            # Limits history/download deletion to the chosen period
+            range_menu = ctk.CTkOptionMenu(
+                cat_header,
+                values=list(self.HISTORY_RANGES),
+                variable=self.history_range_var,
+                command=lambda choice: self._start_scan(),
+                width=120,
+                height=26,
+                font=ctk.CTkFont(size=12),
+            )
+            range_menu.grid(row=0, column=1, padx=(10, 0), pady=8, sticky="e")
+        elif cat_key == "system_traces":
+            # Limits temp folder cleanup to old (or large) entries
+            policy_menu = ctk.CTkOptionMenu(
+                cat_header,
+                values=list(self.TEMP_POLICIES),
+                variable=self.temp_policy_var,
+                command=lambda choice: self._start_scan(),
+                width=130,
+                height=26,
+                font=ctk.CTkFont(size=12),
+            )
+            policy_menu.grid(row=0, column=1, padx=(10, 0), pady=8, sticky="e")
+
+        self.checkboxes[f"__cat_{cat_key}"] = (cat_cb, cat_var)
+        self._next_row += 1
+
+        # Individual items
+        for item_key, item_label in cat_info["items"].items():
+            var = ctk.IntVar(value=0)
+            cb = ctk.CTkCheckBox(
+                self.scroll_frame,
+                text=f"    {item_label}",
+                font=ctk.CTkFont(size=13),
+                variable=var,
+                command=lambda: self._update_category_states(),
+                checkbox_width=18,
+                checkbox_height=18,
+            )
+            cb.grid(row=self._next_row, column=0, padx=25, pady=2, sticky="w")
+            self.checkboxes[item_key] = (cb, var)
+
+            est_label = ctk.CTkLabel(
+                self.scroll_frame,
+                text="계산 중...",
+                font=ctk.CTkFont(size=11),
+                text_color="#6B7280",
+            )
+            est_label.grid(row=self._next_row, column=1, padx=(5, 15), pady=2, sticky="e")
+            self.estimate_labels[item_key] = est_label
+            self._next_row += 1
+
+    def _history_range(self):
+        """HistoryRange for the selected period, or None for all history."""
+        seconds = self.HISTORY_RANGES.get(self.history_range_var.get())
+        return HistoryRange.last(seconds) if seconds else None
+
+    def _temp_policy(self):
+        """TempPolicy for the selected temp cleanup option, or None for everything."""
+        options = self.TEMP_POLICIES.get(self.temp_policy_var.get())
+        if not options:
+            return None
+        from cleaners.temp_policy import TempPolicy
+        return TempPolicy(**options)
+
+    def _start_scan(self):
+        """Estimate every item in a background thread (scan-only, nothing is deleted).
+
+        A scan still running is cancelled and replaced: the new one waits
+        for it to stop, so only one walks the disk at a time.
+        """
+        if self.is_cleaning:
+            return
+        from cleaners.base import CancelToken
+
+        self._cancel_scan()
+        self.scan_token = CancelToken()
+        self._scan_thread = threading.Thread(
+            target=self._run_scan,
+            args=(self.scan_token, self._scan_thread, self._history_range(), self._temp_policy()),
+            daemon=True,
+        )
+        self._scan_thread.start()
+
+    def _cancel_scan(self):
+        if self.scan_token is not None:
+            self.scan_token.cancel()
+
+    def _run_scan(self, token, previous=None, history_range=None, temp_policy=None):
+        if previous is not None:
+            previous.join()
+        for cat_key, cat_info in CLEANER_CATEGORIES.items():
+            if token.cancelled:
+                return
+            cleaner = cat_info["cleaner"](log_callback=lambda message: None)
+            cleaner.history_range = history_range
+            cleaner.temp_policy = temp_policy
+            try:
+                estimates = cleaner.run(list(cat_info["items"]), scan_only=True, cancel=token)
+            except Exception:
+                continue
+            if token.cancelled:
+                return  # partial: the scan that replaced this one shows its own
+            self.after(0, lambda e=estimates: self._show_estimates(e, token))
+
+    def _show_estimates(self, estimates, token=None):
+        if token is not None and token is not self.scan_token:
+            return
+        self.estimates.update(estimates)
+        for item_key, estimate in estimates.items():
+            label = self.estimate_labels.get(item_key)
+            if label is not None:
+                label.configure(text=format_estimate(estimate))
+
     def _toggle_category(self, cat_key, cat_var):
         """Toggle all items in a category when category checkbox is clicked."""
         value = cat_var.get()
@@ -318,19 +708,60 @@ class MyPCNow(ctk.CTk):
         return selected
 
     def _log(self, message):
-        """Thread-safe log message to the log textbox."""
-        def _append():
+        """Thread-safe log message; shown on the next _drain_log tick."""
+        self.log_sink.write(message)
+
+    def _drain_log(self):
+        """Move queued log lines into the textbox in one insert, trimming old lines."""
+        messages = self.log_sink.drain()
+        if messages:
+            text = "\n".join(messages) + "\n"
+            self.log_line_count += text.count("\n")
             self.log_text.configure(state="normal")
-            self.log_text.insert("end", message + "\n")
+            self.log_text.insert("end", text)
+            excess = self.log_line_count - self.LOG_MAX_LINES
+            if excess > 0:
+                self.log_text.delete("1.0", f"{excess + 1}.0")
+                self.log_line_count -= excess
             self.log_text.see("end")
             self.log_text.configure(state="disabled")
-        self.after(0, _append)
-
-    def _show_confirm_dialog(self, count):
-        """Show confirmation dialog before cleaning. Returns True if confirmed."""
+        self.after(self.LOG_FLUSH_MS, self._drain_log)
+
+    def _log_freed(self, results):
+        """List the disk space each item freed, largest first."""
+        from cleaners.deletion import format_bytes
+        labels = item_labels()
+        freed = sorted((r for r in results.values() if r.bytes), key=lambda r: r.bytes, reverse=True)
+        if not freed:
+            return
+        self._log("\n--- 항목별 확보 용량 ---")
+        for result in freed:
+            self._log(f"  {labels.get(result.item, result.item):<24} {format_bytes(result.bytes):>10}")
+
+    def _log_metrics(self, metrics):
+        """List the slowest items and save the full per-item report next to the log."""
+        labels = item_labels()
+        slowest = metrics.slowest(self.METRICS_SHOWN)
+        if slowest:
+            self._log(f"\n--- 항목별 소요 시간 (상위 {len(slowest)}개) ---")
+            for item_metrics in slowest:
+                self._log(format_item_metrics(item_metrics, labels.get(item_metrics.item, item_metrics.item)))
+        path = self.log_sink.sidecar_path("_metrics.json")
+        if path:
+            try:
+                metrics.save(path)
+                self._log(f"항목별 측정 결과: {path}")
+            except OSError:
+                pass
+
+    def _show_confirm_dialog(self, count, recoverable=0):
+        """Show confirmation dialog before cleaning. Returns True if confirmed.
+
+        recoverable: how many of the items go to the recovery store instead.
+        """
         dialog = ctk.CTkToplevel(self)
         dialog.title("정리 확인")
-        dialog.geometry("400x200")
+        dialog.geometry("400x220")
         dialog.resizable(False, False)
         dialog.transient(self)
         dialog.grab_set()
@@ -338,7 +769,7 @@ class MyPCNow(ctk.CTk):
         # Center on parent
         dialog.update_idletasks()
         x = self.winfo_x() + (self.winfo_width() - 400) // 2
-        y = self.winfo_y() + (self.winfo_height() - 200) // 2
+        y = self.winfo_y() + (self.winfo_height() - 220) // 2
         dialog.geometry(f"+{x}+{y}")
 
         result = {"confirmed": False}
@@ -351,7 +782,7 @@ class MyPCNow(ctk.CTk):
 
         ctk.CTkLabel(
             dialog,
-            text=f"선택된 {count}개 항목이 삭제됩니다.\n이 작업은 되돌릴 수 없습니다.",
+            text=confirm_message(count, recoverable),
             font=ctk.CTkFont(size=13),
             text_color="#F59E0B",
         ).pack(pady=(0, 20))
@@ -379,6 +810,69 @@ class MyPCNow(ctk.CTk):
         dialog.wait_window()
         return result["confirmed"]
 
+    def _show_recovery_dialog(self):
+        """List the recovery store's snapshots, each with a button that restores it."""
+        if self.is_cleaning:
+            return
+        import sqlite3
+        from cleaners.recovery import RecoveryStore, default_recovery_root
+
+        store = RecoveryStore(default_recovery_root())
+        labels = item_labels()
+        dialog = ctk.CTkToplevel(self)
+        dialog.title("되돌리기")
+        dialog.geometry("520x320")
+        dialog.transient(self)
+        dialog.grab_set()
+
+        ctk.CTkLabel(
+            dialog,
+            text="복구 저장소로 옮긴 항목을 원래 위치로 되돌립니다",
+            font=ctk.CTkFont(size=14, weight="bold"),
+        ).pack(pady=(15, 5))
+        rows = ctk.CTkScrollableFrame(dialog)
+        rows.pack(fill="both", expand=True, padx=15, pady=(5, 15))
+        rows.grid_columnconfigure(0, weight=1)
+
+        def fill():
+            for child in rows.winfo_children():
+                child.destroy()
+            try:
+                snapshots = store.snapshots()
+            except (OSError, sqlite3.Error) as e:
+                snapshots = []
+                self._log(f"[오류] 복구 저장소: {e}")
+            if not snapshots:
+                ctk.CTkLabel(rows, text="되돌릴 항목이 없습니다", text_color="gray").grid(row=0, column=0, pady=20)
+            for row, snapshot in enumerate(snapshots):
+                ctk.CTkLabel(
+                    rows, text=format_snapshot(snapshot, labels), font=ctk.CTkFont(size=12), anchor="w",
+                ).grid(row=row, column=0, sticky="ew", padx=5, pady=3)
+                ctk.CTkButton(
+                    rows, text="되돌리기", width=80, height=26,
+                    command=lambda snap=snapshot: restore(snap),
+                    fg_color="#2563EB", hover_color="#1D4ED8",
+                ).grid(row=row, column=1, padx=5, pady=3)
+
+        def restore(snapshot):
+            label = labels.get(snapshot["item"], snapshot["item"])
+            try:
+                restored, conflicts = store.restore(snapshot["id"])
+            except KeyError:
+                self._log(f"[복구] 이미 없는 스냅샷: {snapshot['id']}")
+            except (OSError, sqlite3.Error) as e:
+                self._log(f"[오류] 되돌리기 {label}: {e}")
+            else:
+                left = f", {conflicts}개는 같은 이름이 있어 저장소에 남김" if conflicts else ""
+                self._log(f"[복구] {label}: {restored}개 되돌림{left}")
+                self.status_label.configure(text=f"{label}: {restored}개 되돌림{left}", text_color="#22C55E")
+            fill()
+            self._start_scan()
+
+        fill()
+        dialog.wait_window()
+        store.close()
+
     def _start_cleaning(self):
         """Start the cleaning process in a background thread."""
         if self.is_cleaning:
@@ -390,78 +884,155 @@ class MyPCNow(ctk.CTk):
             return
 
         # Show confirmation dialog
-        if not self._show_confirm_dialog(len(selected)):
+        from cleaners import RECOVERABLE_ITEMS
+        recoverable = sum(1 for item in selected if item in RECOVERABLE_ITEMS)
+        if not self._show_confirm_dialog(len(selected), recoverable):
             return
 
+        from cleaners.base import CancelToken
+        from cleaners.progress import ProgressTracker
+
+        self._cancel_scan()
         self.is_cleaning = True
         self.clean_results = {}
+        self.cancel_token = CancelToken()
         self.clean_btn.configure(state="disabled", text="정리 중...")
+        self.stop_btn.configure(state="normal")
         self.select_all_btn.configure(state="disabled")
         self.deselect_all_btn.configure(state="disabled")
+        self.restore_btn.configure(state="disabled")
         self.status_label.configure(text="정리 진행 중...", text_color="#FBBF24")
         self.progress_bar.set(0)
 
-        # Clear log
+        # Clear log and start a new log file for this run
+        self.log_sink.start_file()
         self.log_text.configure(state="normal")
         self.log_text.delete("1.0", "end")
         self.log_text.configure(state="disabled")
+        self.log_line_count = 0
 
-        thread = threading.Thread(target=self._run_cleaning, args=(selected,), daemon=True)
+        tracker = ProgressTracker({item: self.estimates.get(item) for item in selected})
+        thread = threading.Thread(
+            target=self._run_cleaning,
+            args=(selected, tracker, self._history_range(), self._temp_policy()),
+            daemon=True,
+        )
         thread.start()
+        self.after(self.PROGRESS_POLL_MS, lambda: self._poll_progress(tracker))
+
+    def _poll_progress(self, tracker):
+        """Refresh the progress bar, ETA and throughput until the run finishes."""
+        if not self.is_cleaning:
+            return
+        snapshot = tracker.snapshot()
+        self.progress_bar.set(snapshot.fraction)
+        if not self.cancel_token.cancelled:
+            self.status_label.configure(text=format_progress(snapshot), text_color="#FBBF24")
+        self.after(self.PROGRESS_POLL_MS, lambda: self._poll_progress(tracker))
+
+    def _stop_cleaning(self):
+        """Ask the running cleanup to stop at its next checkpoint."""
+        if not self.is_cleaning or self.cancel_token is None:
+            return
+        self.cancel_token.cancel()
+        self.stop_btn.configure(state="disabled")
+        self.status_label.configure(text="중지하는 중...", text_color="#FBBF24")
 
-    def _run_cleaning(self, selected_items):
+    def _run_cleaning(self, selected_items, tracker, history_range=None, temp_policy=None):
         """Run cleaning in background thread."""
         start_time = time.time()
         self._log(f"=== MyPcNow v{self.APP_VERSION} 정리 시작 ({len(selected_items)}개 항목) ===\n")
-
-        # Group selected items by category
-        items_by_category = {}
-        for cat_key, cat_info in CLEANER_CATEGORIES.items():
-            cat_items = [s for s in selected_items if s in cat_info["items"]]
-            if cat_items:
-                items_by_category[cat_key] = cat_items
-
-        total_categories = len(items_by_category)
-        completed = 0
-
-        for cat_key, items in items_by_category.items():
-            cat_info = CLEANER_CATEGORIES[cat_key]
-            self._log(f"\n--- {cat_info['icon']} {cat_info['name']} ---")
-
-            cleaner_class = cat_info["cleaner"]
-            cleaner = cleaner_class(log_callback=self._log)
-            cleaner.run(items)
-
-            self.clean_results[cat_key] = len(items)
-            completed += 1
-            progress = completed / total_categories
-            self.after(0, lambda p=progress: self.progress_bar.set(p))
-
-        elapsed = time.time() - start_time
-        self._log(f"\n=== 정리 완료! ({elapsed:.1f}초 소요) ===")
-
-        # Update UI on main thread
-        def _finish():
-            self.progress_bar.set(1)
-            self.is_cleaning = False
-            self.clean_btn.configure(state="normal", text="지금 정리하기")
-            self.select_all_btn.configure(state="normal")
-            self.deselect_all_btn.configure(state="normal")
-            self.status_label.configure(
-                text=f"정리 완료! {len(selected_items)}개 항목 처리됨 ({elapsed:.1f}초)",
-                text_color="#22C55E",
+        if history_range:
+            since = time.strftime("%Y-%m-%d %H:%M", time.localtime(history_range.since))
+            self._log(f"브라우저 기록 범위: {since} 이후 항목만 삭제\n")
+        if temp_policy:
+            self._log(f"임시 파일 정리 범위: {temp_policy.describe()}\n")
+
+        from cleaners.deletion import format_bytes
+        from cleaners.instrument import STATUS_CANCELLED, RunReport
+        from cleaners.scheduler import Scheduler
+
+        token = self.cancel_token
+        # Whatever happens below, the UI must leave the cleaning state (or the window cannot close)
+        status = ("정리 중 오류가 발생했습니다 (로그 참고)", "#EF4444", False)
+        try:
+            metrics = RunReport()
+            scheduler = Scheduler(
+                CLEANER_CATEGORIES,
+                self._log,
+                cancel=token,
+                progress=tracker,
+                metrics=metrics,
+                history_range=history_range,
+                temp_policy=temp_policy,
             )
-
-        self.after(0, _finish)
+            completed = scheduler.run(selected_items)
+            metrics.finish()
+            self.clean_results = dict(scheduler.results)
+            done_items = sum(len(items) for items in completed.values())
+
+            elapsed = time.time() - start_time
+            if token.cancelled:
+                self._log(
+                    f"\n=== 정리 중지됨: {done_items}/{len(selected_items)}개 항목 완료 "
+                    f"({elapsed:.1f}초 소요) ==="
+                )
+                # Includes browser items whose queued DB deletion never ran
+                labels = item_labels()
+                stopped = [
+                    labels.get(item, item) for item, result in self.clean_results.items()
+                    if result.status == STATUS_CANCELLED
+                ]
+                if stopped:
+                    self._log(f"중지된 항목: {', '.join(stopped)}")
+            else:
+                self._log(f"\n=== 정리 완료! ({elapsed:.1f}초 소요) ===")
+            totals = metrics.totals()
+            self._log(f"정리 결과: {format_result(totals)}")
+            self._log_freed(self.clean_results)
+            self._log_metrics(metrics)
+            if token.cancelled:
+                status = (
+                    f"정리 중지됨: {done_items}/{len(selected_items)}개 항목 완료 ({elapsed:.1f}초)", "#F59E0B", False,
+                )
+            else:
+                freed = f" · {format_bytes(totals.bytes)} 확보" if totals.bytes else ""
+                status = (
+                    f"정리 완료! {len(selected_items)}개 항목 처리됨{freed} ({elapsed:.1f}초)", "#22C55E", True,
+                )
+        except Exception:
+            self._log(f"\n[오류] 정리 중 예외 발생:\n{traceback.format_exc()}")
+        finally:
+            if self.log_sink.log_path:
+                self._log(f"전체 로그: {self.log_sink.log_path}")
+            # Update UI on main thread
+            self.after(0, self._finish_cleaning, *status)
+
+    def _finish_cleaning(self, text, color, completed):
+        """Leave the cleaning state and show the outcome (main thread)."""
+        self.is_cleaning = False
+        self.cancel_token = None
+        self.clean_btn.configure(state="normal", text="지금 정리하기")
+        self.stop_btn.configure(state="disabled")
+        self.select_all_btn.configure(state="normal")
+        self.deselect_all_btn.configure(state="normal")
+        self.restore_btn.configure(state="normal")
+        if completed:
+            self.progress_bar.set(1)
+        self.status_label.configure(text=text, text_color=color)
+        self._start_scan()
 
 
 def main():
-    # Admin check - request elevation if not admin
-    if not is_admin():
+    report_path = startup_report_path(sys.argv[1:])
+    startup = StartupReport(report_path) if report_path else None
+
+    # Admin check - request elevation if not admin (a startup measurement runs as is)
+    if startup is None and not is_admin():
         run_as_admin()
         return
 
-    app = MyPCNow()
+    app = MyPCNow(startup=startup)
     app.mainloop()
 
 
@@ -1,37 +1,90 @@
-"""MyPcNow cleaners - Windows 11 Privacy Cleanup Modules"""
+"""MyPcNow cleaners - Windows 11 Privacy Cleanup Modules
 
-from .browser import BrowserCleaner
-from .windows_activity import WindowsActivityCleaner
-from .system_traces import SystemTracesCleaner
-from .desktop import DesktopCleaner
-from .app_traces import AppTracesCleaner
+Importing the package is cheap: CLEANER_CATEGORIES names every cleaner
+through a LazyCleaner, and a cleaner module (with the deletion engine,
+SQLite and backend code behind it) is only imported when its category is
+first run, scanned or scheduled. `from cleaners import BrowserCleaner`
+still works and imports just that module.
+"""
+
+import importlib
+import threading
+
+from .profiles import BROWSER_RULES
+
+
+class LazyCleaner:
+    """Stands in for a cleaner class until it is needed.
+
+    Calling it constructs the cleaner; any attribute (RESOURCES, ...) is
+    read from the class. Both import the module on first use.
+    """
+
+    __slots__ = ("module", "name", "_cls")
+    _lock = threading.Lock()
+
+    def __init__(self, module, name):
+        self.module = module
+        self.name = name
+        self._cls = None
+
+    @property
+    def loaded(self):
+        return self._cls is not None
+
+    def resolve(self):
+        """The cleaner class, importing its module the first time."""
+        if self._cls is None:
+            with self._lock:
+                if self._cls is None:
+                    module = importlib.import_module(f".{self.module}", __name__)
+                    self._cls = getattr(module, self.name)
+        return self._cls
+
+    def __call__(self, *args, **kwargs):
+        return self.resolve()(*args, **kwargs)
+
+    def __getattr__(self, attr):
+        return getattr(self.resolve(), attr)
+
+    def __repr__(self):
+        return f"<LazyCleaner {self.module}.{self.name}{'' if self.loaded else ' (not loaded)'}>"
+
+
+_CLEANERS = {
+    name: LazyCleaner(module, name)
+    for module, name in (
+        ("browser", "BrowserCleaner"),
+        ("windows_activity", "WindowsActivityCleaner"),
+        ("system_traces", "SystemTracesCleaner"),
+        ("desktop", "DesktopCleaner"),
+        ("app_traces", "AppTracesCleaner"),
+    )
+}
+
+
+# Items whose entries are moved into the recovery store instead of deleted
+RECOVERABLE_ITEMS = frozenset({"user_shortcuts"})
+
+
+def __getattr__(name):
+    """`from cleaners import BrowserCleaner` imports and returns the real class."""
+    if name in _CLEANERS:
+        return _CLEANERS[name].resolve()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 CLEANER_CATEGORIES = {
     "browser": {
         "name": "브라우저 기록",
         "icon": "🌐",
-        "cleaner": BrowserCleaner,
-        "items": {
-            "chrome_history": "Chrome 방문 기록",
-            "chrome_cache": "Chrome 캐시",
-            "chrome_cookies": "Chrome 쿠키",
-            "chrome_downloads": "Chrome 다운로드 기록",
-            "edge_history": "Edge 방문 기록",
-            "edge_cache": "Edge 캐시",
-            "edge_cookies": "Edge 쿠키",
-            "edge_downloads": "Edge 다운로드 기록",
-            "firefox_history": "Firefox 방문 기록",
-            "firefox_cache": "Firefox 캐시",
-            "firefox_cookies": "Firefox 쿠키",
-            "brave_history": "Brave 방문 기록",
-            "brave_cache": "Brave 캐시",
-            "brave_cookies": "Brave 쿠키",
-        },
+        "cleaner": _CLEANERS["BrowserCleaner"],
+        # One item per rule in profiles.BROWSERS ("Chrome 방문 기록", ...)
+        "items": {item: rule.label for item, rule in BROWSER_RULES.items()},
     },
     "windows_activity": {
         "name": "Windows 검색/활동",
         "icon": "🔍",
-        "cleaner": WindowsActivityCleaner,
+        "cleaner": _CLEANERS["WindowsActivityCleaner"],
         "items": {
             "search_history": "Windows 검색 기록",
             "activity_timeline": "활동 타임라인",
@@ -44,7 +97,7 @@ CLEANER_CATEGORIES = {
     "system_traces": {
         "name": "시스템 흔적",
         "icon": "🗑️",
-        "cleaner": SystemTracesCleaner,
+        "cleaner": _CLEANERS["SystemTracesCleaner"],
         "items": {
             "temp_files": "임시 파일 (%TEMP%)",
             "windows_temp": "Windows 임시 파일",
@@ -57,7 +110,7 @@ CLEANER_CATEGORIES = {
     "desktop": {
         "name": "바탕화면",
         "icon": "🖥️",
-        "cleaner": DesktopCleaner,
+        "cleaner": _CLEANERS["DesktopCleaner"],
         "items": {
             "user_shortcuts": "사용자가 만든 바로가기 (복구 가능)",
         },
@@ -65,7 +118,7 @@ CLEANER_CATEGORIES = {
     "app_traces": {
         "name": "앱 사용 흔적",
         "icon": "📱",
-        "cleaner": AppTracesCleaner,
+        "cleaner": _CLEANERS["AppTracesCleaner"],
         "items": {
             "recent_docs": "최근 문서 (MRU 목록)",
             "userassist": "프로그램 사용 통계 (UserAssist)",
@@ -0,0 +1,355 @@
+"""Headless command-line entry point: python -m cleaners [ITEM ...]
+
+Runs cleanup items from CLEANER_CATEGORIES without the GUI (no Tk, no UAC
+prompt) and prints a JSON report for scheduled tasks and fleet automation:
+
+    python -m cleaners --list
+    python -m cleaners chrome_cache temp_files
+    python -m cleaners --category browser --scan
+    python -m cleaners --all --output C:\\Logs\\mypcnow.json
+    python -m cleaners chrome_history --since-hours 1 --domain example.com
+    python -m cleaners temp_files --older-than-hours 24 --larger-than-mb 500
+    python -m cleaners --all --incremental
+    python -m cleaners --recovery
+    python -m cleaners --restore 20260101_120000_user_shortcuts_1a2b3c
+    python -m cleaners --all --sandbox D:\\sandbox
+
+Items that touch system locations (windows_temp, prefetch, app_event_logs)
+need an elevated prompt; without it they report skipped/errors instead of
+failing the whole run. Run log lines go to stderr unless --quiet is given.
+
+Exit status: 0 on success, 1 if any item recorded an error (or --restore left
+entries in the store), 2 for bad arguments or an unknown snapshot, 130 if
+interrupted with Ctrl+C.
+"""
+
+import argparse
+import json
+import platform
+import sys
+import threading
+import time
+
+from . import CLEANER_CATEGORIES
+from .backends import SandboxBackend, default_backend
+from .base import CancelToken
+from .history_prune import HistoryRange
+from .instrument import REPORT_VERSION, RunReport
+from .journal import CleanupJournal
+from .recovery import RecoveryStore, default_recovery_root
+from .temp_policy import TempPolicy
+from .scheduler import MAX_SCHEDULER_WORKERS, Scheduler
+
+_SKIP_MARK = "[건너뜀]"
+
+
+def _all_items():
+    """{item_key: cat_key} in GUI order."""
+    return {item: cat_key for cat_key, cat in CLEANER_CATEGORIES.items() for item in cat["items"]}
+
+
+def _parse_args(argv):
+    parser = argparse.ArgumentParser(
+        prog="python -m cleaners",
+        description="MyPcNow headless cleanup with a JSON report.",
+    )
+    parser.add_argument("items", nargs="*", metavar="ITEM", help="item keys (see --list)")
+    parser.add_argument("--all", action="store_true", help="run every item")
+    parser.add_argument("--category", action="append", default=[], metavar="CAT",
+                        help="run every item of a category (repeatable)")
+    parser.add_argument("--scan", action="store_true",
+                        help="only measure what would be removed; nothing is changed")
+    parser.add_argument("--jobs", type=int, default=MAX_SCHEDULER_WORKERS,
+                        help=f"concurrent tasks (default {MAX_SCHEDULER_WORKERS})")
+    parser.add_argument("--since-hours", type=float, metavar="H",
+                        help="browser history: only remove entries from the last H hours")
+    parser.add_argument("--domain", action="append", default=[], metavar="DOMAIN",
+                        help="browser history: only remove entries of DOMAIN and its subdomains (repeatable)")
+    parser.add_argument("--older-than-hours", type=float, metavar="H",
+                        help="temp files: only remove entries not modified in the last H hours")
+    parser.add_argument("--larger-than-mb", type=float, metavar="MB",
+                        help="temp files: also remove files of at least MB megabytes, however recent")
+    parser.add_argument("--keep-newest-gb", type=float, metavar="GB",
+                        help="temp files: keep the most recently modified GB gigabytes")
+    parser.add_argument("--incremental", action="store_true",
+                        help="skip directories unchanged since the last --incremental run (cleanup journal)")
+    parser.add_argument("--journal", metavar="FILE",
+                        help="journal file for --incremental (default %%LOCALAPPDATA%%\\MyPcNow\\journal.sqlite)")
+    parser.add_argument("--sandbox", metavar="DIR",
+                        help="work on a Windows-shaped folder tree in DIR and its registry.json "
+                             "instead of this machine (created if missing)")
+    parser.add_argument("--output", metavar="FILE", help="write the JSON report to FILE instead of stdout")
+    parser.add_argument("--quiet", action="store_true", help="do not echo the run log to stderr")
+    parser.add_argument("--list", action="store_true", help="list categories and item keys, then exit")
+    parser.add_argument("--recovery", action="store_true",
+                        help="list recoverable snapshots (moved desktop shortcuts, ...), then exit")
+    parser.add_argument("--restore", metavar="SNAPSHOT",
+                        help="move a recoverable snapshot's entries back, then exit")
+    args = parser.parse_args(argv)
+
+    known = _all_items()
+    if args.list or args.recovery or args.restore:
+        return args, []
+    selected = set(args.items)
+    unknown = sorted(selected - known.keys())
+    if unknown:
+        parser.error(f"unknown item(s): {', '.join(unknown)}")
+    for cat_key in args.category:
+        if cat_key not in CLEANER_CATEGORIES:
+            parser.error(f"unknown category: {cat_key}")
+        selected.update(CLEANER_CATEGORIES[cat_key]["items"])
+    if args.all:
+        selected.update(known)
+    if not selected:
+        parser.error("no items given (use ITEM, --category, --all or --list)")
+    if args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+    if args.since_hours is not None and args.since_hours <= 0:
+        parser.error("--since-hours must be positive")
+    for flag in ("older_than_hours", "larger_than_mb", "keep_newest_gb"):
+        if getattr(args, flag) is not None and getattr(args, flag) <= 0:
+            parser.error(f"--{flag.replace('_', '-')} must be positive")
+    return args, [item for item in known if item in selected]
+
+
+def _list_items():
+    return {
+        cat_key: {"name": cat["name"], "items": dict(cat["items"])}
+        for cat_key, cat in CLEANER_CATEGORIES.items()
+    }
+
+
+def _backend(args):
+    """SandboxBackend for --sandbox, else the real machine."""
+    return SandboxBackend(args.sandbox) if args.sandbox else default_backend()
+
+
+def _recovery(args):
+    """--recovery / --restore: work on the recovery store instead of cleaning."""
+    store = RecoveryStore(default_recovery_root(_backend(args).environ))
+    try:
+        if args.recovery:
+            json.dump({"root": store.root, "snapshots": store.snapshots()}, sys.stdout, indent=2)
+            sys.stdout.write("\n")
+            return 0
+        try:
+            restored, conflicts = store.restore(args.restore)
+        except KeyError:
+            print(f"unknown snapshot: {args.restore}", file=sys.stderr)
+            return 2
+        json.dump({"snapshot": args.restore, "restored": restored, "conflicts": conflicts}, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return 1 if conflicts else 0
+    finally:
+        store.close()
+
+
+def _item_entry(item, cat_key):
+    return {
+        "category": cat_key,
+        "label": CLEANER_CATEGORIES[cat_key]["items"][item],
+        "status": "not_run",
+    }
+
+
+def _history_range(args):
+    """HistoryRange from --since-hours/--domain, or None to clear everything."""
+    history_range = HistoryRange.last(
+        args.since_hours * 3600 if args.since_hours else None, args.domain,
+    )
+    return history_range or None
+
+
+def _temp_policy(args):
+    """TempPolicy from --older-than-hours/--larger-than-mb/--keep-newest-gb, or None."""
+    policy = TempPolicy(
+        older_than=args.older_than_hours * 3600 if args.older_than_hours else None,
+        larger_than=int(args.larger_than_mb * 1024 ** 2) if args.larger_than_mb else None,
+        keep_newest=int(args.keep_newest_gb * 1024 ** 3) if args.keep_newest_gb else None,
+    )
+    return policy or None
+
+
+def _scan(selected, log, token, history_range=None, temp_policy=None, backend=None):
+    """Scan-only run, one item at a time (read-only, so nothing is lost by not merging)."""
+    known = _all_items()
+    report = {item: _item_entry(item, known[item]) for item in selected}
+    for item in selected:
+        if token.cancelled:
+            break
+        cat = CLEANER_CATEGORIES[known[item]]
+        entry = report[item]
+        start = time.perf_counter()
+        try:
+            cleaner = cat["cleaner"](log_callback=log, backend=backend)
+            cleaner.history_range = history_range
+            cleaner.temp_policy = temp_policy
+            estimate = cleaner.run([item], scan_only=True, cancel=token)
+        except KeyboardInterrupt:
+            token.cancel()
+            break
+        except Exception as e:
+            entry.update(status="failed", errors=[f"{cat['name']}: {e}"])
+            continue
+        if item not in estimate:
+            continue
+        entry.update(
+            status="scanned",
+            seconds=round(time.perf_counter() - start, 4),
+            count=estimate[item].items,
+            bytes=estimate[item].bytes,
+            rows=estimate[item].rows,
+            errors=[],
+        )
+    return report
+
+
+def _clean(selected, args, log, token, history_range=None, temp_policy=None, journal=None, backend=None):
+    """Real cleanup through the scheduler; returns per-item report entries."""
+    known = _all_items()
+    report = {item: _item_entry(item, known[item]) for item in selected}
+    for entry in report.values():
+        entry.update(errors=[], skipped=[], log=[])
+    metrics = RunReport()
+
+    def item_log(cat_key, item, message):
+        entry = report.get(item)
+        if entry is None:
+            return
+        text = message.strip()
+        entry["log"].append(text)
+        if _SKIP_MARK in text:
+            entry["skipped"].append(text)
+
+    scheduler = Scheduler(
+        CLEANER_CATEGORIES, log, max_workers=args.jobs, cancel=token,
+        item_log=item_log, metrics=metrics, history_range=history_range, temp_policy=temp_policy,
+        journal=journal, backend=backend,
+    )
+    # Run off the main thread so Ctrl+C can cancel at the next checkpoint
+    failure = []
+
+    def target():
+        try:
+            scheduler.run(selected)
+        except Exception as e:
+            failure.append(e)
+    worker = threading.Thread(target=target, name="mypcnow-cli")
+    worker.start()
+    try:
+        while worker.is_alive():
+            worker.join(0.2)
+    except KeyboardInterrupt:
+        token.cancel()
+        worker.join()
+    if failure:
+        raise failure[0]
+
+    metrics.finish()
+    for item, entry in report.items():
+        result = scheduler.results.get(item)
+        if result is None:
+            entry.update(seconds=None, count=0, bytes=0, rows=0)
+            continue
+        entry.update(
+            status=result.status,
+            seconds=round(result.seconds, 6),
+            count=result.files,
+            dirs=result.dirs,
+            bytes=result.bytes,
+            rows=result.rows,
+            registry_values=result.registry_values,
+            in_use=result.in_use,
+            errors=list(result.errors),
+        )
+        item_metrics = metrics.items.get(item)
+        if item_metrics is not None:
+            measured = item_metrics.to_dict()
+            entry.update(
+                cpu=measured["cpu"],
+                sqlite_seconds=measured["sqlite_seconds"],
+                registry_calls=measured["registry_calls"],
+                registry_ops=measured["registry_ops"],
+            )
+    return report
+
+
+def main(argv=None):
+    args, selected = _parse_args(argv)
+    if args.list:
+        json.dump(_list_items(), sys.stdout, indent=2)
+        sys.stdout.write("\n")
+        return 0
+    if args.recovery or args.restore:
+        return _recovery(args)
+
+    if hasattr(sys.stderr, "reconfigure"):
+        # Category icons are not encodable on legacy console code pages
+        sys.stderr.reconfigure(errors="replace")
+    if args.quiet:
+        def log(message):
+            pass
+    else:
+        def log(message):
+            print(message, file=sys.stderr, flush=True)
+
+    token = CancelToken()
+    backend = _backend(args)
+    history_range = _history_range(args)
+    temp_policy = _temp_policy(args)
+    journal = None
+    if (args.incremental or args.journal) and not args.scan:
+        journal = CleanupJournal.load(args.journal, environ=backend.environ)
+    started = time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    start = time.perf_counter()
+    if args.scan:
+        items = _scan(selected, log, token, history_range, temp_policy, backend)
+    else:
+        items = _clean(selected, args, log, token, history_range, temp_policy, journal, backend)
+        if args.sandbox:
+            backend.save()
+    elapsed = time.perf_counter() - start
+    journal_saved = journal.save() if journal is not None else None
+
+    report = {
+        "version": REPORT_VERSION,
+        "host": platform.node(),
+        "mode": "scan" if args.scan else "clean",
+        "started": started,
+        "seconds": round(elapsed, 4),
+        "cancelled": token.cancelled,
+        "backend": {"name": backend.name, "root": backend.root},
+        "history_range": (
+            {"since_hours": args.since_hours, "domains": list(history_range.domains)} if history_range else None
+        ),
+        "temp_policy": temp_policy.to_dict() if temp_policy else None,
+        "journal": (
+            {"path": journal.path, "skipped_dirs": journal.skipped, "saved": journal_saved} if journal else None
+        ),
+        "totals": {
+            "items": len(items),
+            "completed": sum(1 for e in items.values() if e["status"] in ("completed", "scanned")),
+            "count": sum(e.get("count", 0) for e in items.values()),
+            "bytes": sum(e.get("bytes", 0) for e in items.values()),
+            "rows": sum(e.get("rows", 0) for e in items.values()),
+            "registry_values": sum(e.get("registry_values", 0) for e in items.values()),
+            "in_use": sum(e.get("in_use", 0) for e in items.values()),
+            "errors": sum(len(e.get("errors", ())) for e in items.values()),
+        },
+        "items": items,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+            f.write("\n")
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write("\n")
+
+    if token.cancelled:
+        return 130
+    return 1 if report["totals"]["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,577 @@
+"""Platform backends: the machine a cleaner works on.
+
+Cleaners do not read os.environ, import winreg or call shell32/user32
+themselves; they go through the backend passed to their constructor
+(BaseCleaner(backend=...)):
+
+    backend.environ / env_path(*vars)   known folders (LOCALAPPDATA, TEMP, ...)
+    backend.winreg()                    a winreg-compatible module
+    backend.is_admin()
+    backend.recycle_bin_info() / empty_recycle_bin()  (items, bytes) counted / freed
+    backend.clipboard_has_data() / clear_clipboard()
+    backend.run_command(args, timeout)  wevtutil
+
+Three backends exist:
+
+    WindowsBackend  the real machine (the default)
+    SandboxBackend  known folders inside a directory on disk, a MemoryRegistry
+                    kept in <root>/registry.json, a folder standing in for
+                    the Recycle Bin and simulated clipboard and event logs
+    MemoryBackend   a SandboxBackend on a RAM-backed temporary directory
+                    (/dev/shm where available), removed by close()
+
+Files are still removed by the shared deletion engine with real os calls
+in every backend, so sandboxed runs exercise and time exactly the code a
+Windows run does; only where the files live differs. That lets the whole
+pipeline, registry items included, run and be profiled on Linux (see
+benchmarks/bench_cleaners.py).
+"""
+
+import ctypes
+import json
+import os
+import subprocess
+import tempfile
+import threading
+import time
+
+from .deletion import delete_dir_contents, delete_path, scan_dir_contents
+
+_SHERB_NO_UI = 0x0007  # SHERB_NOCONFIRMATION | SHERB_NOPROGRESSUI | SHERB_NOSOUND
+
+
+class _SHQUERYRBINFO(ctypes.Structure):
+    # shellapi.h packs this struct to 1 byte on 32-bit Windows only
+    _pack_ = 1 if ctypes.sizeof(ctypes.c_void_p) == 4 else 8
+    _fields_ = [
+        ("cbSize", ctypes.c_ulong),
+        ("i64Size", ctypes.c_longlong),
+        ("i64NumItems", ctypes.c_longlong),
+    ]
+
+
+def _validated(environ, env_vars):
+    for var in env_vars:
+        val = environ.get(var, "")
+        if val and os.path.isabs(val):
+            return val
+    return None
+
+
+class _WindowsRegistry:
+    """The winreg module with DeleteTree (RegDeleteTreeW), which winreg lacks."""
+
+    def __init__(self, module):
+        self._module = module
+        self._delete_tree = ctypes.windll.advapi32.RegDeleteTreeW
+        self._delete_tree.argtypes = (ctypes.c_void_p, ctypes.c_wchar_p)
+        self._delete_tree.restype = ctypes.c_long
+
+    def __getattr__(self, name):
+        return getattr(self._module, name)
+
+    def DeleteTree(self, key, sub_key=None):
+        """Delete sub_key and everything under it; without sub_key, key's values and subkeys."""
+        status = self._delete_tree(int(key), sub_key)
+        if status:
+            raise ctypes.WinError(status)
+
+
+_WINREG = None
+
+
+class WindowsBackend:
+    """The real machine: process environment, winreg, shell32 and user32."""
+
+    name = "windows"
+    root = None
+
+    @property
+    def environ(self):
+        return os.environ
+
+    def env_path(self, *env_vars):
+        """First of env_vars set to an absolute path, or None."""
+        return _validated(os.environ, env_vars)
+
+    def winreg(self):
+        """The winreg module plus DeleteTree. Raises ImportError off Windows."""
+        global _WINREG
+        if _WINREG is None:
+            import winreg
+            _WINREG = _WindowsRegistry(winreg)
+        return _WINREG
+
+    def is_admin(self):
+        try:
+            return bool(ctypes.windll.shell32.IsUserAnAdmin())
+        except Exception:
+            return False
+
+    def recycle_bin_info(self):
+        """(items, bytes) in the Recycle Bin, or None if it cannot be queried."""
+        info = _SHQUERYRBINFO(cbSize=ctypes.sizeof(_SHQUERYRBINFO))
+        try:
+            if ctypes.windll.shell32.SHQueryRecycleBinW(None, ctypes.byref(info)) != 0:
+                return None
+        except Exception:
+            return None
+        return info.i64NumItems, info.i64Size
+
+    def empty_recycle_bin(self):
+        """Empty the Recycle Bin; returns the (items, bytes) it held, or None if unknown."""
+        # The shell keeps these totals itself: one query, no walk of $Recycle.Bin
+        info = self.recycle_bin_info()
+        ctypes.windll.shell32.SHEmptyRecycleBinW(None, None, _SHERB_NO_UI)
+        return info
+
+    def clipboard_has_data(self):
+        try:
+            return ctypes.windll.user32.CountClipboardFormats() > 0
+        except Exception:
+            return False
+
+    def clear_clipboard(self):
+        ctypes.windll.user32.OpenClipboard(0)
+        ctypes.windll.user32.EmptyClipboard()
+        ctypes.windll.user32.CloseClipboard()
+
+    def run_command(self, args, timeout):
+        """subprocess.run(args) with text output captured, without a console window."""
+        # The exe is windowed (console=False): without the flag every wevtutil
+        # call of the background scan would flash a console
+        return subprocess.run(
+            args, capture_output=True, text=True, timeout=timeout,
+            creationflags=getattr(subprocess, "CREATE_NO_WINDOW", 0),
+        )
+
+    def close(self):
+        pass
+
+
+_DEFAULT_BACKEND = WindowsBackend()
+
+
+def default_backend():
+    """The shared WindowsBackend used when a cleaner is given none."""
+    return _DEFAULT_BACKEND
+
+
+# --- In-memory registry ---
+
+def _no_more_data():
+    return OSError(259, "No more data is available")
+
+
+def _access_denied(path):
+    return PermissionError(5, "Access is denied", path)
+
+
+def _not_found(path):
+    return FileNotFoundError(2, "The system cannot find the file specified", path)
+
+
+class _RegKey:
+    __slots__ = ("name", "values", "subkeys", "modified", "deleted", "_value_list", "_subkey_list")
+
+    def __init__(self, name):
+        self.name = name
+        self.values = {}   # lowercase name -> (name, data, type)
+        self.subkeys = {}  # lowercase name -> _RegKey
+        self.modified = time.time()
+        self.deleted = False
+        self._value_list = None   # EnumValue/EnumKey index caches, dropped by touch()
+        self._subkey_list = None
+
+    def touch(self):
+        self.modified = time.time()
+        self._value_list = self._subkey_list = None
+
+    def value_list(self):
+        if self._value_list is None:
+            self._value_list = list(self.values.values())
+        return self._value_list
+
+    def subkey_list(self):
+        if self._subkey_list is None:
+            self._subkey_list = list(self.subkeys.values())
+        return self._subkey_list
+
+
+class RegistryHandle:
+    """An open key of a MemoryRegistry (what winreg calls a PyHKEY)."""
+
+    __slots__ = ("_node", "_path", "_writable", "closed")
+
+    def __init__(self, node, path, writable):
+        self._node = node
+        self._path = path
+        self._writable = writable
+        self.closed = False
+
+    def Close(self):
+        self.closed = True
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.Close()
+
+    def __repr__(self):
+        return f"<RegistryHandle {self._path!r}{' closed' if self.closed else ''}>"
+
+
+class MemoryRegistry:
+    """Thread-safe in-memory registry with the subset of the winreg API the cleaners use.
+
+    Keys and value names are case-insensitive, handles opened with KEY_READ
+    refuse writes, EnumKey/EnumValue past the end raise OSError and
+    DeleteKey refuses keys that still have subkeys, all as winreg does.
+    DeleteTree is RegDeleteTreeW, which WindowsBackend.winreg() also offers.
+    """
+
+    HKEY_CLASSES_ROOT = 0x80000000
+    HKEY_CURRENT_USER = 0x80000001
+    HKEY_LOCAL_MACHINE = 0x80000002
+    HKEY_USERS = 0x80000003
+
+    KEY_QUERY_VALUE = 0x0001
+    KEY_SET_VALUE = 0x0002
+    KEY_CREATE_SUB_KEY = 0x0004
+    KEY_READ = 0x20019
+    KEY_WRITE = 0x20006
+    KEY_ALL_ACCESS = 0xF003F
+
+    REG_NONE = 0
+    REG_SZ = 1
+    REG_EXPAND_SZ = 2
+    REG_BINARY = 3
+    REG_DWORD = 4
+    REG_MULTI_SZ = 7
+    REG_QWORD = 11
+
+    _HIVE_NAMES = {
+        HKEY_CLASSES_ROOT: "HKEY_CLASSES_ROOT",
+        HKEY_CURRENT_USER: "HKEY_CURRENT_USER",
+        HKEY_LOCAL_MACHINE: "HKEY_LOCAL_MACHINE",
+        HKEY_USERS: "HKEY_USERS",
+    }
+
+    def __init__(self):
+        self._hives = {hive: _RegKey(name) for hive, name in self._HIVE_NAMES.items()}
+        self._lock = threading.RLock()
+
+    # winreg API
+    def OpenKey(self, key, sub_key, reserved=0, access=KEY_READ):
+        with self._lock:
+            node, path = self._resolve(key, sub_key)
+            return RegistryHandle(node, path, bool(access & self.KEY_SET_VALUE))
+
+    OpenKeyEx = OpenKey
+
+    def CreateKey(self, key, sub_key):
+        with self._lock:
+            node, path = self._resolve(key, "", write=True)
+            for part in self._parts(sub_key):
+                child = node.subkeys.get(part.lower())
+                if child is None:
+                    child = node.subkeys[part.lower()] = _RegKey(part)
+                    node.touch()
+                node = child
+                path = f"{path}\\{part}"
+            return RegistryHandle(node, path, True)
+
+    def CreateKeyEx(self, key, sub_key, reserved=0, access=KEY_WRITE):
+        return self.CreateKey(key, sub_key)
+
+    def CloseKey(self, hkey):
+        if isinstance(hkey, RegistryHandle):
+            hkey.Close()
+
+    def FlushKey(self, key):
+        self._resolve(key, "")
+
+    def QueryInfoKey(self, key):
+        """(subkeys, values, last write time in 100 ns units since 1601)."""
+        with self._lock:
+            node, _ = self._resolve(key, "")
+            return len(node.subkeys), len(node.values), int((node.modified + 11644473600) * 10_000_000)
+
+    def QueryValueEx(self, key, value_name):
+        with self._lock:
+            node, path = self._resolve(key, "")
+            entry = node.values.get((value_name or "").lower())
+            if entry is None:
+                raise _not_found(f"{path}\\{value_name}")
+            return entry[1], entry[2]
+
+    def SetValueEx(self, key, value_name, reserved, type, value):
+        with self._lock:
+            node, _ = self._resolve(key, "", write=True)
+            value_name = value_name or ""
+            node.values[value_name.lower()] = (value_name, value, type)
+            node.touch()
+
+    def EnumValue(self, key, index):
+        with self._lock:
+            node, _ = self._resolve(key, "")
+            entries = node.value_list()
+            if not 0 <= index < len(entries):
+                raise _no_more_data()
+            return entries[index]
+
+    def EnumKey(self, key, index):
+        with self._lock:
+            node, _ = self._resolve(key, "")
+            children = node.subkey_list()
+            if not 0 <= index < len(children):
+                raise _no_more_data()
+            return children[index].name
+
+    def DeleteValue(self, key, value):
+        with self._lock:
+            node, path = self._resolve(key, "", write=True)
+            if node.values.pop((value or "").lower(), None) is None:
+                raise _not_found(f"{path}\\{value}")
+            node.touch()
+
+    def DeleteKey(self, key, sub_key):
+        with self._lock:
+            parent, path = self._resolve(key, "", write=True)
+            parts = self._parts(sub_key)
+            if not parts:
+                raise _access_denied(path)
+            for part in parts[:-1]:
+                parent = parent.subkeys.get(part.lower())
+                if parent is None:
+                    raise _not_found(f"{path}\\{sub_key}")
+            child = parent.subkeys.get(parts[-1].lower())
+            if child is None:
+                raise _not_found(f"{path}\\{sub_key}")
+            if child.subkeys:
+                raise _access_denied(f"{path}\\{sub_key}")
+            del parent.subkeys[parts[-1].lower()]
+            child.deleted = True
+            parent.touch()
+
+    def DeleteTree(self, key, sub_key=None):
+        """RegDeleteTreeW: without sub_key, every value and subkey of key; else the whole subkey."""
+        with self._lock:
+            if not sub_key:
+                node, _ = self._resolve(key, "", write=True)
+                doomed = list(node.subkeys.values())
+                node.values.clear()
+                node.subkeys.clear()
+                node.touch()
+            else:
+                parts = self._parts(sub_key)
+                parent, path = self._resolve(key, "\\".join(parts[:-1]), write=True)
+                child = parent.subkeys.get(parts[-1].lower())
+                if child is None:
+                    raise _not_found(f"{path}\\{parts[-1]}")
+                del parent.subkeys[parts[-1].lower()]
+                parent.touch()
+                doomed = [child]
+            while doomed:
+                node = doomed.pop()
+                node.deleted = True
+                doomed.extend(node.subkeys.values())
+
+    # helpers
+    @staticmethod
+    def _parts(sub_key):
+        return [part for part in (sub_key or "").replace("/", "\\").split("\\") if part]
+
+    def _resolve(self, key, sub_key, write=False):
+        if isinstance(key, RegistryHandle):
+            if key.closed:
+                raise OSError(6, "The handle is invalid")
+            if write and not key._writable:
+                raise _access_denied(key._path)
+            node, path = key._node, key._path
+        elif key in self._hives:
+            node, path = self._hives[key], self._HIVE_NAMES[key]
+        else:
+            raise OSError(6, "The handle is invalid")
+        for part in self._parts(sub_key):
+            node = node.subkeys.get(part.lower())
+            path = f"{path}\\{part}"
+            if node is None:
+                raise _not_found(path)
+        if node.deleted:
+            raise OSError(1018, "Illegal operation attempted on a registry key that has been marked for deletion")
+        return node, path
+
+    def count_values(self, hive, sub_key=""):
+        """Values in a key and all its subkeys (0 if it does not exist)."""
+        with self._lock:
+            try:
+                node, _ = self._resolve(hive, sub_key)
+            except FileNotFoundError:
+                return 0
+            stack, total = [node], 0
+            while stack:
+                node = stack.pop()
+                total += len(node.values)
+                stack.extend(node.subkeys.values())
+            return total
+
+    # persistence (SandboxBackend keeps the registry next to its files)
+    def to_dict(self):
+        def dump(node):
+            values = [
+                [name, type, {"hex": data.hex()} if isinstance(data, bytes) else data]
+                for name, data, type in node.values.values()
+            ]
+            return {"values": values, "keys": {child.name: dump(child) for child in node.subkeys.values()}}
+        with self._lock:
+            return {self._HIVE_NAMES[hive]: dump(node) for hive, node in self._hives.items()}
+
+    @classmethod
+    def from_dict(cls, data):
+        registry = cls()
+
+        def load(node, tree):
+            for name, type, value in tree.get("values", ()):
+                if isinstance(value, dict):
+                    value = bytes.fromhex(value["hex"])
+                node.values[name.lower()] = (name, value, type)
+            for name, subtree in tree.get("keys", {}).items():
+                child = node.subkeys[name.lower()] = _RegKey(name)
+                load(child, subtree)
+        for hive, name in cls._HIVE_NAMES.items():
+            if name in data:
+                load(registry._hives[hive], data[name])
+        return registry
+
+
+# --- Sandboxes ---
+
+# Known folders, relative to the sandbox root, laid out as on Windows 11
+SANDBOX_FOLDERS = {
+    "USERPROFILE": "Users/user",
+    "PUBLIC": "Users/Public",
+    "APPDATA": "Users/user/AppData/Roaming",
+    "LOCALAPPDATA": "Users/user/AppData/Local",
+    "TEMP": "Users/user/AppData/Local/Temp",
+    "TMP": "Users/user/AppData/Local/Temp",
+    "SYSTEMROOT": "Windows",
+    "PROGRAMDATA": "ProgramData",
+}
+SANDBOX_RECYCLE_BIN = "$Recycle.Bin"
+SANDBOX_REGISTRY_FILE = "registry.json"
+
+
+class SandboxBackend:
+    """A Windows-shaped folder tree on disk with a simulated registry and shell.
+
+    environ maps every SANDBOX_FOLDERS variable into `root`. The registry is
+    a MemoryRegistry loaded from <root>/registry.json (save() writes it
+    back), the Recycle Bin is <root>/$Recycle.Bin, and the clipboard and
+    event logs (wevtutil gli/cl) are plain attributes. admin=False makes
+    admin-only items skip as they would unelevated; folders replaces the
+    SANDBOX_FOLDERS layout.
+    """
+
+    name = "sandbox"
+
+    def __init__(self, root, registry=None, admin=True, folders=None):
+        self.root = os.path.abspath(root)
+        folders = SANDBOX_FOLDERS if folders is None else folders
+        self.environ = {var: os.path.join(self.root, *rel.split("/")) for var, rel in folders.items()}
+        for path in self.environ.values():
+            os.makedirs(path, exist_ok=True)
+        self.recycle_bin = os.path.join(self.root, SANDBOX_RECYCLE_BIN)
+        os.makedirs(self.recycle_bin, exist_ok=True)
+        if registry is None:
+            registry = self._load_registry()
+        self.registry = registry
+        self.admin = admin
+        self.clipboard = None             # text on the simulated clipboard
+        self.event_logs = {}              # channel -> record count
+        self._lock = threading.Lock()
+
+    def _load_registry(self):
+        path = os.path.join(self.root, SANDBOX_REGISTRY_FILE)
+        try:
+            with open(path, encoding="utf-8") as f:
+                return MemoryRegistry.from_dict(json.load(f))
+        except (OSError, ValueError):
+            return MemoryRegistry()
+
+    def save(self):
+        """Write the registry to <root>/registry.json."""
+        path = os.path.join(self.root, SANDBOX_REGISTRY_FILE)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.registry.to_dict(), f, ensure_ascii=False)
+
+    def env_path(self, *env_vars):
+        return _validated(self.environ, [var.upper() for var in env_vars])
+
+    def winreg(self):
+        return self.registry
+
+    def is_admin(self):
+        return self.admin
+
+    def recycle_bin_info(self):
+        result = scan_dir_contents(self.recycle_bin)
+        return result.files, result.bytes_freed
+
+    def empty_recycle_bin(self):
+        result = delete_dir_contents(self.recycle_bin)
+        if result.errors:
+            raise OSError(f"{len(result.errors)} entries could not be removed")
+        return result.files, result.bytes_freed
+
+    def clipboard_has_data(self):
+        return bool(self.clipboard)
+
+    def clear_clipboard(self):
+        self.clipboard = None
+
+    def run_command(self, args, timeout):
+        """Simulates `wevtutil gli|cl CHANNEL`; anything else is not found."""
+        if len(args) != 3 or args[0] != "wevtutil" or args[1] not in ("gli", "cl"):
+            raise FileNotFoundError(2, "No such command in the sandbox", args[0])
+        channel = args[2]
+        with self._lock:
+            if channel not in self.event_logs:
+                return subprocess.CompletedProcess(args, 15007, "", f"channel {channel} not found")
+            if args[1] == "cl":
+                self.event_logs[channel] = 0
+                return subprocess.CompletedProcess(args, 0, "", "")
+            records = self.event_logs[channel]
+        out = f"numberOfLogRecords: {records}\nfileSize: {records * 512}\n"
+        return subprocess.CompletedProcess(args, 0, out, "")
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def ram_directory():
+    """A RAM-backed directory for scratch trees (/dev/shm), or None to use the temp directory."""
+    shm = "/dev/shm"
+    return shm if os.path.isdir(shm) and os.access(shm, os.W_OK) else None
+
+
+class MemoryBackend(SandboxBackend):
+    """SandboxBackend on a RAM-backed temporary directory; close() removes it."""
+
+    name = "memory"
+
+    def __init__(self, admin=True):
+        super().__init__(tempfile.mkdtemp(prefix="mypcnow_mem_", dir=ram_directory()), MemoryRegistry(), admin)
+
+    def save(self):
+        pass  # nothing outlives the backend
+
+    def close(self):
+        delete_path(self.root)
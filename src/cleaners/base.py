@@ -0,0 +1,370 @@
+"""Common cleaner plumbing: item dispatch, scan-only (dry-run) mode, cancellation."""
+
+import contextlib
+import os
+import threading
+import time
+
+from .backends import default_backend
+from .instrument import (
+    STATUS_CANCELLED, STATUS_COMPLETED, STATUS_FAILED, CountingRegistry, ItemResult,
+)
+from .recovery import RecoveryStore, default_recovery_root
+from .registry import RegistryResult, clear_tree, clear_values
+
+
+class CancelledError(BaseException):
+    """Raised at a checkpoint once the run's CancelToken is cancelled.
+
+    Derives from BaseException so the broad `except Exception` blocks in the
+    clean_* methods do not swallow it.
+    """
+
+
+class CancelToken:
+    """Thread-safe flag the GUI sets to stop a running cleanup."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def check(self):
+        if self._event.is_set():
+            raise CancelledError()
+
+    def wait(self, timeout):
+        """Sleep up to `timeout` seconds; returns True as soon as the run is cancelled."""
+        return self._event.wait(timeout)
+
+
+class ItemEstimate:
+    """What one cleanup item would remove, as measured by a scan-only run."""
+
+    __slots__ = ("items", "bytes", "rows")
+
+    def __init__(self):
+        self.items = 0   # files, shortcuts, registry values, ...
+        self.bytes = 0   # bytes that would be freed on disk
+        self.rows = 0    # SQLite rows that would be deleted
+
+    def add(self, items=0, size=0, rows=0):
+        self.items += items
+        self.bytes += size
+        self.rows += rows
+
+    def __bool__(self):
+        return bool(self.items or self.bytes or self.rows)
+
+    def __repr__(self):
+        return f"ItemEstimate(items={self.items}, bytes={self.bytes}, rows={self.rows})"
+
+
+class BaseCleaner:
+    """Base class for cleaners.
+
+    Subclasses implement _method_map() returning {item_key: clean method}.
+    They reach the machine only through `backend` (backends.WindowsBackend
+    unless another is passed to the constructor): known folders via
+    _env_path(), the registry via _winreg() (keys are cleared with
+    _clear_registry()), shell calls via self.backend.
+    run(items, scan_only=True) calls the same methods, but every destructive
+    primitive (file/dir delete, table clear, registry delete) only measures
+    what it would remove and reports it through _tally().
+
+    run(items, cancel=token) makes the run stoppable: the deletion engine
+    polls the token per file, SQLite statements are interrupted, and
+    clean_* methods call _checkpoint() between tables and registry keys.
+
+    With `progress` set to a ProgressTracker, deleted files are reported as
+    they go (pass _file_progress to the deletion engine) and every item is
+    marked finished through _item_done().
+
+    With `metrics` set to an instrument.RunReport, every item's method is
+    timed and its files, SQLite work and registry calls (made through
+    _winreg()) are recorded.
+
+    With `history_range` set to a history_prune.HistoryRange, cleaners that
+    support it (browser history) remove only the matching entries.
+
+    With `temp_policy` set to a temp_policy.TempPolicy, temp folder cleanup
+    removes only the entries the policy selects (by age and size).
+
+    With `journal` set to a journal.CleanupJournal, directory cleanup skips
+    directories unchanged since the last run (_journal_unchanged) and
+    records the state it leaves them in (_journal_record).
+
+    Items that should stay recoverable call _move_to_recovery(path) instead
+    of deleting: the entry is renamed into `recovery` (a
+    recovery.RecoveryStore, the default store if unset), one snapshot per
+    item and run.
+
+    A real run returns {item_key: instrument.ItemResult}. The primitives
+    fill it as they go: _record_delete() for every DeleteResult,
+    _clear_registry() for registry values, _error() for failures (which
+    it also logs), _result().add() for anything else.
+    """
+
+    # item key -> resources the item touches; read by cleaners.scheduler
+    RESOURCES = {}
+
+    def __init__(self, log_callback=None, backend=None):
+        self.log = log_callback or print
+        self.backend = backend or default_backend()
+        self.scan_only = False
+        self.cancel_token = None
+        self.completed_items = []
+        self.progress = None  # ProgressTracker shared by a whole run
+        self.metrics = None  # instrument.RunReport shared by a whole run
+        self.history_range = None  # history_prune.HistoryRange; None clears everything
+        self.temp_policy = None  # temp_policy.TempPolicy; None clears everything
+        self.journal = None  # journal.CleanupJournal shared by a whole run
+        self.recovery = None  # recovery.RecoveryStore; opened on first use
+        self._snapshots = {}  # item key -> recovery.Snapshot of this run
+        self._current_item = None
+        self._estimate = None
+        self.results = {}  # item key -> instrument.ItemResult of the current (or last) run
+
+    def _method_map(self):
+        raise NotImplementedError
+
+    def _checkpoint(self):
+        """Stop the current run here if it has been cancelled."""
+        if self.cancel_token is not None:
+            self.cancel_token.check()
+
+    @property
+    def cancelled(self):
+        return self.cancel_token is not None and self.cancel_token.cancelled
+
+    def _tally(self, items=0, size=0, rows=0):
+        """Record scan-only measurements against the item being scanned."""
+        if self._estimate is not None:
+            self._estimate.add(items, size, rows)
+
+    def _report_item(self, item, files=0, size=0, rows=0):
+        """Report work done for `item` to the progress tracker and metrics."""
+        if self.scan_only:
+            return
+        if self.progress is not None:
+            self.progress.advance(item, files, size, rows)
+        if self.metrics is not None:
+            self.metrics.add(item, files=files, size=size, sqlite_rows=rows)
+
+    def _report_progress(self, files=0, size=0, rows=0):
+        """Report work done for the running item."""
+        self._report_item(self._current_item, files, size, rows)
+
+    @property
+    def _file_progress(self):
+        """progress callback for delete_dir_contents/delete_path, or None."""
+        if (self.progress is None and self.metrics is None) or self.scan_only:
+            return None
+        return self._report_progress
+
+    def _env_path(self, *env_vars):
+        """First of env_vars the backend sets to an absolute path, or None."""
+        return self.backend.env_path(*env_vars)
+
+    def _winreg(self):
+        """The backend's winreg module, counting calls when metrics are collected.
+
+        Raises ImportError on the Windows backend off Windows, like `import winreg`.
+        """
+        winreg = self.backend.winreg()
+        if self.metrics is None or self.scan_only:
+            return winreg
+        return CountingRegistry(
+            winreg, lambda op: self.metrics.count_registry(self._current_item, op)
+        )
+
+    def _clear_registry(self, hive, key_path, names=None, tree=False):
+        """Delete a key's values (only `names`, if given; with tree=True its subkeys too).
+
+        Goes through the registry engine, so every key is opened once; in
+        scan-only mode the values and keys are tallied instead. Returns a
+        registry.RegistryResult (found=False for a missing key). A key we may
+        not write is logged and skipped; ImportError propagates.
+        """
+        winreg = self._winreg()
+        try:
+            if tree:
+                result = clear_tree(winreg, hive, key_path, self.scan_only, self.cancel_token)
+            else:
+                result = clear_values(winreg, hive, key_path, names, self.scan_only, self.cancel_token)
+        except PermissionError:
+            self.log(f"  [건너뜀] 권한 부족: {key_path}")
+            return RegistryResult()
+        if self.scan_only:
+            self._tally(items=result.values + result.keys)
+        else:
+            self._result().add(registry_values=result.values + result.keys)
+        return result
+
+    def _measure(self, item):
+        if self.metrics is None or self.scan_only:
+            return contextlib.nullcontext()
+        return self.metrics.measure(item)
+
+    @property
+    def current_item(self):
+        """Key of the item being run, or None outside run()."""
+        return self._current_item
+
+    def _item_started(self, item):
+        """Called right before an item's method runs."""
+        self._current_item = item
+        if self.progress is not None and not self.scan_only:
+            self.progress.start(item)
+
+    def _item_done(self, item):
+        """Called once an item's work is finished: marks it completed (and finished for progress).
+
+        run() calls it when the item's method returns; a cleaner that defers
+        part of an item's work overrides it and calls it once that work ran.
+        """
+        self.completed_items.append(item)
+        if self.scan_only:
+            return
+        self._result(item).status = STATUS_COMPLETED
+        if self.progress is not None:
+            self.progress.finish(item)
+
+    def _journal_unchanged(self, dirpath):
+        """True if the journal shows dirpath as the last run left it; the caller skips it."""
+        if self.journal is None or self.scan_only:
+            return False
+        entry = self.journal.unchanged(self._current_item, dirpath)
+        if entry is None:
+            return False
+        left = f" ({entry.entries}개 사용 중 항목 남음)" if entry.entries else ""
+        self.log(f"  [변경 없음] {os.path.basename(dirpath)}: 지난 정리 이후 바뀌지 않음{left}")
+        return True
+
+    def _journal_record(self, dirpath, match=None):
+        """Record dirpath's state after cleaning it (match: the entries the item cleans)."""
+        if self.journal is None or self.scan_only or self.cancelled:
+            return
+        self.journal.record(self._current_item, dirpath, match)
+
+    def _move_to_recovery(self, path):
+        """Move path into the recovery store's snapshot for the running item.
+
+        Returns the stored path; raises OSError like a delete would.
+        """
+        if self.recovery is None:
+            self.recovery = RecoveryStore(default_recovery_root(self.backend.environ))
+        snapshot = self._snapshots.get(self._current_item)
+        if snapshot is None:
+            snapshot = self.recovery.snapshot(self._current_item)
+            self._snapshots[self._current_item] = snapshot
+        return snapshot.put(path)
+
+    def _recovery_snapshot(self, item=None):
+        """This run's recovery.Snapshot for `item` (default: the running one), or None."""
+        return self._snapshots.get(item or self._current_item)
+
+    def _result(self, item=None):
+        """The ItemResult of `item` (default: the running one) in this run."""
+        item = item or self._current_item
+        result = self.results.get(item)
+        if result is None:
+            result = self.results[item] = ItemResult(item)
+        return result
+
+    def _record_delete(self, result):
+        """Add a DeleteResult of a real deletion to the running item; returns it."""
+        if not self.scan_only:
+            self._result().add_delete(result)
+        return result
+
+    def _error(self, message):
+        """Log '  [오류] message' and record it against the running item."""
+        self.log(f"  [오류] {message}")
+        if not self.scan_only:
+            self._result().errors.append(message)
+
+    def _tally_delete(self, result):
+        """Record a DeleteResult from scan_dir_contents/scan_path."""
+        self._tally(items=result.files, size=result.bytes_freed)
+
+    def _mark_unfinished(self, items, status):
+        """Give `status` to each of `items` that has not completed."""
+        done = set(self.completed_items)
+        for item in items:
+            if item not in done:
+                self._result(item).status = status
+
+    def _before_items(self):
+        """Hook called before the selected items run."""
+
+    def _after_items(self):
+        """Hook called after the selected items ran (not called on error)."""
+
+    def run(self, selected_items, scan_only=False, cancel=None):
+        """Run selected cleanup tasks; returns {item_key: ItemResult}.
+
+        With scan_only=True nothing is changed and nothing is logged; the
+        return value is {item_key: ItemEstimate}. When `cancel` fires, the
+        run stops at the next checkpoint; completed_items lists the items
+        that finished before that. The running item, and any whose deferred
+        work (see _item_done) had not run yet, are marked cancelled; an
+        exception marks them failed instead.
+        """
+        method_map = self._method_map()
+        estimates = {}
+        log = self.log
+        self.scan_only = scan_only
+        self.cancel_token = cancel
+        self.completed_items = []
+        self._snapshots = {}
+        self.results = {}
+        begun = []  # items whose method was called
+        if scan_only:
+            self.log = lambda message: None
+        try:
+            self._before_items()
+            for item in selected_items:
+                method = method_map.get(item)
+                if method is None:
+                    continue
+                self._checkpoint()
+                if scan_only:
+                    self._estimate = estimates.setdefault(item, ItemEstimate())
+                begun.append(item)
+                self._item_started(item)
+                started = time.perf_counter()
+                try:
+                    with self._measure(item):
+                        method()
+                finally:
+                    if not scan_only:
+                        self._result(item).seconds += time.perf_counter() - started
+                # A cancel the method saw may have cut its work short; one that
+                # arrives after this check no longer turns a finished item into cancelled
+                if not self.cancelled:
+                    self._item_done(item)
+                self._checkpoint()
+            self._after_items()
+        except CancelledError:
+            if not scan_only:
+                # The running item and any whose deferred work had not run yet
+                self._mark_unfinished(begun, STATUS_CANCELLED)
+            self.log(f"  [중지됨] {len(self.completed_items)}개 항목 완료 후 중지")
+        except Exception as e:
+            if self._current_item is not None and not scan_only:
+                self._result().errors.append(str(e))
+                self._mark_unfinished(begun, STATUS_FAILED)
+            raise
+        finally:
+            self.log = log
+            self.scan_only = False
+            self.cancel_token = None
+            self._current_item = None
+            self._estimate = None
+        return estimates if scan_only else self.results
@@ -1,287 +1,246 @@
-"""Browser history and cache cleaners for Chrome, Edge, Firefox, Brave."""
+"""Browser history and cache cleaners, driven by the rules declared in profiles.BROWSERS."""
 
+import functools
 import os
-import shutil
-import sqlite3
+import time
 
-# Allowlist of safe table names for SQL operations
-ALLOWED_TABLES = frozenset({
-    "urls", "visits", "keyword_search_terms", "downloads",
-    "downloads_url_chains", "segments", "segment_usage",
-    "cookies", "moz_historyvisits", "moz_inputhistory", "moz_cookies",
-    "moz_places",
-})
+from .base import BaseCleaner
+from .deletion import (
+    MAX_DELETE_WORKERS, delete_dir_contents, delete_path, error_logger, format_bytes,
+    format_worker_stats, scan_dir_contents, scan_path,
+)
+from .profiles import BROWSER_RULES, BROWSERS, ProfileIndex
+from .rules import TARGET_DIR, TARGET_FILES, TARGET_REGISTRY, TARGET_SQLITE, compile_rule, rule_resources
+from .sqlite_session import (  # noqa: F401 (ALLOWED_TABLES re-export)
+    ALLOWED_TABLES, COMPACTION_FULL, COMPACTION_STRATEGIES, DEFAULT_BUSY_TIMEOUT, DEFAULT_FREELIST_THRESHOLD,
+    LOCK_RETRY_DELAYS, SqlitePlan, count_rows, db_label,
+)
 
+_REGISTRY_HIVES = {"HKCU": "HKEY_CURRENT_USER", "HKLM": "HKEY_LOCAL_MACHINE"}
 
-def _safe_env_path(*env_vars):
-    """Get an environment variable value, validated as absolute path."""
-    for var in env_vars:
-        val = os.environ.get(var, "")
-        if val and os.path.isabs(val):
-            return val
-    return None
 
-
-class BrowserCleaner:
+class BrowserCleaner(BaseCleaner):
     """Cleans browser data for major browsers on Windows."""
 
-    def __init__(self, log_callback=None):
-        self.log = log_callback or print
-        self.local = _safe_env_path("LOCALAPPDATA") or ""
-        self.appdata = _safe_env_path("APPDATA") or ""
-
-    def _get_chromium_profiles(self, base_path):
-        """Find all Chromium-based browser profile directories."""
-        profiles = []
-        if not os.path.exists(base_path):
-            return profiles
-        profiles.append(base_path)
-        for item in os.listdir(base_path):
-            if item.startswith("Profile "):
-                profiles.append(os.path.join(base_path, item))
-        default = os.path.join(base_path, "Default")
-        if os.path.exists(default) and default not in profiles:
-            profiles.append(default)
-        return profiles
+    RESOURCES = {item: rule_resources(rule, BROWSERS) for item, rule in BROWSER_RULES.items()}
+
+    def __init__(self, log_callback=None, delete_workers=None, compaction=COMPACTION_FULL,
+                 freelist_threshold=DEFAULT_FREELIST_THRESHOLD, busy_timeout=DEFAULT_BUSY_TIMEOUT,
+                 lock_retry_delays=LOCK_RETRY_DELAYS, backend=None):
+        if compaction not in COMPACTION_STRATEGIES:
+            raise ValueError(f"unknown compaction strategy: {compaction}")
+        super().__init__(log_callback, backend)
+        self.delete_workers = delete_workers or MAX_DELETE_WORKERS
+        self.compaction = compaction
+        self.freelist_threshold = freelist_threshold
+        self.busy_timeout = busy_timeout  # seconds to wait for a running browser's lock
+        self.lock_retry_delays = lock_retry_delays
+        self.local = self._env_path("LOCALAPPDATA") or ""
+        self.appdata = self._env_path("APPDATA") or ""
+        self._on_delete_error = error_logger(self.log)
+        self._sqlite_plan = None  # set by run() to merge DB work across items
+        self.profile_index = None  # ProfileIndex shared by a whole run (set by the Scheduler)
+        self._profile_index = None  # set by run(): that index, or one for the selected items
+        self._handled = set()  # Action.key of targets already handled in this run
 
     def _delete_file_safe(self, filepath):
-        """Delete a file, handling permission errors gracefully."""
-        try:
-            if os.path.isfile(filepath):
-                os.remove(filepath)
-                return True
-            elif os.path.isdir(filepath):
-                shutil.rmtree(filepath, onerror=lambda fn, p, ei: self.log(f"  [오류] 삭제 실패: {os.path.basename(p)}"))
-                return True
-        except PermissionError:
-            self.log(f"  [건너뜀] 사용 중: {os.path.basename(filepath)}")
-        except Exception as e:
-            self.log(f"  [오류] {os.path.basename(filepath)}: {e}")
-        return False
+        """Delete a file or directory tree, handling permission errors gracefully."""
+        if self.scan_only:
+            result = scan_path(filepath, cancel=self.cancel_token)
+            self._tally_delete(result)
+            return result.removed > 0
+        result = self._record_delete(delete_path(
+            filepath, on_error=self._on_delete_error, cancel=self.cancel_token,
+            progress=self._file_progress,
+        ))
+        return result.removed > 0
 
     def _delete_dir_contents(self, dirpath):
         """Delete all contents inside a directory without deleting the dir itself."""
-        count = 0
-        if not os.path.exists(dirpath):
-            return count
-        for item in os.listdir(dirpath):
-            full = os.path.join(dirpath, item)
-            if self._delete_file_safe(full):
-                count += 1
-        return count
-
-    def _clean_sqlite_tables(self, db_path, tables):
-        """Clear specified tables in a SQLite database (allowlist-validated)."""
-        if not os.path.exists(db_path):
-            return False
+        if self.scan_only:
+            result = scan_dir_contents(dirpath, cancel=self.cancel_token)
+            self._tally_delete(result)
+        elif self._journal_unchanged(dirpath):
+            result = delete_dir_contents(None)
+        else:
+            result = self._record_delete(delete_dir_contents(
+                dirpath, on_error=self._on_delete_error, workers=self.delete_workers,
+                cancel=self.cancel_token, progress=self._file_progress,
+            ))
+            summary = format_worker_stats(result)
+            if summary:
+                self.log(f"  [병렬] {os.path.basename(dirpath)}: {summary}")
+            self._journal_record(dirpath)
+        self._checkpoint()
+        return result
+
+    def _clean_sqlite_tables(self, db_path, tables, filters=(), then_delete=(), prunes=()):
+        """Clear specified tables in a SQLite database (allowlist-validated).
+
+        filters are (table, where) pairs for partial deletes. With a
+        history_range, prunes (history_prune.PRUNERS names) replace the
+        table clears and filters so only matching rows are deleted. Inside run() the
+        work is queued on the per-run plan and executed once per file at the
+        end; called directly it executes immediately. then_delete files are
+        removed after the database is closed.
+        """
+        self._checkpoint()
+        if self.history_range and prunes:
+            tables, filters = (), ()
+        else:
+            prunes = ()
+        if self.scan_only:
+            self._tally(rows=count_rows(
+                db_path, tables, filters, log=self.log, prunes=prunes, history_range=self.history_range,
+                busy_timeout=self.busy_timeout,
+            ))
+            for path in then_delete:
+                self._delete_file_safe(path)
+            return os.path.exists(db_path)
+        if self._sqlite_plan is not None:
+            self._sqlite_plan.add(db_path, tables, filters, then_delete, tag=self._current_item, prunes=prunes)
+            return os.path.exists(db_path)
+        plan = self._new_sqlite_plan()
+        plan.add(db_path, tables, filters, then_delete, prunes=prunes)
+        return bool(plan.execute(cancel=self.cancel_token).get(db_path))
+
+    def _new_sqlite_plan(self):
+        return SqlitePlan(
+            self.log, self._delete_file_safe,
+            compaction=self.compaction, freelist_threshold=self.freelist_threshold,
+            history_range=self.history_range,
+            busy_timeout=self.busy_timeout, retry_delays=self.lock_retry_delays,
+        )
+
+    def _flush_sqlite_plan(self):
+        """Execute queued DB work: one open and at most one VACUUM per file."""
+        plan = self._sqlite_plan
+        if plan is None or not len(plan):
+            return
+        self.log("[SQLite] 브라우저 DB 정리 중...")
+        pending = plan.pending_tags()
+        clock = [time.perf_counter(), time.thread_time()]
+
+        def job_done(tags, result):
+            # Rows of a file shared by several items are credited to the first one
+            if result and tags:
+                self._report_item(tags[0], rows=result.rows_deleted)
+                # Compaction shrinks the file in place: its bytes count as freed too
+                self._result(tags[0]).add(rows=result.rows_deleted, size=result.bytes_reclaimed)
+                if self.metrics is not None:
+                    self.metrics.add(tags[0], size=result.bytes_reclaimed)
+            elif result is not None and result.locked and tags:
+                self._result(tags[0]).add(in_use=1)
+            if tags:
+                # Time (DB session plus companion files) is split between the items
+                now = [time.perf_counter(), time.thread_time()]
+                share = len(tags)
+                for item in tags:
+                    self._result(item).seconds += (now[0] - clock[0]) / share
+                    if self.metrics is not None:
+                        self.metrics.add(
+                            item, wall=(now[0] - clock[0]) / share, cpu=(now[1] - clock[1]) / share,
+                            sqlite_seconds=(result.seconds if result else 0.0) / share,
+                        )
+                clock[:] = now
+            for item in tags:
+                pending[item] -= 1
+                # Completed once its last DB ran; a cancel leaves it to run() to mark cancelled
+                if not pending[item] and not self.cancelled:
+                    super(BrowserCleaner, self)._item_done(item)
+        def job_start(tags):
+            # Companion files deleted with this DB count towards its item
+            if tags:
+                self._current_item = tags[0]
+        results = plan.execute(cancel=self.cancel_token, on_job_done=job_done, on_job_start=job_start)
+        reclaimed = 0
+        for path, res in results.items():
+            if res:
+                retried = f", {res.attempts}회 시도" if res.attempts > 1 else ""
+                self.log(
+                    f"  {db_label(path)}: {res.rows_deleted}행 삭제, "
+                    f"{format_bytes(res.bytes_reclaimed)} 회수 ({res.compaction}{retried})"
+                )
+                reclaimed += res.bytes_reclaimed
+        done = sum(1 for res in results.values() if res)
+        locked = sum(1 for res in results.values() if res.locked)
+        locked = f", {locked}개 잠김" if locked else ""
+        self.log(f"  완료: {done}/{len(results)}개 DB 정리됨{locked}, {format_bytes(reclaimed)} 회수")
+        self._checkpoint()
+
+    def _delete_registry_values(self, key):
+        """Delete (or, scanning, count) all values under 'HKCU/Software/...'."""
+        hive_name, _, key_path = key.partition("/")
+        key_path = key_path.replace("/", "\\")
         try:
-            conn = sqlite3.connect(db_path)
-            cursor = conn.cursor()
-            for table in tables:
-                if table not in ALLOWED_TABLES:
-                    self.log(f"  [건너뜀] 허용되지 않은 테이블: {table}")
+            winreg = self._winreg()
+            hive = getattr(winreg, _REGISTRY_HIVES[hive_name.upper()])
+            return self._clear_registry(hive, key_path).values
+        except ImportError:
+            self.log("  [건너뜀] winreg 모듈 없음 (Windows 전용)")
+            return 0
+
+    # --- Rules ---
+    def _profiles(self, browser):
+        """Profiles of `browser` from the per-run index (built now if outside run())."""
+        return self._index().profiles(browser)
+
+    def _index(self):
+        if self._profile_index is not None:
+            return self._profile_index
+        return self._build_profile_index()
+
+    def _build_profile_index(self):
+        return ProfileIndex.build({"LOCALAPPDATA": self.local, "APPDATA": self.appdata})
+
+    def clean_rule(self, rule):
+        """Run one Rule: each target not already handled earlier in this run."""
+        self.log(f"[{rule.source}] {rule.name} 삭제 중...")
+        databases = removed = 0
+        for action in compile_rule(rule, self._index(), self.backend.environ):
+            if action.kind != TARGET_SQLITE:
+                # DB work is merged per file by the SqlitePlan; other targets run once
+                if action.key in self._handled:
                     continue
-                try:
-                    cursor.execute(f"DELETE FROM {table}")
-                except sqlite3.OperationalError:
-                    pass
-            conn.commit()
-            cursor.execute("VACUUM")
-            conn.close()
-            return True
-        except (sqlite3.OperationalError, sqlite3.DatabaseError):
-            self.log(f"  [건너뜀] DB 잠김: {os.path.basename(db_path)}")
-            return False
-
-    # --- Chrome ---
-    def _chrome_base(self):
-        return os.path.join(self.local, "Google", "Chrome", "User Data")
-
-    def clean_chrome_history(self):
-        self.log("[Chrome] 방문 기록 삭제 중...")
-        count = 0
-        for profile in self._get_chromium_profiles(self._chrome_base()):
-            history_db = os.path.join(profile, "History")
-            if self._clean_sqlite_tables(history_db, ["urls", "visits", "keyword_search_terms", "downloads", "downloads_url_chains", "segments", "segment_usage"]):
-                count += 1
-            for f in ["History-journal", "Visited Links", "Top Sites", "Top Sites-journal"]:
-                self._delete_file_safe(os.path.join(profile, f))
-        self.log(f"  완료: {count}개 프로필 정리됨")
-
-    def clean_chrome_cache(self):
-        self.log("[Chrome] 캐시 삭제 중...")
-        count = 0
-        for profile in self._get_chromium_profiles(self._chrome_base()):
-            for cache_dir in ["Cache", "Code Cache", "GPUCache", "Service Worker"]:
-                full = os.path.join(profile, cache_dir)
-                count += self._delete_dir_contents(full)
-        cache_root = os.path.join(self._chrome_base(), "Default", "Cache", "Cache_Data")
-        count += self._delete_dir_contents(cache_root)
-        self.log(f"  완료: {count}개 항목 삭제됨")
-
-    def clean_chrome_cookies(self):
-        self.log("[Chrome] 쿠키 삭제 중...")
-        count = 0
-        for profile in self._get_chromium_profiles(self._chrome_base()):
-            cookies_db = os.path.join(profile, "Cookies")
-            if self._clean_sqlite_tables(cookies_db, ["cookies"]):
-                count += 1
-            self._delete_file_safe(os.path.join(profile, "Cookies-journal"))
-        self.log(f"  완료: {count}개 프로필 쿠키 삭제됨")
-
-    def clean_chrome_downloads(self):
-        self.log("[Chrome] 다운로드 기록 삭제 중...")
-        count = 0
-        for profile in self._get_chromium_profiles(self._chrome_base()):
-            history_db = os.path.join(profile, "History")
-            if self._clean_sqlite_tables(history_db, ["downloads", "downloads_url_chains"]):
-                count += 1
-        self.log(f"  완료: {count}개 프로필 다운로드 기록 삭제됨")
-
-    # --- Edge ---
-    def _edge_base(self):
-        return os.path.join(self.local, "Microsoft", "Edge", "User Data")
-
-    def clean_edge_history(self):
-        self.log("[Edge] 방문 기록 삭제 중...")
-        count = 0
-        for profile in self._get_chromium_profiles(self._edge_base()):
-            history_db = os.path.join(profile, "History")
-            if self._clean_sqlite_tables(history_db, ["urls", "visits", "keyword_search_terms", "downloads", "downloads_url_chains", "segments", "segment_usage"]):
-                count += 1
-            for f in ["History-journal", "Visited Links", "Top Sites", "Top Sites-journal"]:
-                self._delete_file_safe(os.path.join(profile, f))
-        self.log(f"  완료: {count}개 프로필 정리됨")
-
-    def clean_edge_cache(self):
-        self.log("[Edge] 캐시 삭제 중...")
-        count = 0
-        for profile in self._get_chromium_profiles(self._edge_base()):
-            for cache_dir in ["Cache", "Code Cache", "GPUCache", "Service Worker"]:
-                full = os.path.join(profile, cache_dir)
-                count += self._delete_dir_contents(full)
-        self.log(f"  완료: {count}개 항목 삭제됨")
-
-    def clean_edge_cookies(self):
-        self.log("[Edge] 쿠키 삭제 중...")
-        count = 0
-        for profile in self._get_chromium_profiles(self._edge_base()):
-            cookies_db = os.path.join(profile, "Cookies")
-            if self._clean_sqlite_tables(cookies_db, ["cookies"]):
-                count += 1
-            self._delete_file_safe(os.path.join(profile, "Cookies-journal"))
-        self.log(f"  완료: {count}개 프로필 쿠키 삭제됨")
-
-    def clean_edge_downloads(self):
-        self.log("[Edge] 다운로드 기록 삭제 중...")
-        count = 0
-        for profile in self._get_chromium_profiles(self._edge_base()):
-            history_db = os.path.join(profile, "History")
-            if self._clean_sqlite_tables(history_db, ["downloads", "downloads_url_chains"]):
-                count += 1
-        self.log(f"  완료: {count}개 프로필 다운로드 기록 삭제됨")
-
-    # --- Firefox ---
-    def _firefox_profiles(self):
-        """Find all Firefox profile directories."""
-        profiles = []
-        profiles_dir = os.path.join(self.appdata, "Mozilla", "Firefox", "Profiles")
-        if not os.path.exists(profiles_dir):
-            return profiles
-        for item in os.listdir(profiles_dir):
-            full = os.path.join(profiles_dir, item)
-            if os.path.isdir(full):
-                profiles.append(full)
-        return profiles
-
-    def clean_firefox_history(self):
-        self.log("[Firefox] 방문 기록 삭제 중...")
-        count = 0
-        for profile in self._firefox_profiles():
-            places_db = os.path.join(profile, "places.sqlite")
-            if self._clean_sqlite_tables(places_db, ["moz_historyvisits", "moz_inputhistory"]):
-                count += 1
-            # Clean non-bookmarked URLs from moz_places
-            if os.path.exists(places_db):
-                try:
-                    conn = sqlite3.connect(places_db)
-                    cursor = conn.cursor()
-                    cursor.execute("DELETE FROM moz_places WHERE foreign_count = 0 AND visit_count = 0")
-                    conn.commit()
-                    conn.close()
-                except (sqlite3.OperationalError, sqlite3.DatabaseError):
-                    pass
-            self._delete_file_safe(os.path.join(profile, "formhistory.sqlite"))
-        self.log(f"  완료: {count}개 프로필 정리됨")
-
-    def clean_firefox_cache(self):
-        self.log("[Firefox] 캐시 삭제 중...")
-        count = 0
-        cache_base = os.path.join(self.local, "Mozilla", "Firefox", "Profiles")
-        if os.path.exists(cache_base):
-            for item in os.listdir(cache_base):
-                cache2 = os.path.join(cache_base, item, "cache2")
-                count += self._delete_dir_contents(cache2)
-        self.log(f"  완료: {count}개 항목 삭제됨")
-
-    def clean_firefox_cookies(self):
-        self.log("[Firefox] 쿠키 삭제 중...")
-        count = 0
-        for profile in self._firefox_profiles():
-            cookies_db = os.path.join(profile, "cookies.sqlite")
-            if self._clean_sqlite_tables(cookies_db, ["moz_cookies"]):
-                count += 1
-        self.log(f"  완료: {count}개 프로필 쿠키 삭제됨")
-
-    # --- Brave ---
-    def _brave_base(self):
-        return os.path.join(self.local, "BraveSoftware", "Brave-Browser", "User Data")
-
-    def clean_brave_history(self):
-        self.log("[Brave] 방문 기록 삭제 중...")
-        count = 0
-        for profile in self._get_chromium_profiles(self._brave_base()):
-            history_db = os.path.join(profile, "History")
-            if self._clean_sqlite_tables(history_db, ["urls", "visits", "keyword_search_terms"]):
-                count += 1
-        self.log(f"  완료: {count}개 프로필 정리됨")
-
-    def clean_brave_cache(self):
-        self.log("[Brave] 캐시 삭제 중...")
-        count = 0
-        for profile in self._get_chromium_profiles(self._brave_base()):
-            for cache_dir in ["Cache", "Code Cache", "GPUCache"]:
-                full = os.path.join(profile, cache_dir)
-                count += self._delete_dir_contents(full)
-        self.log(f"  완료: {count}개 항목 삭제됨")
-
-    def clean_brave_cookies(self):
-        self.log("[Brave] 쿠키 삭제 중...")
-        count = 0
-        for profile in self._get_chromium_profiles(self._brave_base()):
-            cookies_db = os.path.join(profile, "Cookies")
-            if self._clean_sqlite_tables(cookies_db, ["cookies"]):
-                count += 1
-        self.log(f"  완료: {count}개 프로필 쿠키 삭제됨")
+                self._handled.add(action.key)
+            if action.kind == TARGET_SQLITE:
+                if self._clean_sqlite_tables(
+                    action.path, action.tables, action.filters, action.then_delete, action.prunes,
+                ):
+                    databases += 1
+            elif action.kind == TARGET_DIR:
+                removed += self._delete_dir_contents(action.path).removed
+            elif action.kind == TARGET_FILES:
+                removed += self._delete_file_safe(action.path)
+            elif action.kind == TARGET_REGISTRY:
+                removed += self._delete_registry_values(action.path)
+        if rule.has_databases:
+            self.log(f"  완료: {databases}개 프로필 정리됨")
+        else:
+            self.log(f"  완료: {removed}개 항목 삭제됨")
+
+    def _item_done(self, item):
+        # Items with queued DB work finish when the plan has run their files
+        if self._sqlite_plan is not None and item in self._sqlite_plan.pending_tags():
+            return
+        super()._item_done(item)
+
+    def _before_items(self):
+        self._handled = set()
+        if not self.scan_only:
+            self._sqlite_plan = self._new_sqlite_plan()
+
+    def _after_items(self):
+        self._flush_sqlite_plan()
+
+    def run(self, selected_items, scan_only=False, cancel=None):
+        """Run selected cleanup tasks (see BaseCleaner.run)."""
+        self._profile_index = self.profile_index or ProfileIndex.for_items(selected_items, self._env_path)
+        try:
+            return super().run(selected_items, scan_only, cancel)
+        finally:
+            self._sqlite_plan = None
+            self._profile_index = None
 
-    def run(self, selected_items):
-        """Run selected cleanup tasks."""
-        method_map = {
-            "chrome_history": self.clean_chrome_history,
-            "chrome_cache": self.clean_chrome_cache,
-            "chrome_cookies": self.clean_chrome_cookies,
-            "chrome_downloads": self.clean_chrome_downloads,
-            "edge_history": self.clean_edge_history,
-            "edge_cache": self.clean_edge_cache,
-            "edge_cookies": self.clean_edge_cookies,
-            "edge_downloads": self.clean_edge_downloads,
-            "firefox_history": self.clean_firefox_history,
-            "firefox_cache": self.clean_firefox_cache,
-            "firefox_cookies": self.clean_firefox_cookies,
-            "brave_history": self.clean_brave_history,
-            "brave_cache": self.clean_brave_cache,
-            "brave_cookies": self.clean_brave_cookies,
-        }
-        for item in selected_items:
-            if item in method_map:
-                method_map[item]()
+    def _method_map(self):
+        return {item: functools.partial(self.clean_rule, rule) for item, rule in BROWSER_RULES.items()}
@@ -0,0 +1,603 @@
+"""Shared deletion engine used by every cleaner.
+
+Walks directories with os.scandir so the entry type comes from the DirEntry
+cache instead of an extra stat per entry. Where the platform supports it
+(Linux, macOS) the walk is fd-relative: every unlink/rmdir is issued against
+an open directory handle, which avoids re-resolving long paths and cannot be
+redirected by a symlink swapped in mid-walk. Windows uses the path-based walk.
+
+Large directories (browser cache, %TEMP%) can be deleted by a bounded thread
+pool: top-level entries are handed out to workers in small batches, so both
+flat caches and a few huge subtrees keep every worker busy. unlink/rmdir
+release the GIL, which lets the pool fill the SSD's queue depth.
+
+Memory stays flat however big the tree is. Directory listings are consumed
+as streams (entries are deleted while the listing is read, at most
+_BATCH_SIZE per worker in flight), and subtrees are removed iteratively
+with one small frame per level of depth, so deep trees (node_modules in
+%TEMP%) cannot hit the recursion limit.
+"""
+
+import itertools
+import os
+import stat
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# fd-relative walking needs scandir(fd) plus dir_fd support for open/unlink/rmdir.
+_FD_WALK = (
+    os.scandir in os.supports_fd
+    and os.open in os.supports_dir_fd
+    and os.unlink in os.supports_dir_fd
+    and os.rmdir in os.supports_dir_fd
+)
+_DIR_OPEN_FLAGS = (
+    os.O_RDONLY
+    | getattr(os, "O_DIRECTORY", 0)
+    | getattr(os, "O_NOFOLLOW", 0)
+    | getattr(os, "O_CLOEXEC", 0)
+)
+# The caller-supplied root may itself be a symlink (e.g. a redirected %TEMP%).
+_ROOT_OPEN_FLAGS = _DIR_OPEN_FLAGS & ~getattr(os, "O_NOFOLLOW", 0)
+
+
+def _env_workers():
+    try:
+        return max(1, int(os.environ.get("MYPCNOW_DELETE_WORKERS", "")))
+    except ValueError:
+        return 4
+
+
+# Upper bound on deletion threads; override with MYPCNOW_DELETE_WORKERS.
+MAX_DELETE_WORKERS = _env_workers()
+# Below this many top-level entries the pool costs more than it saves.
+PARALLEL_MIN_ENTRIES = 256
+# Top-level entries a worker takes per trip to the shared queue.
+_BATCH_SIZE = 64
+
+
+class DeleteResult:
+    """Structured outcome of a deletion pass."""
+
+    __slots__ = ("removed", "files", "dirs", "bytes_freed", "kept", "errors", "workers")
+
+    def __init__(self):
+        self.removed = 0        # top-level entries removed completely
+        self.files = 0          # files/links unlinked at any depth
+        self.dirs = 0           # directories removed at any depth
+        self.bytes_freed = 0    # sum of st_size of unlinked files
+        self.kept = 0           # entries a policy chose to keep, at any depth
+        self.errors = []        # (path, exception) pairs
+        self.workers = []       # WorkerStats, only filled by parallel runs
+
+    def merge(self, other):
+        """Add another result's counters into this one."""
+        self.removed += other.removed
+        self.files += other.files
+        self.dirs += other.dirs
+        self.bytes_freed += other.bytes_freed
+        self.kept += other.kept
+        self.errors.extend(other.errors)
+        self.workers.extend(other.workers)
+        return self
+
+    def __repr__(self):
+        return (
+            f"DeleteResult(removed={self.removed}, files={self.files}, dirs={self.dirs}, "
+            f"bytes_freed={self.bytes_freed}, kept={self.kept}, errors={len(self.errors)})"
+        )
+
+
+class WorkerStats:
+    """Throughput of one deletion worker."""
+
+    __slots__ = ("worker", "entries", "files", "bytes_freed", "seconds")
+
+    def __init__(self, worker, entries, files, bytes_freed, seconds):
+        self.worker = worker
+        self.entries = entries
+        self.files = files
+        self.bytes_freed = bytes_freed
+        self.seconds = seconds
+
+    @property
+    def files_per_sec(self):
+        return self.files / self.seconds if self.seconds > 0 else 0.0
+
+    @property
+    def mb_per_sec(self):
+        return self.bytes_freed / 1048576 / self.seconds if self.seconds > 0 else 0.0
+
+    def __repr__(self):
+        return (
+            f"WorkerStats(worker={self.worker}, files={self.files}, "
+            f"{self.files_per_sec:.0f} files/s, {self.mb_per_sec:.1f} MB/s)"
+        )
+
+
+def _entry_is_dir(entry):
+    """True for real directories; symlinks and junctions are unlinked, never descended."""
+    try:
+        if not entry.is_dir(follow_symlinks=False):
+            return False
+        if os.name == "nt":
+            # Junctions report is_dir() but must not be recursed into.
+            # DirEntry.stat() is free on Windows (filled in by FindNextFile).
+            attrs = entry.stat(follow_symlinks=False).st_file_attributes
+            return not attrs & stat.FILE_ATTRIBUTE_REPARSE_POINT
+        return True
+    except OSError:
+        return False
+
+
+def _entry_size(entry):
+    try:
+        return entry.stat(follow_symlinks=False).st_size
+    except OSError:
+        return 0
+
+
+class _Walk:
+    """Per-call settings shared by every level of a walk."""
+
+    __slots__ = ("on_error", "cancel", "progress", "policy")
+
+    def __init__(self, on_error=None, cancel=None, progress=None, policy=None):
+        self.on_error = on_error
+        self.cancel = cancel
+        self.progress = progress
+        self.policy = policy
+
+    def stopped(self):
+        return self.cancel is not None and self.cancel.cancelled
+
+    def keeps(self, entry, is_dir, result):
+        """True (and counted) if the policy leaves this entry alone."""
+        if self.policy is None or not self.policy.keeps(entry, is_dir):
+            return False
+        result.kept += 1
+        return True
+
+
+def _fail(result, path, exc, ctx):
+    result.errors.append((path, exc))
+    if ctx.on_error:
+        ctx.on_error(path, exc)
+
+
+class _Frame:
+    """One directory level of a walk.
+
+    The walk's starting directory is a frame with a `root` path (and, for
+    the fd-relative walk, its open fd); every level below only stores its
+    name, so deep trees do not keep a growing path per level.
+    """
+
+    __slots__ = ("name", "parent", "root", "fd", "ok", "skip")
+
+    def __init__(self, name, parent=None, root=None, fd=None):
+        self.name = name      # relative to the parent level
+        self.parent = parent
+        self.root = root      # full path, top frame only
+        self.fd = fd          # open directory handle (fd-relative walk only)
+        self.ok = True        # False once something below could not be removed
+        self.skip = None      # names that failed; not retried when listed again
+
+    @property
+    def path(self):
+        names = []
+        frame = self
+        while frame.parent is not None:
+            names.append(frame.name)
+            frame = frame.parent
+        return os.path.join(frame.root, *reversed(names))
+
+    def left_behind(self, name):
+        self.ok = False
+        if self.skip is None:
+            self.skip = set()
+        self.skip.add(name)
+
+
+def _unlink(frame, entry, result, ctx, base=None):
+    """Unlink one non-directory entry of frame's directory; base is frame.path if known."""
+    size = _entry_size(entry)
+    try:
+        if frame.fd is None:
+            os.unlink(os.path.join(base or frame.path, entry.name))
+        else:
+            os.unlink(entry.name, dir_fd=frame.fd)
+    except OSError as e:
+        _fail(result, os.path.join(base or frame.path, entry.name), e, ctx)
+        return False
+    result.files += 1
+    result.bytes_freed += size
+    if ctx.progress is not None:
+        ctx.progress(1, size)
+    return True
+
+
+def _drain(frame, result, ctx):
+    """Unlink a directory's files as they are listed.
+
+    Returns a frame for the first subdirectory met, or None once the listing
+    is exhausted (or failed, which clears frame.ok).
+    """
+    # The path-based walk needs the full path for every call; fd walks only for errors
+    base = frame.path if frame.fd is None else None
+    try:
+        with os.scandir(base if frame.fd is None else frame.fd) as it:
+            for entry in it:
+                if ctx.stopped():
+                    return None
+                if frame.skip and entry.name in frame.skip:
+                    continue
+                is_dir = _entry_is_dir(entry)
+                if ctx.keeps(entry, is_dir, result):
+                    frame.left_behind(entry.name)
+                    continue
+                if is_dir:
+                    return _Frame(entry.name, frame)
+                if not _unlink(frame, entry, result, ctx, base):
+                    frame.left_behind(entry.name)
+    except OSError as e:
+        _fail(result, base or frame.path, e, ctx)
+        frame.ok = False
+    return None
+
+
+def _remove_tree(top, name, result, ctx):
+    """Remove directory `name` of frame `top` and everything below it, without recursion.
+
+    The stack holds one frame per level of depth and no listings: files are
+    unlinked while a directory is being read, and the first subdirectory met
+    is descended into. Once that subdirectory is gone its parent is listed
+    again; entries already deleted no longer show up and failed ones are in
+    frame.skip. Memory therefore grows with depth and failures, not with
+    the number of entries.
+    Returns True if the directory itself was removed.
+    """
+    fd_walk = top.fd is not None
+    stack = [_Frame(name, top)]
+    try:
+        while stack:
+            if ctx.stopped():
+                return False
+            frame = stack[-1]
+            child = None
+            if fd_walk and frame.fd is None:
+                try:
+                    frame.fd = os.open(frame.name, _DIR_OPEN_FLAGS, dir_fd=frame.parent.fd)
+                except OSError as e:
+                    _fail(result, frame.path, e, ctx)
+                    frame.ok = False
+            if frame.fd is not None or not fd_walk:
+                child = _drain(frame, result, ctx)
+            if child is not None:
+                stack.append(child)
+                continue
+            if ctx.stopped():
+                return False
+            stack.pop()
+            if frame.fd is not None:
+                os.close(frame.fd)
+                frame.fd = None
+            removed = frame.ok
+            if removed:
+                try:
+                    if fd_walk:
+                        os.rmdir(frame.name, dir_fd=frame.parent.fd)
+                    else:
+                        os.rmdir(frame.path)
+                except OSError as e:
+                    _fail(result, frame.path, e, ctx)
+                    removed = False
+            if removed:
+                result.dirs += 1
+            if not stack:
+                return removed
+            if not removed:
+                stack[-1].left_behind(frame.name)
+        return False
+    finally:
+        for frame in stack:
+            if frame.fd is not None:
+                os.close(frame.fd)
+
+
+def _delete_entry(top, entry, result, ctx):
+    """Delete one listed entry of frame `top`'s directory. True on full removal."""
+    if ctx.stopped():
+        return False
+    is_dir = _entry_is_dir(entry)
+    if ctx.keeps(entry, is_dir, result):
+        return False
+    if is_dir:
+        return _remove_tree(top, entry.name, result, ctx)
+    return _unlink(top, entry, result, ctx, top.root)
+
+
+# --- public API ---
+
+def format_bytes(size):
+    """Human-readable byte count (1024-based)."""
+    if abs(size) < 1024:
+        return f"{size} B"
+    for unit in ("KB", "MB"):
+        size /= 1024
+        if abs(size) < 1024:
+            return f"{size:.1f} {unit}"
+    return f"{size / 1024:.1f} GB"
+
+
+def error_logger(log):
+    """Build an on_error callback that reports failures through a cleaner's log."""
+    def _on_error(path, exc):
+        name = os.path.basename(path)
+        if isinstance(exc, PermissionError):
+            log(f"  [건너뜀] 사용 중: {name}")
+        else:
+            log(f"  [오류] {name}: {exc}")
+    return _on_error
+
+
+def _run_parallel(entries, delete_one, workers, result, ctx):
+    """Fan top-level entries out to a bounded pool and merge per-worker results."""
+    it = iter(entries)
+    lock = threading.Lock()
+
+    def take():
+        if ctx.stopped():
+            return []
+        with lock:
+            return list(itertools.islice(it, _BATCH_SIZE))
+
+    def work(index):
+        local = DeleteResult()
+        taken = 0
+        start = time.perf_counter()
+        while True:
+            batch = take()
+            if not batch:
+                break
+            taken += len(batch)
+            for entry in batch:
+                if delete_one(entry, local):
+                    local.removed += 1
+        local.workers.append(WorkerStats(
+            index, taken, local.files, local.bytes_freed, time.perf_counter() - start,
+        ))
+        return local
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mypcnow-delete") as pool:
+        for local in pool.map(work, range(workers)):
+            result.merge(local)
+
+
+def _run(entries, delete_one, workers, result, ctx):
+    """Delete a stream of top-level entries, in parallel if there are enough of them."""
+    entries = iter(entries)
+    if workers > 1:
+        # Only the first PARALLEL_MIN_ENTRIES are buffered to make the call
+        head = list(itertools.islice(entries, PARALLEL_MIN_ENTRIES))
+        parallel = len(head) >= PARALLEL_MIN_ENTRIES
+        entries = itertools.chain(head, entries)
+        if parallel:
+            _run_parallel(entries, delete_one, min(workers, MAX_DELETE_WORKERS), result, ctx)
+            return
+    for entry in entries:
+        if ctx.stopped():
+            break
+        if delete_one(entry, result):
+            result.removed += 1
+
+
+def delete_dir_contents(dirpath, on_error=None, match=None, workers=1, cancel=None,
+                        progress=None, policy=None):
+    """Delete everything inside `dirpath`, keeping the directory itself.
+
+    on_error(path, exc) is called for every entry that could not be removed
+    (from worker threads when running in parallel).
+    match(name), when given, filters the top-level entries to delete.
+    workers > 1 enables the thread pool for large directories; it is capped
+    by MAX_DELETE_WORKERS.
+    cancel (anything with a .cancelled attribute) is polled before every
+    entry; once set the walk stops and the partial result is returned.
+    progress(files, size) is called after every unlinked file (also from
+    worker threads).
+    policy.keeps(entry, is_dir), when given, is asked about every entry at
+    every depth before it is touched (see temp_policy.EntrySelection); kept
+    entries are counted in `kept`, kept directories are not descended into.
+    Returns a DeleteResult; a missing directory yields an empty result.
+    """
+    result = DeleteResult()
+    ctx = _Walk(on_error, cancel, progress, policy)
+    if not dirpath or not os.path.isdir(dirpath):
+        return result
+
+    top = _Frame(None, root=dirpath)
+    if _FD_WALK:
+        try:
+            top.fd = os.open(dirpath, _ROOT_OPEN_FLAGS)
+        except OSError as e:
+            _fail(result, dirpath, e, ctx)
+            return result
+
+    def delete_one(entry, res):
+        return _delete_entry(top, entry, res, ctx)
+    try:
+        # The listing is consumed while entries are deleted, never held whole
+        with os.scandir(dirpath if top.fd is None else top.fd) as it:
+            entries = it if match is None else (e for e in it if match(e.name))
+            _run(entries, delete_one, workers, result, ctx)
+    except OSError as e:
+        _fail(result, dirpath, e, ctx)
+    finally:
+        if top.fd is not None:
+            os.close(top.fd)
+    return result
+
+
+def format_worker_stats(result):
+    """One-line throughput summary of a parallel run, or None for serial runs."""
+    if not result.workers:
+        return None
+    seconds = max(w.seconds for w in result.workers)
+    rate = result.files / seconds if seconds > 0 else 0.0
+    per_worker = ", ".join(f"#{w.worker} {w.files_per_sec:.0f}" for w in result.workers)
+    return f"작업자 {len(result.workers)}개, {rate:.0f} 파일/초 ({per_worker})"
+
+
+def delete_path(path, on_error=None, cancel=None, progress=None):
+    """Delete a single file, link or directory tree. Returns a DeleteResult."""
+    result = DeleteResult()
+    ctx = _Walk(on_error, cancel, progress)
+    try:
+        st = os.lstat(path)
+    except FileNotFoundError:
+        return result
+    except OSError as e:
+        _fail(result, path, e, ctx)
+        return result
+
+    if stat.S_ISDIR(st.st_mode) and not getattr(st, "st_file_attributes", 0) & stat.FILE_ATTRIBUTE_REPARSE_POINT:
+        parent, name = os.path.split(os.path.normpath(path))
+        top = _Frame(None, root=parent)
+        if _FD_WALK:
+            try:
+                top.fd = os.open(parent or ".", _ROOT_OPEN_FLAGS)
+            except OSError as e:
+                _fail(result, path, e, ctx)
+                return result
+        try:
+            done = _remove_tree(top, name, result, ctx)
+        finally:
+            if top.fd is not None:
+                os.close(top.fd)
+    else:
+        try:
+            os.unlink(path)
+        except OSError as e:
+            _fail(result, path, e, ctx)
+            done = False
+        else:
+            result.files += 1
+            result.bytes_freed += st.st_size
+            if progress is not None:
+                progress(1, st.st_size)
+            done = True
+    if done:
+        result.removed += 1
+    return result
+
+
+# --- scan-only (dry run) ---
+
+def _iter_tree(path, ctx, result):
+    """Yield (entry, is_dir) for everything below `path`, depth-first.
+
+    One open listing per level of depth, read as a stream; only names are
+    kept per level. Entries the policy keeps are skipped (and not descended).
+    """
+    path = os.path.normpath(path)
+    stack = []
+    try:
+        stack.append((os.path.basename(path), os.scandir(path)))
+    except OSError as e:
+        result.errors.append((path, e))
+        return
+    base = os.path.dirname(path)
+    try:
+        while stack and not ctx.stopped():
+            it = stack[-1][1]
+            try:
+                child = next(it, None)
+            except OSError as e:
+                result.errors.append((os.path.join(base, *(name for name, _ in stack)), e))
+                child = None
+            if child is None:
+                stack.pop()
+                it.close()
+                continue
+            is_dir = _entry_is_dir(child)
+            if ctx.keeps(child, is_dir, result):
+                continue
+            yield child, is_dir
+            if is_dir:
+                try:
+                    stack.append((child.name, os.scandir(child.path)))
+                except OSError as e:
+                    result.errors.append((child.path, e))
+    finally:
+        for _, it in stack:
+            it.close()
+
+
+def _scan_entry(entry, result, ctx):
+    """Count one entry and everything below it; False if the policy keeps it."""
+    is_dir = _entry_is_dir(entry)
+    if ctx.keeps(entry, is_dir, result):
+        return False
+    if not is_dir:
+        result.files += 1
+        result.bytes_freed += _entry_size(entry)
+        return True
+    result.dirs += 1
+    for child, child_is_dir in _iter_tree(entry.path, ctx, result):
+        if child_is_dir:
+            result.dirs += 1
+        else:
+            result.files += 1
+            result.bytes_freed += _entry_size(child)
+    return True
+
+
+def scan_dir_contents(dirpath, match=None, cancel=None, policy=None):
+    """Measure what delete_dir_contents would remove, without changing anything.
+
+    bytes_freed holds the bytes that would be freed; removed counts the
+    top-level entries that would be deleted.
+    """
+    result = DeleteResult()
+    ctx = _Walk(cancel=cancel, policy=policy)
+    if not dirpath or not os.path.isdir(dirpath):
+        return result
+    try:
+        with os.scandir(dirpath) as it:
+            for entry in it:
+                if ctx.stopped():
+                    break
+                if match is not None and not match(entry.name):
+                    continue
+                if _scan_entry(entry, result, ctx):
+                    result.removed += 1
+    except OSError as e:
+        result.errors.append((dirpath, e))
+    return result
+
+
+def iter_files(dirpath, cancel=None):
+    """Stream the DirEntry of every file below dirpath (any depth), without changing anything."""
+    ctx = _Walk(cancel=cancel)
+    for entry, is_dir in _iter_tree(dirpath, ctx, DeleteResult()):
+        if not is_dir:
+            yield entry
+
+
+def scan_path(path, cancel=None):
+    """Measure what delete_path would remove, without changing anything."""
+    result = DeleteResult()
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return result
+    if stat.S_ISDIR(st.st_mode) and not getattr(st, "st_file_attributes", 0) & stat.FILE_ATTRIBUTE_REPARSE_POINT:
+        result.dirs += 1
+        result.merge(scan_dir_contents(path, cancel=cancel))
+        result.removed = 1
+    else:
+        result.files += 1
+        result.bytes_freed += st.st_size
+        result.removed = 1
+    return result
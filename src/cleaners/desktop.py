@@ -1,9 +1,8 @@
-"""Desktop shortcut cleaner - moves user-created shortcuts to recovery folder."""
+"""Desktop shortcut cleaner - moves user-created shortcuts to the recovery store."""
 
 import os
-import shutil
-import datetime
 
+from .base import BaseCleaner
 
 # System shortcuts that should NEVER be deleted (lowercase)
 SYSTEM_SHORTCUTS = {
@@ -30,19 +29,19 @@ SYSTEM_SHORTCUTS = {
 }
 
 
-def _safe_env_path(*env_vars):
-    for var in env_vars:
-        val = os.environ.get(var, "")
-        if val and os.path.isabs(val):
-            return val
-    return None
+class DesktopCleaner(BaseCleaner):
+    """Cleans user-created desktop shortcuts (moves to the recovery store)."""
 
+    RESOURCES = {
+        "user_shortcuts": (
+            "dir:%USERPROFILE%/Desktop",
+            "dir:%PUBLIC%/Desktop",
+            "dir:%LOCALAPPDATA%/MyPcNow/recovery",
+        ),
+    }
 
-class DesktopCleaner:
-    """Cleans user-created desktop shortcuts (moves to recovery folder)."""
-
-    def __init__(self, log_callback=None):
-        self.log = log_callback or print
+    def __init__(self, log_callback=None, backend=None):
+        super().__init__(log_callback, backend)
 
     def _is_system_shortcut(self, filename):
         """Check if a shortcut is a system shortcut that should not be deleted."""
@@ -53,21 +52,11 @@ class DesktopCleaner:
             return True
         return False
 
-    def _get_recovery_dir(self):
-        """Create and return a timestamped recovery directory."""
-        temp = _safe_env_path("TEMP", "TMP")
-        if not temp:
-            temp = os.path.join(os.path.expanduser("~"), ".MyPcNow_recovery")
-        ts = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
-        recovery = os.path.join(temp, "MyPcNow_deleted_shortcuts", ts)
-        os.makedirs(recovery, exist_ok=True)
-        return recovery
-
     def clean_user_shortcuts(self):
-        """Move user-created shortcuts from desktop to recovery folder."""
+        """Move user-created shortcuts from desktop to the recovery store."""
         self.log("[바탕화면] 사용자 바로가기 정리 중...")
-        userprofile = _safe_env_path("USERPROFILE")
-        public = _safe_env_path("PUBLIC") or r"C:\Users\Public"
+        userprofile = self._env_path("USERPROFILE")
+        public = self._env_path("PUBLIC") or r"C:\Users\Public"
 
         desktop_paths = []
         if userprofile:
@@ -79,39 +68,52 @@ class DesktopCleaner:
             self.log("  [건너뜀] 바탕화면 경로를 찾을 수 없음")
             return
 
-        recovery_dir = self._get_recovery_dir()
-        count = 0
+        candidates = []
         skipped = 0
-
         for desktop in desktop_paths:
             if not os.path.exists(desktop) or not os.path.isabs(desktop):
                 continue
-            for item in os.listdir(desktop):
-                full = os.path.join(desktop, item)
-                if not os.path.isfile(full):
-                    continue
-                if self._is_system_shortcut(item):
-                    skipped += 1
-                    continue
-                if item.lower().endswith(".lnk") or item.lower().endswith(".url"):
-                    try:
-                        shutil.move(full, os.path.join(recovery_dir, item))
-                        count += 1
-                        self.log(f"  이동: {item}")
-                    except PermissionError:
-                        self.log(f"  [건너뜀] 권한 부족: {item}")
-                    except Exception as e:
-                        self.log(f"  [오류] {item}: {e}")
-
-        self.log(f"  완료: {count}개 바로가기 이동됨 (시스템 {skipped}개 보존)")
-        if count > 0:
-            self.log(f"  [복구] 이동된 바로가기 위치: {recovery_dir}")
+            with os.scandir(desktop) as it:
+                for entry in it:
+                    if not entry.is_file():
+                        continue
+                    if self._is_system_shortcut(entry.name):
+                        skipped += 1
+                        continue
+                    candidates.append(entry)
+
+        if self.scan_only:
+            for entry in candidates:
+                try:
+                    self._tally(items=1, size=entry.stat().st_size)
+                except OSError:
+                    pass
+            return
 
-    def run(self, selected_items):
-        """Run selected cleanup tasks."""
-        method_map = {
+        count = 0
+        try:
+            for entry in candidates:
+                self._checkpoint()
+                item = entry.name
+                try:
+                    self._move_to_recovery(entry.path)
+                    count += 1
+                    self._report_progress(files=1)
+                    self._result().add(files=1)
+                    self.log(f"  이동: {item}")
+                except PermissionError:
+                    self.log(f"  [건너뜀] 권한 부족: {item}")
+                except Exception as e:
+                    self._error(f"{item}: {e}")
+        finally:
+            # Always report where moved shortcuts went, even when stopped midway
+            self.log(f"  완료: {count}개 바로가기 이동됨 (시스템 {skipped}개 보존)")
+            snapshot = self._recovery_snapshot()
+            if snapshot is not None:
+                self.log(f"  [복구] 이동된 바로가기 위치: {snapshot.folder}")
+                self.log(f"  [복구] 되돌리기: '되돌리기' 버튼 또는 python -m cleaners --restore {snapshot.id}")
+
+    def _method_map(self):
+        return {
             "user_shortcuts": self.clean_user_shortcuts,
         }
-        for item in selected_items:
-            if item in method_map:
-                method_map[item]()
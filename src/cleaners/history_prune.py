@@ -0,0 +1,396 @@
+"""Row-level pruning of browser history by time range and domain.
+
+Instead of clearing whole tables, a HistoryRange ("the last hour",
+"example.com only") removes just the matching visits and downloads:
+
+    chromium_history    visits (visits_time_index / visits_url_index),
+                        then urls, keyword_search_terms and segments left
+                        without visits; surviving urls get their
+                        visit_count and last_visit_time recomputed
+    chromium_downloads  downloads and their downloads_url_chains
+    firefox_history     moz_historyvisits (dateindex / placedateindex), then
+                        unbookmarked moz_places left without visits and their
+                        moz_inputhistory; surviving places are recomputed
+
+Deletions run in short transactions of PRUNE_BATCH_ROWS rows each, so a
+running browser is never locked out for longer than one batch. Domains
+match the host and its subdomains ("example.com" also matches
+"www.example.com"). SqlitePlan runs these by name (PRUNERS) on the
+connection it already holds.
+"""
+
+import sqlite3
+import time
+from urllib.parse import urlsplit
+
+PRUNE_CHROMIUM_HISTORY = "chromium_history"
+PRUNE_CHROMIUM_DOWNLOADS = "chromium_downloads"
+PRUNE_FIREFOX_HISTORY = "firefox_history"
+
+PRUNE_BATCH_ROWS = 500
+# Seconds between 1601-01-01 (Chromium/WebKit epoch) and 1970-01-01.
+_WEBKIT_EPOCH_OFFSET = 11_644_473_600
+# Firefox visit types that do not count towards moz_places.visit_count
+# (embed, download, framed link, reload).
+_FIREFOX_UNCOUNTED_VISITS = "(0, 4, 7, 8, 9)"
+
+
+def _normalize_domain(domain):
+    domain = domain.strip().lower()
+    if "://" in domain:
+        domain = urlsplit(domain).hostname or ""
+    return domain.strip(".")
+
+
+class HistoryRange:
+    """Which history entries to remove: since a point in time and/or for some domains."""
+
+    __slots__ = ("since", "domains")
+
+    def __init__(self, since=None, domains=()):
+        self.since = since  # Unix time; entries at or after it are removed (None: any time)
+        self.domains = tuple(d for d in (_normalize_domain(d) for d in domains) if d)
+
+    @classmethod
+    def last(cls, seconds=None, domains=()):
+        """Entries from the last `seconds` (all time if None)."""
+        return cls(time.time() - seconds if seconds else None, domains)
+
+    def __bool__(self):
+        return self.since is not None or bool(self.domains)
+
+    def matches_host(self, host):
+        if not self.domains:
+            return True
+        host = (host or "").lower().rstrip(".")
+        return any(host == d or host.endswith("." + d) for d in self.domains)
+
+    def matches_url(self, url):
+        try:
+            return self.matches_host(urlsplit(url or "").hostname)
+        except ValueError:
+            return False
+
+    def __repr__(self):
+        return f"HistoryRange(since={self.since}, domains={list(self.domains)})"
+
+
+def _webkit_time(unix_seconds):
+    return int((unix_seconds + _WEBKIT_EPOCH_OFFSET) * 1_000_000)
+
+
+def _unix_micros(unix_seconds):
+    return int(unix_seconds * 1_000_000)
+
+
+def _chunks(values, size=PRUNE_BATCH_ROWS):
+    values = list(values)
+    for i in range(0, len(values), size):
+        yield values[i:i + size]
+
+
+def _marks(values):
+    return ",".join("?" * len(values))
+
+
+def _stopped(cancel):
+    return cancel is not None and cancel.cancelled
+
+
+def _in_batch(conn, work):
+    """Run work(cursor) in one short write transaction; rolls back on error."""
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        result = work(cursor)
+    except BaseException:
+        if conn.in_transaction:
+            conn.execute("ROLLBACK")
+        raise
+    cursor.execute("COMMIT")
+    return result
+
+
+def _fill_temp_ids(conn, name, ids):
+    """(Re)create TEMP table `name` holding `ids`; returns the count."""
+    conn.execute(f"CREATE TEMP TABLE IF NOT EXISTS {name}(id INTEGER PRIMARY KEY)")
+    conn.execute(f"DELETE FROM temp.{name}")
+    ids = list(ids)
+    conn.executemany(f"INSERT OR IGNORE INTO temp.{name} VALUES (?)", ((i,) for i in ids))
+    return len(ids)
+
+
+# --- Chromium ---
+
+def _chromium_domain_urls(conn, history_range):
+    """ids of urls whose host matches the range's domains (None without domains)."""
+    if not history_range.domains:
+        return None
+    return [
+        url_id for url_id, url in conn.execute("SELECT id, url FROM urls")
+        if history_range.matches_url(url)
+    ]
+
+
+def _chromium_visit_where(history_range, alias="visits"):
+    clauses, params = [], []
+    if history_range.since is not None:
+        clauses.append(f"{alias}.visit_time >= ?")
+        params.append(_webkit_time(history_range.since))
+    if history_range.domains:
+        clauses.append(f"{alias}.url IN (SELECT id FROM temp.prune_urls)")
+    return " AND ".join(clauses) or "1", params
+
+
+def _settle_chromium_urls(conn, url_ids, cancel):
+    """Drop urls left without visits (and rows pointing at them); recompute the rest."""
+    deleted = 0
+    for chunk in _chunks(sorted(url_ids)):
+        if _stopped(cancel):
+            break
+
+        def work(cursor, chunk=chunk):
+            marks = _marks(chunk)
+            orphans = [row[0] for row in cursor.execute(
+                f"SELECT id FROM urls WHERE id IN ({marks}) "
+                "AND NOT EXISTS (SELECT 1 FROM visits WHERE visits.url = urls.id)", chunk,
+            )]
+            rows = 0
+            if orphans:
+                orphan_marks = _marks(orphans)
+                for sql in (
+                    f"DELETE FROM keyword_search_terms WHERE url_id IN ({orphan_marks})",
+                    f"DELETE FROM segment_usage WHERE segment_id IN "
+                    f"(SELECT id FROM segments WHERE url_id IN ({orphan_marks}))",
+                    f"DELETE FROM segments WHERE url_id IN ({orphan_marks})",
+                    f"DELETE FROM urls WHERE id IN ({orphan_marks})",
+                ):
+                    rows += _execute_optional(cursor, sql, orphans)
+            cursor.execute(
+                "UPDATE urls SET "
+                "visit_count = (SELECT count(*) FROM visits WHERE visits.url = urls.id), "
+                "last_visit_time = (SELECT max(visit_time) FROM visits WHERE visits.url = urls.id) "
+                f"WHERE id IN ({marks})", chunk,
+            )
+            return rows
+        deleted += _in_batch(conn, work)
+    return deleted
+
+
+def _execute_optional(cursor, sql, params):
+    """Row count of a DELETE on a table some browser versions do not have."""
+    try:
+        cursor.execute(sql, params)
+    except sqlite3.OperationalError as e:
+        if "no such table" not in str(e):
+            raise
+        return 0
+    return max(cursor.rowcount, 0)
+
+
+def prune_chromium_history(conn, history_range, cancel=None):
+    """Delete matching visits in batches, then settle their urls. Returns rows deleted."""
+    domain_urls = _chromium_domain_urls(conn, history_range)
+    if domain_urls is not None:
+        _fill_temp_ids(conn, "prune_urls", domain_urls)
+    where, params = _chromium_visit_where(history_range)
+    deleted = 0
+    touched = set(domain_urls or ())
+    while not _stopped(cancel):
+        def work(cursor):
+            rows = cursor.execute(
+                f"SELECT id, url FROM visits WHERE {where} LIMIT ?", (*params, PRUNE_BATCH_ROWS),
+            ).fetchall()
+            if rows:
+                cursor.execute(
+                    f"DELETE FROM visits WHERE id IN ({_marks(rows)})", [row[0] for row in rows],
+                )
+            return rows
+        rows = _in_batch(conn, work)
+        if not rows:
+            break
+        deleted += len(rows)
+        touched.update(row[1] for row in rows)
+    return deleted + _settle_chromium_urls(conn, touched, cancel)
+
+
+def _chromium_download_ids(conn, history_range):
+    if history_range.since is not None:
+        rows = conn.execute(
+            "SELECT id FROM downloads WHERE start_time >= ?", (_webkit_time(history_range.since),),
+        )
+    else:
+        rows = conn.execute("SELECT id FROM downloads")
+    ids = [row[0] for row in rows]
+    if not history_range.domains or not ids:
+        return ids
+    matched = set()
+    for chunk in _chunks(ids):
+        for download_id, url in conn.execute(
+            f"SELECT id, url FROM downloads_url_chains WHERE id IN ({_marks(chunk)})", chunk,
+        ):
+            if history_range.matches_url(url):
+                matched.add(download_id)
+    return [i for i in ids if i in matched]
+
+
+def prune_chromium_downloads(conn, history_range, cancel=None):
+    """Delete matching downloads with their URL chains. Returns rows deleted."""
+    deleted = 0
+    for chunk in _chunks(_chromium_download_ids(conn, history_range)):
+        if _stopped(cancel):
+            break
+
+        def work(cursor, chunk=chunk):
+            marks = _marks(chunk)
+            rows = _execute_optional(cursor, f"DELETE FROM downloads_url_chains WHERE id IN ({marks})", chunk)
+            cursor.execute(f"DELETE FROM downloads WHERE id IN ({marks})", chunk)
+            return rows + max(cursor.rowcount, 0)
+        deleted += _in_batch(conn, work)
+    return deleted
+
+
+# --- Firefox ---
+
+def _reversed_host(domain):
+    """moz_places.rev_host form of a domain: 'example.com' -> 'moc.elpmaxe.'."""
+    return domain[::-1] + "."
+
+
+def _firefox_domain_places(conn, history_range):
+    """ids of moz_places under the range's domains, via the rev_host index."""
+    if not history_range.domains:
+        return None
+    ids = []
+    for domain in history_range.domains:
+        low = _reversed_host(domain)
+        # 'moc.elpmaxe.' .. 'moc.elpmaxe/' covers the host and all its subdomains
+        high = low[:-1] + "/"
+        ids.extend(row[0] for row in conn.execute(
+            "SELECT id FROM moz_places WHERE rev_host >= ? AND rev_host < ?", (low, high),
+        ))
+    return ids
+
+
+def _firefox_visit_where(history_range, alias="moz_historyvisits"):
+    clauses, params = [], []
+    if history_range.since is not None:
+        clauses.append(f"{alias}.visit_date >= ?")
+        params.append(_unix_micros(history_range.since))
+    if history_range.domains:
+        clauses.append(f"{alias}.place_id IN (SELECT id FROM temp.prune_places)")
+    return " AND ".join(clauses) or "1", params
+
+
+def _settle_firefox_places(conn, place_ids, cancel):
+    deleted = 0
+    for chunk in _chunks(sorted(place_ids)):
+        if _stopped(cancel):
+            break
+
+        def work(cursor, chunk=chunk):
+            marks = _marks(chunk)
+            # Bookmarked places (foreign_count > 0) stay even without visits
+            orphans = [row[0] for row in cursor.execute(
+                f"SELECT id FROM moz_places WHERE id IN ({marks}) AND foreign_count = 0 "
+                "AND NOT EXISTS (SELECT 1 FROM moz_historyvisits v WHERE v.place_id = moz_places.id)",
+                chunk,
+            )]
+            rows = 0
+            if orphans:
+                orphan_marks = _marks(orphans)
+                rows += _execute_optional(
+                    cursor, f"DELETE FROM moz_inputhistory WHERE place_id IN ({orphan_marks})", orphans,
+                )
+                cursor.execute(f"DELETE FROM moz_places WHERE id IN ({orphan_marks})", orphans)
+                rows += max(cursor.rowcount, 0)
+            cursor.execute(
+                "UPDATE moz_places SET "
+                "visit_count = (SELECT count(*) FROM moz_historyvisits v WHERE v.place_id = moz_places.id "
+                f"AND v.visit_type NOT IN {_FIREFOX_UNCOUNTED_VISITS}), "
+                "last_visit_date = (SELECT max(visit_date) FROM moz_historyvisits v "
+                "WHERE v.place_id = moz_places.id) "
+                f"WHERE id IN ({marks})", chunk,
+            )
+            return rows
+        deleted += _in_batch(conn, work)
+    return deleted
+
+
+def prune_firefox_history(conn, history_range, cancel=None):
+    """Delete matching moz_historyvisits in batches, then settle their places."""
+    domain_places = _firefox_domain_places(conn, history_range)
+    if domain_places is not None:
+        _fill_temp_ids(conn, "prune_places", domain_places)
+    where, params = _firefox_visit_where(history_range)
+    deleted = 0
+    touched = set(domain_places or ())
+    while not _stopped(cancel):
+        def work(cursor):
+            rows = cursor.execute(
+                f"SELECT id, place_id FROM moz_historyvisits WHERE {where} LIMIT ?",
+                (*params, PRUNE_BATCH_ROWS),
+            ).fetchall()
+            if rows:
+                cursor.execute(
+                    f"DELETE FROM moz_historyvisits WHERE id IN ({_marks(rows)})", [row[0] for row in rows],
+                )
+            return rows
+        rows = _in_batch(conn, work)
+        if not rows:
+            break
+        deleted += len(rows)
+        touched.update(row[1] for row in rows)
+    return deleted + _settle_firefox_places(conn, touched, cancel)
+
+
+# --- Scan-only counts ---
+
+def count_chromium_history(conn, history_range):
+    """Visits plus urls a prune would delete (read-only)."""
+    domain_urls = _chromium_domain_urls(conn, history_range)
+    if domain_urls is not None:
+        _fill_temp_ids(conn, "prune_urls", domain_urls)
+    where, params = _chromium_visit_where(history_range, "v")
+    outer, outer_params = _chromium_visit_where(history_range, "o")
+    visits = conn.execute(f"SELECT count(*) FROM visits v WHERE {where}", params).fetchone()[0]
+    urls = conn.execute(
+        f"SELECT count(*) FROM urls WHERE id IN (SELECT v.url FROM visits v WHERE {where}) "
+        f"AND NOT EXISTS (SELECT 1 FROM visits o WHERE o.url = urls.id AND NOT ({outer}))",
+        (*params, *outer_params),
+    ).fetchone()[0]
+    return visits + urls
+
+
+def count_chromium_downloads(conn, history_range):
+    ids = _chromium_download_ids(conn, history_range)
+    chains = 0
+    for chunk in _chunks(ids):
+        chains += conn.execute(
+            f"SELECT count(*) FROM downloads_url_chains WHERE id IN ({_marks(chunk)})", chunk,
+        ).fetchone()[0]
+    return len(ids) + chains
+
+
+def count_firefox_history(conn, history_range):
+    domain_places = _firefox_domain_places(conn, history_range)
+    if domain_places is not None:
+        _fill_temp_ids(conn, "prune_places", domain_places)
+    where, params = _firefox_visit_where(history_range, "v")
+    outer, outer_params = _firefox_visit_where(history_range, "o")
+    visits = conn.execute(f"SELECT count(*) FROM moz_historyvisits v WHERE {where}", params).fetchone()[0]
+    places = conn.execute(
+        "SELECT count(*) FROM moz_places WHERE foreign_count = 0 "
+        f"AND id IN (SELECT v.place_id FROM moz_historyvisits v WHERE {where}) "
+        f"AND NOT EXISTS (SELECT 1 FROM moz_historyvisits o WHERE o.place_id = moz_places.id AND NOT ({outer}))",
+        (*params, *outer_params),
+    ).fetchone()[0]
+    return visits + places
+
+
+# name -> (prune(conn, history_range, cancel), count(conn, history_range))
+PRUNERS = {
+    PRUNE_CHROMIUM_HISTORY: (prune_chromium_history, count_chromium_history),
+    PRUNE_CHROMIUM_DOWNLOADS: (prune_chromium_downloads, count_chromium_downloads),
+    PRUNE_FIREFOX_HISTORY: (prune_firefox_history, count_firefox_history),
+}
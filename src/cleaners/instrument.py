@@ -0,0 +1,257 @@
+"""Per-item instrumentation of a cleanup run.
+
+BaseCleaner.run() wraps every method-map entry in RunReport.measure(), which
+records wall time and the calling thread's CPU time. The cleaners add the
+files and bytes they removed, the SQLite time and rows of their database
+work (deferred browser DB work is credited back to the items that queued it)
+and every registry API call made through CountingRegistry.
+
+What each item did is kept separately as an ItemResult (files, directories,
+bytes, SQLite rows, registry values, entries skipped because they were in
+use, errors, duration and status). The cleaners fill it from the results of
+the shared deletion, SQLite and registry engines, not from log lines, and
+the Scheduler adds every cleaner's results to the report.
+
+    report = RunReport()
+    Scheduler(CLEANER_CATEGORIES, log, metrics=report).run(items)
+    report.slowest(5); report.totals(); report.save("metrics.json")
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+
+REPORT_VERSION = 2
+
+STATUS_NOT_RUN = "not_run"
+STATUS_COMPLETED = "completed"
+STATUS_CANCELLED = "cancelled"
+STATUS_FAILED = "failed"
+
+
+class ItemResult:
+    """What one cleanup item did in a real run (ItemEstimate is the scan-only counterpart)."""
+
+    __slots__ = (
+        "item", "status", "files", "dirs", "bytes", "rows", "registry_values", "in_use", "errors", "seconds",
+    )
+
+    def __init__(self, item):
+        self.item = item
+        self.status = STATUS_NOT_RUN
+        self.files = 0            # files and shortcuts removed, at any depth
+        self.dirs = 0             # directories removed, at any depth
+        self.bytes = 0            # bytes freed on disk (deleted files, SQLite compaction)
+        self.rows = 0             # SQLite rows deleted
+        self.registry_values = 0  # registry values (and subkeys) removed
+        self.in_use = 0           # files and databases skipped because another process held them
+        self.errors = []          # one message per failure
+        self.seconds = 0.0        # wall time of the item's method
+
+    def add(self, files=0, dirs=0, size=0, rows=0, registry_values=0, in_use=0):
+        self.files += files
+        self.dirs += dirs
+        self.bytes += size
+        self.rows += rows
+        self.registry_values += registry_values
+        self.in_use += in_use
+
+    def add_delete(self, result):
+        """Add a deletion.DeleteResult; PermissionError counts as in use, other failures as errors."""
+        self.add(files=result.files, dirs=result.dirs, size=result.bytes_freed)
+        for path, exc in result.errors:
+            if isinstance(exc, PermissionError):
+                self.in_use += 1
+            else:
+                self.errors.append(f"{os.path.basename(path)}: {exc}")
+
+    def merge(self, other):
+        """Add another result's counters into this one."""
+        self.add(other.files, other.dirs, other.bytes, other.rows, other.registry_values, other.in_use)
+        self.errors.extend(other.errors)
+        self.seconds += other.seconds
+        return self
+
+    def to_dict(self):
+        return {
+            "status": self.status,
+            "files": self.files,
+            "dirs": self.dirs,
+            "bytes": self.bytes,
+            "rows": self.rows,
+            "registry_values": self.registry_values,
+            "in_use": self.in_use,
+            "errors": list(self.errors),
+            "seconds": round(self.seconds, 6),
+        }
+
+    def __repr__(self):
+        return (
+            f"ItemResult({self.item}, {self.status}, files={self.files}, dirs={self.dirs}, "
+            f"bytes={self.bytes}, rows={self.rows}, registry={self.registry_values}, "
+            f"in_use={self.in_use}, errors={len(self.errors)}, {self.seconds:.3f}s)"
+        )
+
+
+class ItemMetrics:
+    """Measurements for one cleanup item."""
+
+    __slots__ = (
+        "item", "wall", "cpu", "files", "bytes", "sqlite_seconds", "sqlite_rows", "registry_ops",
+    )
+
+    def __init__(self, item):
+        self.item = item
+        self.wall = 0.0            # seconds, including its share of deferred DB work
+        self.cpu = 0.0             # thread CPU seconds
+        self.files = 0             # files/shortcuts removed
+        self.bytes = 0             # bytes freed (deleted files, SQLite compaction)
+        self.sqlite_seconds = 0.0  # time inside SQLite sessions
+        self.sqlite_rows = 0
+        self.registry_ops = {}     # winreg function name -> calls
+
+    @property
+    def registry_calls(self):
+        return sum(self.registry_ops.values())
+
+    def to_dict(self):
+        return {
+            "wall": round(self.wall, 6),
+            "cpu": round(self.cpu, 6),
+            "files": self.files,
+            "bytes": self.bytes,
+            "sqlite_seconds": round(self.sqlite_seconds, 6),
+            "sqlite_rows": self.sqlite_rows,
+            "registry_calls": self.registry_calls,
+            "registry_ops": dict(self.registry_ops),
+        }
+
+    def __repr__(self):
+        return (
+            f"ItemMetrics({self.item}, wall={self.wall:.3f}s, cpu={self.cpu:.3f}s, "
+            f"files={self.files}, sqlite={self.sqlite_seconds:.3f}s, registry={self.registry_calls})"
+        )
+
+
+class RunReport:
+    """Thread-safe collection of ItemMetrics for one run."""
+
+    def __init__(self):
+        self.items = {}  # item key -> ItemMetrics, in first-measured order
+        self.results = {}  # item key -> ItemResult, as the items finish
+        self.started = time.time()
+        self.finished = None
+        self._lock = threading.Lock()
+
+    def _get(self, item):
+        metrics = self.items.get(item)
+        if metrics is None:
+            metrics = self.items[item] = ItemMetrics(item)
+        return metrics
+
+    def add(self, item, wall=0.0, cpu=0.0, files=0, size=0, sqlite_seconds=0.0, sqlite_rows=0):
+        """Add counters to `item`."""
+        if item is None:
+            return
+        with self._lock:
+            metrics = self._get(item)
+            metrics.wall += wall
+            metrics.cpu += cpu
+            metrics.files += files
+            metrics.bytes += size
+            metrics.sqlite_seconds += sqlite_seconds
+            metrics.sqlite_rows += sqlite_rows
+
+    def add_result(self, result):
+        """Record an item's ItemResult (merged if the item ran before)."""
+        with self._lock:
+            known = self.results.get(result.item)
+            if known is None:
+                self.results[result.item] = result
+            else:
+                known.merge(result)
+                known.status = result.status
+
+    def totals(self):
+        """One ItemResult ("total") summing every item's result, with the worst status."""
+        total = ItemResult("total")
+        with self._lock:
+            statuses = set()
+            for result in self.results.values():
+                total.merge(result)
+                statuses.add(result.status)
+        # The worst status of any item: failed, then cancelled, then not run
+        total.status = next(
+            (status for status in (STATUS_FAILED, STATUS_CANCELLED, STATUS_NOT_RUN) if status in statuses),
+            STATUS_COMPLETED,
+        )
+        return total
+
+    def count_registry(self, item, op):
+        if item is None:
+            return
+        with self._lock:
+            ops = self._get(item).registry_ops
+            ops[op] = ops.get(op, 0) + 1
+
+    @contextlib.contextmanager
+    def measure(self, item):
+        """Time the enclosed block (wall and thread CPU) against `item`."""
+        with self._lock:
+            self._get(item)
+        wall = time.perf_counter()
+        cpu = time.thread_time()
+        try:
+            yield
+        finally:
+            self.add(item, wall=time.perf_counter() - wall, cpu=time.thread_time() - cpu)
+
+    def finish(self):
+        self.finished = time.time()
+
+    def slowest(self, limit=None):
+        """ItemMetrics sorted by wall time, slowest first."""
+        with self._lock:
+            ranked = sorted(self.items.values(), key=lambda m: m.wall, reverse=True)
+        return ranked[:limit] if limit else ranked
+
+    def to_dict(self):
+        with self._lock:
+            items = {key: metrics.to_dict() for key, metrics in self.items.items()}
+            results = {key: result.to_dict() for key, result in self.results.items()}
+        return {
+            "version": REPORT_VERSION,
+            "started": self.started,
+            "seconds": round(self.finished - self.started, 6) if self.finished else None,
+            "items": items,
+            "results": results,
+            "totals": self.totals().to_dict(),
+        }
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write("\n")
+
+
+class CountingRegistry:
+    """winreg stand-in that reports every function call to on_call(name).
+
+    Constants (HKEY_CURRENT_USER, KEY_ALL_ACCESS, ...) pass straight through.
+    """
+
+    def __init__(self, module, on_call):
+        self._module = module
+        self._on_call = on_call
+
+    def __getattr__(self, name):
+        attr = getattr(self._module, name)
+        if not callable(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            self._on_call(name)
+            return attr(*args, **kwargs)
+        return call
@@ -0,0 +1,178 @@
+"""Incremental cleanup journal: skip directories untouched since the last run.
+
+After a directory has been cleaned, the journal records its modification
+time and how many entries were left in it (files in use that could not be
+removed). On the next run a directory whose mtime is unchanged still holds
+exactly those leftovers, so listing it and retrying them is skipped:
+frequent scheduled runs then cost one stat per directory.
+
+A directory's mtime only changes when entries are added, removed or
+renamed directly inside it, so:
+
+- a directory is only recorded when no subdirectory the item cleans is
+  left in it (changes further down would not show);
+- mtimes with whole-second resolution (FAT, some network shares) are not
+  trusted, as a change within the same second would go unnoticed;
+- the mtime is read before and after listing, and a directory that changed
+  in between is not recorded;
+- entries expire after JOURNAL_MAX_AGE, so files that were in use are
+  retried once their program has let go of them.
+
+The journal lives in %LOCALAPPDATA%\\MyPcNow\\journal.sqlite, one row per
+(item, directory). It is read once per run and written back at the end.
+"""
+
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+JOURNAL_FILE = os.path.join("MyPcNow", "journal.sqlite")
+JOURNAL_MAX_AGE = 24 * 3600  # seconds before a directory is listed again anyway
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS dirs (
+    item TEXT NOT NULL,
+    path TEXT NOT NULL,
+    mtime_ns INTEGER NOT NULL,
+    entries INTEGER NOT NULL,
+    recorded REAL NOT NULL,
+    PRIMARY KEY (item, path)
+)
+"""
+
+
+def default_journal_path(environ=None):
+    """%LOCALAPPDATA%\\MyPcNow\\journal.sqlite, or under the temp directory if it is unset."""
+    base = (os.environ if environ is None else environ).get("LOCALAPPDATA") or tempfile.gettempdir()
+    return os.path.join(base, JOURNAL_FILE)
+
+
+class JournalEntry:
+    """What one directory looked like right after it was cleaned."""
+
+    __slots__ = ("mtime_ns", "entries", "recorded")
+
+    def __init__(self, mtime_ns, entries, recorded):
+        self.mtime_ns = mtime_ns
+        self.entries = entries    # entries left behind (the item's match only)
+        self.recorded = recorded  # Unix time of the cleanup
+
+    def __repr__(self):
+        return f"JournalEntry(mtime_ns={self.mtime_ns}, entries={self.entries})"
+
+
+def _snapshot(dirpath, match, now):
+    """JournalEntry for a just-cleaned directory, or None if it cannot be trusted."""
+    try:
+        # stat on both sides of the listing: if anything was added or removed
+        # meanwhile, the count may not match the mtime, so nothing is recorded
+        mtime_ns = os.stat(dirpath).st_mtime_ns
+        entries = 0
+        with os.scandir(dirpath) as it:
+            for entry in it:
+                if match is not None and not match(entry.name):
+                    continue
+                if entry.is_dir(follow_symlinks=False):
+                    return None
+                entries += 1
+        if os.stat(dirpath).st_mtime_ns != mtime_ns:
+            return None
+    except OSError:
+        return None
+    if mtime_ns % 1_000_000_000 == 0:
+        return None
+    return JournalEntry(mtime_ns, entries, now)
+
+
+class CleanupJournal:
+    """Directory states of the last run; shared by every cleaner of a run (thread-safe)."""
+
+    def __init__(self, path=None, max_age=JOURNAL_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self.skipped = 0     # directories skipped this run
+        self._entries = {}   # (item, normcased path) -> JournalEntry
+        self._changed = {}   # same keys -> JournalEntry, or None to delete the row
+        self._lock = threading.Lock()
+
+    @classmethod
+    def load(cls, path=None, max_age=JOURNAL_MAX_AGE, environ=None):
+        """Read the journal at `path` (default_journal_path(environ)); a missing or unreadable one starts empty."""
+        journal = cls(path or default_journal_path(environ), max_age)
+        if not os.path.exists(journal.path):
+            return journal
+        try:
+            conn = sqlite3.connect(journal.path)
+            try:
+                rows = conn.execute("SELECT item, path, mtime_ns, entries, recorded FROM dirs").fetchall()
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return journal
+        for item, path, mtime_ns, entries, recorded in rows:
+            journal._entries[(item, path)] = JournalEntry(mtime_ns, entries, recorded)
+        return journal
+
+    @staticmethod
+    def _key(item, dirpath):
+        return item or "", os.path.normcase(os.path.abspath(dirpath))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def unchanged(self, item, dirpath, now=None):
+        """The JournalEntry if dirpath is exactly as `item` left it last time, else None."""
+        now = time.time() if now is None else now
+        with self._lock:
+            entry = self._entries.get(self._key(item, dirpath))
+        if entry is None or now - entry.recorded > self.max_age:
+            return None
+        try:
+            if os.stat(dirpath).st_mtime_ns != entry.mtime_ns:
+                return None
+        except OSError:
+            return None
+        with self._lock:
+            self.skipped += 1
+        return entry
+
+    def record(self, item, dirpath, match=None, now=None):
+        """Remember dirpath as `item` just left it (match: the entries the item cleans)."""
+        now = time.time() if now is None else now
+        entry = _snapshot(dirpath, match, now)
+        key = self._key(item, dirpath)
+        with self._lock:
+            if entry is not None:
+                self._entries[key] = entry
+            elif self._entries.pop(key, None) is None:
+                return
+            self._changed[key] = entry
+
+    def save(self):
+        """Write this run's changes back (one transaction). Returns False if that failed."""
+        with self._lock:
+            changed = list(self._changed.items())
+            self._changed.clear()
+        if not changed or not self.path:
+            return True
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            conn = sqlite3.connect(self.path)
+            try:
+                with conn:
+                    conn.execute(_SCHEMA)
+                    for (item, path), entry in changed:
+                        if entry is None:
+                            conn.execute("DELETE FROM dirs WHERE item = ? AND path = ?", (item, path))
+                        else:
+                            conn.execute(
+                                "INSERT OR REPLACE INTO dirs VALUES (?, ?, ?, ?, ?)",
+                                (item, path, entry.mtime_ns, entry.entries, entry.recorded),
+                            )
+            finally:
+                conn.close()
+        except (OSError, sqlite3.Error):
+            return False
+        return True
@@ -0,0 +1,229 @@
+"""Browser definitions and profile discovery, done once per run.
+
+BROWSERS declares every supported browser as data: where its profiles live
+(layout, root, cache root) and which cleanup rules apply (see rules.py).
+Adding a Chromium fork is one more BrowserSpec entry; its items, labels,
+scheduler resources and cleaning all follow from it.
+
+ProfileIndex.build() lists each browser root once and each profile
+directory once (os.scandir), recording which files and cache directories
+are actually present, so rules resolve against the index instead of
+probing the filesystem per item. The `User Data` root itself is not a
+profile. ProfileIndex.for_items() indexes only the browsers a selection
+needs; the Scheduler builds it once and hands it to every BrowserCleaner
+of the run.
+"""
+
+import os
+
+from .history_prune import PRUNE_CHROMIUM_DOWNLOADS, PRUNE_CHROMIUM_HISTORY, PRUNE_FIREFOX_HISTORY
+from .rules import RuleTemplate, browser_rules, dir_contents, files, matches, sqlite
+
+LAYOUT_CHROMIUM = "chromium"  # 'Default' and 'Profile N' folders under root
+LAYOUT_FIREFOX = "firefox"    # every folder under root (or under cache_root)
+
+CHROMIUM_HISTORY_TABLES = [
+    "urls", "visits", "keyword_search_terms", "downloads",
+    "downloads_url_chains", "segments", "segment_usage",
+]
+CHROMIUM_HISTORY_FILES = ["History-journal", "Visited Links", "Top Sites", "Top Sites-journal"]
+CHROMIUM_CACHE_DIRS = ["Cache", "Code Cache", "GPUCache", "Service Worker"]
+
+CHROMIUM_RULES = (
+    RuleTemplate("history", "방문 기록", [
+        sqlite("History", CHROMIUM_HISTORY_TABLES, then_delete=CHROMIUM_HISTORY_FILES,
+               prune=[PRUNE_CHROMIUM_HISTORY, PRUNE_CHROMIUM_DOWNLOADS]),
+    ]),
+    RuleTemplate("cache", "캐시", [dir_contents(d) for d in CHROMIUM_CACHE_DIRS]),
+    RuleTemplate("cookies", "쿠키", [sqlite("Cookies", ["cookies"], then_delete=["Cookies-journal"])]),
+    RuleTemplate("downloads", "다운로드 기록", [
+        sqlite("History", ["downloads", "downloads_url_chains"], prune=[PRUNE_CHROMIUM_DOWNLOADS]),
+    ]),
+)
+
+BRAVE_RULES = (
+    RuleTemplate("history", "방문 기록", [
+        sqlite("History", ["urls", "visits", "keyword_search_terms"], prune=[PRUNE_CHROMIUM_HISTORY]),
+    ]),
+    RuleTemplate("cache", "캐시", [dir_contents(d) for d in ("Cache", "Code Cache", "GPUCache")]),
+    RuleTemplate("cookies", "쿠키", [sqlite("Cookies", ["cookies"])]),
+)
+
+FIREFOX_RULES = (
+    RuleTemplate("history", "방문 기록", [
+        # Also drop non-bookmarked URLs from moz_places in the same session
+        sqlite("places.sqlite", ["moz_historyvisits", "moz_inputhistory"],
+               where=[("moz_places", "foreign_count = 0 AND visit_count = 0")],
+               prune=[PRUNE_FIREFOX_HISTORY]),
+        files("formhistory.sqlite"),
+    ]),
+    RuleTemplate("cache", "캐시", [dir_contents("cache2")]),
+    RuleTemplate("cookies", "쿠키", [sqlite("cookies.sqlite", ["moz_cookies"])]),
+)
+
+
+class BrowserSpec:
+    """Where one browser keeps its profiles and which rules clean them.
+
+    root and cache_root are (environment variable, '/'-separated relative
+    path). Chromium keeps caches inside the profile; Firefox keeps them in a
+    same-named folder under LOCALAPPDATA (cache_root).
+    """
+
+    __slots__ = ("key", "name", "layout", "root", "cache_root", "rules")
+
+    def __init__(self, key, name, layout, root, rules, cache_root=None):
+        self.key = key
+        self.name = name
+        self.layout = layout
+        self.root = root
+        self.cache_root = cache_root
+        self.rules = rules
+
+    def resolve(self, location, bases):
+        """Absolute path of root/cache_root given {env var: validated base path}, or None."""
+        if location is None:
+            return None
+        var, relative = location
+        base = bases.get(var)
+        if not base:
+            return None
+        return os.path.join(base, *relative.split("/"))
+
+    def profile_pattern(self, cache=False):
+        """'%VAR%/path/*' matching every profile (or its cache folder), for scheduler resources."""
+        var, relative = self.cache_root if cache and self.cache_root else self.root
+        return f"%{var}%/{relative}/*"
+
+
+BROWSERS = {
+    "chrome": BrowserSpec(
+        "chrome", "Chrome", LAYOUT_CHROMIUM, ("LOCALAPPDATA", "Google/Chrome/User Data"), CHROMIUM_RULES,
+    ),
+    "edge": BrowserSpec(
+        "edge", "Edge", LAYOUT_CHROMIUM, ("LOCALAPPDATA", "Microsoft/Edge/User Data"), CHROMIUM_RULES,
+    ),
+    "firefox": BrowserSpec(
+        "firefox", "Firefox", LAYOUT_FIREFOX, ("APPDATA", "Mozilla/Firefox/Profiles"), FIREFOX_RULES,
+        cache_root=("LOCALAPPDATA", "Mozilla/Firefox/Profiles"),
+    ),
+    "brave": BrowserSpec(
+        "brave", "Brave", LAYOUT_CHROMIUM, ("LOCALAPPDATA", "BraveSoftware/Brave-Browser/User Data"),
+        BRAVE_RULES,
+    ),
+}
+
+# item key -> Rule, for every browser in BROWSERS (chrome_history, ..., brave_cookies)
+BROWSER_RULES = {rule.item: rule for rule in browser_rules(BROWSERS)}
+
+
+class BrowserProfile:
+    """One discovered profile and what its folders contain."""
+
+    __slots__ = ("browser", "name", "path", "cache_path", "entries", "cache_entries")
+
+    def __init__(self, browser, name, path, cache_path):
+        self.browser = browser
+        self.name = name
+        self.path = path              # profile directory (None for a Firefox cache-only leftover)
+        self.cache_path = cache_path  # folder holding the caches (the profile itself for Chromium)
+        self.entries = {}             # name -> is_dir, for the profile directory
+        self.cache_entries = {}       # name -> is_dir, for cache_path
+
+    def file(self, name):
+        """Path of file `name` in the profile if it exists, else None."""
+        if self.entries.get(name) is False:
+            return os.path.join(self.path, name)
+        return None
+
+    def cache_dir(self, name):
+        """Path of cache directory `name` if it exists, else None."""
+        if self.cache_entries.get(name):
+            return os.path.join(self.cache_path, name)
+        return None
+
+    def match(self, pattern):
+        """Paths of profile entries whose name matches a glob pattern."""
+        return [os.path.join(self.path, name) for name in sorted(self.entries) if matches(pattern, name)]
+
+    def __repr__(self):
+        return f"BrowserProfile({self.browser}/{self.name}, {len(self.entries)} entries)"
+
+
+def _list_dir(path):
+    """{name: is_dir} of a directory; empty if it is missing or unreadable."""
+    if not path:
+        return {}
+    listing = {}
+    try:
+        with os.scandir(path) as it:
+            for entry in it:
+                try:
+                    listing[entry.name] = entry.is_dir(follow_symlinks=False)
+                except OSError:
+                    continue
+    except OSError:
+        return {}
+    return listing
+
+
+def _profile_names(spec, root, cache_root):
+    names = {name for name, is_dir in _list_dir(root).items() if is_dir}
+    if spec.layout == LAYOUT_CHROMIUM:
+        return sorted(
+            (name for name in names if name == "Default" or name.startswith("Profile ")),
+            key=lambda name: (name != "Default", name),
+        )
+    if cache_root:
+        names |= {name for name, is_dir in _list_dir(cache_root).items() if is_dir}
+    return sorted(names)
+
+
+def _discover(spec, bases):
+    root = spec.resolve(spec.root, bases)
+    cache_root = spec.resolve(spec.cache_root, bases)
+    profiles = []
+    for name in _profile_names(spec, root, cache_root):
+        path = os.path.join(root, name) if root else None
+        profile = BrowserProfile(spec.key, name, path, None)
+        profile.entries = _list_dir(path)
+        if not profile.entries and spec.layout == LAYOUT_FIREFOX:
+            profile.path = None
+        if cache_root:
+            profile.cache_path = os.path.join(cache_root, name)
+            profile.cache_entries = _list_dir(profile.cache_path)
+        else:
+            profile.cache_path = path
+            profile.cache_entries = profile.entries
+        profiles.append(profile)
+    return profiles
+
+
+class ProfileIndex:
+    """Profiles of every browser in BROWSERS, discovered in one pass."""
+
+    def __init__(self, profiles_by_browser):
+        self._profiles = profiles_by_browser
+
+    @classmethod
+    def build(cls, bases, browsers=None):
+        """Discover profiles; bases maps env var names (LOCALAPPDATA, ...) to validated paths."""
+        browsers = BROWSERS if browsers is None else browsers
+        return cls({key: _discover(spec, bases) for key, spec in browsers.items()})
+
+    @classmethod
+    def for_items(cls, items, env_path):
+        """Index of only the browsers whose rules `items` select; env_path is a backend's env_path."""
+        wanted = {BROWSER_RULES[item].browser for item in items if item in BROWSER_RULES}
+        bases = {var: env_path(var) or "" for var in ("LOCALAPPDATA", "APPDATA")}
+        return cls.build(bases, {key: spec for key, spec in BROWSERS.items() if key in wanted})
+
+    def profiles(self, browser):
+        return self._profiles.get(browser, [])
+
+    def __iter__(self):
+        for profiles in self._profiles.values():
+            yield from profiles
+
+    def __len__(self):
+        return sum(len(profiles) for profiles in self._profiles.values())
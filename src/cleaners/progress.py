@@ -0,0 +1,145 @@
+"""Work-unit progress for a cleanup run.
+
+Each selected item gets a weight from its scan-only ItemEstimate (the cheap
+pre-count of files, registry values and SQLite rows shown next to the
+checkbox): one unit per file or value, one per ROWS_PER_UNIT rows, plus a
+fixed unit so empty items still count. Cleaners report deleted files as
+they go and mark items finished, and the GUI polls snapshot() on a timer to
+get a smooth overall fraction, an ETA and the current throughput.
+"""
+
+import collections
+import threading
+import time
+
+# Deleting this many rows in one statement costs roughly one file unlink.
+ROWS_PER_UNIT = 200
+# Every item is worth at least this much, even if the scan found nothing.
+ITEM_BASE_UNITS = 1
+# Throughput is measured over this many trailing seconds.
+RATE_WINDOW = 3.0
+
+
+def item_units(estimate):
+    """Weight of one item from its ItemEstimate."""
+    return ITEM_BASE_UNITS + estimate.items + estimate.rows / ROWS_PER_UNIT
+
+
+class ProgressSnapshot:
+    """Point-in-time view of a run's progress."""
+
+    __slots__ = ("fraction", "eta", "files", "bytes", "files_per_sec", "mb_per_sec")
+
+    def __init__(self, fraction, eta, files, size, files_per_sec, mb_per_sec):
+        self.fraction = fraction            # 0.0 - 1.0, weighted by work units
+        self.eta = eta                      # seconds left, None until measurable
+        self.files = files                  # files deleted so far
+        self.bytes = size                   # bytes freed so far
+        self.files_per_sec = files_per_sec  # over the last RATE_WINDOW seconds
+        self.mb_per_sec = mb_per_sec
+
+    def __repr__(self):
+        return (
+            f"ProgressSnapshot({self.fraction:.1%}, eta={self.eta}, "
+            f"{self.files_per_sec:.0f} files/s, {self.mb_per_sec:.1f} MB/s)"
+        )
+
+
+class ItemProgress:
+    """What one item has done so far in a run."""
+
+    __slots__ = ("units", "done_units", "started", "finished", "files", "bytes", "rows")
+
+    def __init__(self, units):
+        self.units = units         # weight from the estimate
+        self.done_units = 0.0
+        self.started = None        # tracker clock values
+        self.finished = None
+        self.files = 0
+        self.bytes = 0
+        self.rows = 0
+
+    @property
+    def seconds(self):
+        if self.started is None or self.finished is None:
+            return None
+        return self.finished - self.started
+
+
+class ProgressTracker:
+    """Thread-safe accumulator of progress events from concurrent cleaners.
+
+    estimates maps the selected item keys to their ItemEstimate, or None
+    when the scan has not measured the item yet; those items get the
+    average weight of the measured ones.
+    """
+
+    def __init__(self, estimates, clock=time.monotonic):
+        known = {item: item_units(est) for item, est in estimates.items() if est is not None}
+        fallback = sum(known.values()) / len(known) if known else ITEM_BASE_UNITS
+        self.items = {item: ItemProgress(known.get(item, fallback)) for item in estimates}
+        self._files = 0
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._start = clock()
+        self._samples = collections.deque([(self._start, 0, 0)])
+
+    @property
+    def total_units(self):
+        return sum(p.units for p in self.items.values())
+
+    def start(self, item):
+        """Mark `item` as running (records its start time)."""
+        with self._lock:
+            progress = self.items.get(item)
+            if progress is not None and progress.started is None:
+                progress.started = self._clock()
+
+    def advance(self, item, files=0, size=0, rows=0):
+        """Record work done for `item` (files unlinked, bytes freed, rows deleted)."""
+        with self._lock:
+            self._files += files
+            self._bytes += size
+            progress = self.items.get(item)
+            if progress is None:
+                return
+            progress.files += files
+            progress.bytes += size
+            progress.rows += rows
+            if progress.finished is None:
+                units = progress.done_units + files + rows / ROWS_PER_UNIT
+                # Stay below the item's weight until it is actually finished.
+                progress.done_units = min(units, progress.units * 0.99)
+
+    def finish(self, item):
+        """Mark `item` complete, whatever its estimate said."""
+        with self._lock:
+            progress = self.items.get(item)
+            if progress is not None and progress.finished is None:
+                progress.finished = self._clock()
+                progress.done_units = progress.units
+
+    def snapshot(self):
+        """Overall fraction, ETA and trailing throughput (poll from one thread)."""
+        with self._lock:
+            now = self._clock()
+            done = sum(p.done_units for p in self.items.values())
+            total = sum(p.units for p in self.items.values())
+            files, size = self._files, self._bytes
+        fraction = done / total if total else 1.0
+
+        samples = self._samples
+        samples.append((now, files, size))
+        while len(samples) > 2 and now - samples[1][0] >= RATE_WINDOW:
+            samples.popleft()
+        then, files_then, size_then = samples[0]
+        window = now - then
+        files_per_sec = (files - files_then) / window if window > 0 else 0.0
+        mb_per_sec = (size - size_then) / 1048576 / window if window > 0 else 0.0
+
+        elapsed = now - self._start
+        eta = None
+        if 0 < fraction < 1 and elapsed >= 1.0:
+            eta = elapsed * (1 - fraction) / fraction
+        return ProgressSnapshot(fraction, eta, files, size, files_per_sec, mb_per_sec)
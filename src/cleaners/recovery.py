@@ -0,0 +1,289 @@
+"""Recoverable deletion: a recycle-bin style store any cleaner can move entries into.
+
+A cleaner opts in by calling BaseCleaner._move_to_recovery(path) instead of
+deleting. Each item's moves in a run form one snapshot:
+
+    %LOCALAPPDATA%\\MyPcNow\\recovery\\
+        index.sqlite                      snapshots and original paths
+        20260101_120000_user_shortcuts_1a2b3c\\
+            00001_report.lnk
+            00002_notes.url
+
+Entries are moved with a rename, which is O(1) whatever their size, as
+long as the store is on the same volume. For a source on another volume a
+store folder at that volume's root (VOLUME_STORE_NAME) is used instead;
+only if that cannot be created is the entry copied (shutil.move).
+
+restore(snapshot_id) renames everything back (entries whose original path
+is taken again are left in the store). Snapshots are evicted when they
+are older than max_age or, oldest first, when the store exceeds max_bytes;
+the newest snapshot is never evicted for size, so a large cleanup stays
+recoverable until the next one.
+"""
+
+import errno
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import uuid
+
+from .deletion import delete_path, scan_path
+
+RECOVERY_DIR = os.path.join("MyPcNow", "recovery")
+VOLUME_STORE_NAME = ".MyPcNow_recovery"
+INDEX_FILE = "index.sqlite"
+DEFAULT_MAX_AGE = 30 * 24 * 3600
+DEFAULT_MAX_BYTES = 2 * 1024 ** 3
+
+_ERROR_NOT_SAME_DEVICE = 17  # Windows error for a rename across volumes
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    id TEXT PRIMARY KEY,
+    item TEXT NOT NULL,
+    created REAL NOT NULL,
+    entries INTEGER NOT NULL DEFAULT 0,
+    bytes INTEGER NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS entries (
+    snapshot TEXT NOT NULL,
+    stored TEXT NOT NULL,
+    original TEXT NOT NULL,
+    bytes INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS entries_snapshot ON entries (snapshot);
+"""
+
+
+def default_recovery_root(environ=None):
+    """%LOCALAPPDATA%\\MyPcNow\\recovery, or under the temp directory if it is unset."""
+    base = (os.environ if environ is None else environ).get("LOCALAPPDATA") or tempfile.gettempdir()
+    return os.path.join(base, RECOVERY_DIR)
+
+
+def _is_cross_device(error):
+    return error.errno == errno.EXDEV or getattr(error, "winerror", None) == _ERROR_NOT_SAME_DEVICE
+
+
+def _mount_point(path):
+    path = os.path.abspath(path)
+    while not os.path.ismount(path):
+        parent = os.path.dirname(path)
+        if parent == path:
+            break
+        path = parent
+    return path
+
+
+def _measure(path):
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return 0
+    if os.path.isdir(path) and not os.path.islink(path):
+        return scan_path(path).bytes_freed
+    return st.st_size
+
+
+class Snapshot:
+    """The entries one item moved into the store during one run."""
+
+    __slots__ = ("store", "id", "item", "created", "entries", "bytes", "_dirs")
+
+    def __init__(self, store, item, created):
+        self.store = store
+        self.item = item
+        self.created = created
+        stamp = time.strftime("%Y%m%d_%H%M%S", time.localtime(created))
+        self.id = f"{stamp}_{item}_{uuid.uuid4().hex[:6]}"
+        self.entries = 0
+        self.bytes = 0
+        self._dirs = {}  # st_dev -> this snapshot's folder on that volume
+
+    def put(self, path):
+        """Move `path` into the store and index it; returns where it went. Raises OSError."""
+        return self.store._put(self, path)
+
+    @property
+    def folder(self):
+        """Folder holding the snapshot on the store's own volume (None until used)."""
+        return next(iter(self._dirs.values()), None)
+
+
+class RecoveryStore:
+    """Index plus per-volume folders of recoverable snapshots (thread-safe)."""
+
+    def __init__(self, root=None, max_age=DEFAULT_MAX_AGE, max_bytes=DEFAULT_MAX_BYTES):
+        self.root = root or default_recovery_root()
+        self.max_age = max_age
+        self.max_bytes = max_bytes
+        self._conn = None
+        self._roots = {}  # st_dev -> store folder on that volume
+        self._lock = threading.RLock()
+
+    def _db(self):
+        if self._conn is None:
+            os.makedirs(self.root, exist_ok=True)
+            conn = sqlite3.connect(
+                os.path.join(self.root, INDEX_FILE), isolation_level=None, check_same_thread=False,
+            )
+            conn.executescript(_SCHEMA)
+            self._conn = conn
+        return self._conn
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def snapshot(self, item):
+        """Start a snapshot for `item`; old snapshots are evicted first."""
+        self.evict()
+        return Snapshot(self, item, time.time())
+
+    def _volume_root(self, dev, path):
+        root = self._roots.get(dev)
+        if root is not None:
+            return root
+        os.makedirs(self.root, exist_ok=True)
+        root = self.root
+        if os.stat(self.root).st_dev != dev:
+            candidate = os.path.join(_mount_point(path), VOLUME_STORE_NAME)
+            try:
+                os.makedirs(candidate, exist_ok=True)
+                root = candidate
+            except OSError:
+                pass  # fall back to copying into the main store
+        self._roots[dev] = root
+        return root
+
+    def _put(self, snapshot, path):
+        path = os.path.abspath(path)
+        size = _measure(path)
+        dev = os.lstat(os.path.dirname(path)).st_dev
+        with self._lock:
+            folder = snapshot._dirs.get(dev)
+            if folder is None:
+                folder = os.path.join(self._volume_root(dev, path), snapshot.id)
+                os.makedirs(folder, exist_ok=True)
+                snapshot._dirs[dev] = folder
+            stored = os.path.join(folder, f"{snapshot.entries + 1:05d}_{os.path.basename(path)}")
+            try:
+                os.rename(path, stored)
+            except OSError as e:
+                if not _is_cross_device(e):
+                    raise
+                shutil.move(path, stored)
+            conn = self._db()
+            with conn:
+                conn.execute("BEGIN")
+                if snapshot.entries == 0:
+                    conn.execute(
+                        "INSERT INTO snapshots (id, item, created) VALUES (?, ?, ?)",
+                        (snapshot.id, snapshot.item, snapshot.created),
+                    )
+                conn.execute("INSERT INTO entries VALUES (?, ?, ?, ?)", (snapshot.id, stored, path, size))
+                conn.execute(
+                    "UPDATE snapshots SET entries = entries + 1, bytes = bytes + ? WHERE id = ?",
+                    (size, snapshot.id),
+                )
+            snapshot.entries += 1
+            snapshot.bytes += size
+        return stored
+
+    def snapshots(self):
+        """[{id, item, created, entries, bytes}], newest first."""
+        with self._lock:
+            if not os.path.exists(os.path.join(self.root, INDEX_FILE)):
+                return []
+            rows = self._db().execute(
+                "SELECT id, item, created, entries, bytes FROM snapshots ORDER BY created DESC"
+            ).fetchall()
+        return [
+            {"id": id_, "item": item, "created": created, "entries": entries, "bytes": size}
+            for id_, item, created, entries, size in rows
+        ]
+
+    def entries(self, snapshot_id):
+        """[(stored, original, bytes)] of a snapshot."""
+        with self._lock:
+            return self._db().execute(
+                "SELECT stored, original, bytes FROM entries WHERE snapshot = ?", (snapshot_id,)
+            ).fetchall()
+
+    def restore(self, snapshot_id):
+        """Move a snapshot's entries back. Returns (restored, conflicts).
+
+        An entry whose original path exists again is a conflict and stays in
+        the store. Raises KeyError for an unknown snapshot.
+        """
+        with self._lock:
+            conn = self._db()
+            if conn.execute("SELECT 1 FROM snapshots WHERE id = ?", (snapshot_id,)).fetchone() is None:
+                raise KeyError(snapshot_id)
+            restored = conflicts = 0
+            for stored, original, size in self.entries(snapshot_id):
+                if os.path.lexists(original) or not os.path.lexists(stored):
+                    conflicts += 1
+                    continue
+                os.makedirs(os.path.dirname(original), exist_ok=True)
+                try:
+                    os.rename(stored, original)
+                except OSError as e:
+                    if not _is_cross_device(e):
+                        conflicts += 1
+                        continue
+                    shutil.move(stored, original)
+                restored += 1
+                with conn:
+                    conn.execute("BEGIN")
+                    conn.execute("DELETE FROM entries WHERE snapshot = ? AND stored = ?", (snapshot_id, stored))
+                    conn.execute(
+                        "UPDATE snapshots SET entries = entries - 1, bytes = bytes - ? WHERE id = ?",
+                        (size, snapshot_id),
+                    )
+            if not conflicts:
+                self._drop(snapshot_id)
+        return restored, conflicts
+
+    def _drop(self, snapshot_id):
+        """Delete a snapshot's stored entries, folders and index rows."""
+        conn = self._db()
+        folders = set()
+        for stored, _, _ in self.entries(snapshot_id):
+            delete_path(stored)
+            folders.add(os.path.dirname(stored))
+        for root in {self.root, *self._roots.values()}:
+            folders.add(os.path.join(root, snapshot_id))
+        for folder in folders:
+            try:
+                os.rmdir(folder)
+            except OSError:
+                pass
+        with conn:
+            conn.execute("BEGIN")
+            conn.execute("DELETE FROM entries WHERE snapshot = ?", (snapshot_id,))
+            conn.execute("DELETE FROM snapshots WHERE id = ?", (snapshot_id,))
+
+    def evict(self, now=None):
+        """Drop snapshots past max_age, then the oldest beyond max_bytes. Returns (snapshots, bytes)."""
+        now = time.time() if now is None else now
+        evicted = freed = 0
+        with self._lock:
+            kept_bytes = 0
+            over = False
+            for index, snap in enumerate(self.snapshots()):
+                too_old = now - snap["created"] > self.max_age
+                # The newest snapshot is only ever evicted for age
+                over = over or (index > 0 and kept_bytes + snap["bytes"] > self.max_bytes)
+                if too_old or over:
+                    self._drop(snap["id"])
+                    evicted += 1
+                    freed += snap["bytes"]
+                else:
+                    kept_bytes += snap["bytes"]
+        return evicted, freed
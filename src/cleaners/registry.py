@@ -0,0 +1,205 @@
+"""Shared registry deletion engine used by every cleaner with registry items.
+
+The cleaners used to clear a key with `EnumValue(key, 0)` + `DeleteValue`
+until enumeration failed, and to remove subkeys by enumerating, recursing,
+clearing each child's values and reopening the parent with KEY_ALL_ACCESS
+for every DeleteKey. That is several handle opens per subkey and two calls
+per value, and index 0 makes Windows rescan the shrinking value list on
+every call.
+
+Here every key is opened once and its names are read once:
+
+    clear_values(winreg, hive, path)   delete a key's values, keep its subkeys
+    clear_tree(winreg, hive, path)     delete a key's values and subkeys, keep the key
+
+Where the winreg in use has DeleteTree (RegDeleteTreeW: the Windows and
+sandbox backends provide it) a key with nothing to keep is cleared in one
+call; clear_tree first walks the tree read-only so the counts it reports
+cover every depth, not just the top level. Otherwise subtrees are removed bottom-up with a stack of open handles
+(one per level of depth, never recursion): each key is deleted through the
+parent handle that enumerated it, and its values go with it. Every result
+records the registry calls it made (RegistryResult.ops).
+
+Both functions take scan_only=True to count instead of delete (read access
+only), and a CancelToken checked between values and keys.
+"""
+
+from .instrument import CountingRegistry
+
+
+class RegistryResult:
+    """Structured outcome of a registry deletion (or scan) pass."""
+
+    __slots__ = ("found", "values", "keys", "ops")
+
+    def __init__(self):
+        self.found = False  # the key existed
+        self.values = 0     # values deleted (or counted), at any depth
+        self.keys = 0       # subkeys deleted (or counted), at any depth
+        self.ops = 0        # registry API calls made
+
+    def _count_op(self, name):
+        self.ops += 1
+
+    def __repr__(self):
+        return f"RegistryResult(found={self.found}, values={self.values}, keys={self.keys}, ops={self.ops})"
+
+
+def _check(cancel):
+    if cancel is not None:
+        cancel.check()
+
+
+def _value_names(reg, key, count):
+    """Names of the first `count` values of an open key, read once by index."""
+    names = []
+    for index in range(count):
+        try:
+            names.append(reg.EnumValue(key, index)[0])
+        except OSError:
+            break
+    return names
+
+
+def _subkey_names(reg, key, count):
+    names = []
+    for index in range(count):
+        try:
+            names.append(reg.EnumKey(key, index))
+        except OSError:
+            break
+    return names
+
+
+def clear_values(winreg, hive, key_path, names=None, scan_only=False, cancel=None):
+    """Delete the values of hive\\key_path (only `names`, if given); subkeys stay.
+
+    A missing key gives found=False; PermissionError propagates.
+    """
+    result = RegistryResult()
+    reg = CountingRegistry(winreg, result._count_op)
+    access = winreg.KEY_READ if scan_only else winreg.KEY_ALL_ACCESS
+    try:
+        key = reg.OpenKey(hive, key_path, 0, access)
+    except FileNotFoundError:
+        return result
+    result.found = True
+    try:
+        if names is not None:
+            for name in names:
+                _check(cancel)
+                try:
+                    if scan_only:
+                        reg.QueryValueEx(key, name)
+                    else:
+                        reg.DeleteValue(key, name)
+                    result.values += 1
+                except FileNotFoundError:
+                    pass
+            return result
+        subkeys, values, _ = reg.QueryInfoKey(key)
+        if scan_only:
+            result.values = values
+            return result
+        if not values:
+            return result
+        if not subkeys and hasattr(winreg, "DeleteTree"):
+            reg.DeleteTree(key, None)
+            result.values = values
+            return result
+        for name in _value_names(reg, key, values):
+            _check(cancel)
+            try:
+                reg.DeleteValue(key, name)
+                result.values += 1
+            except FileNotFoundError:
+                pass
+        return result
+    finally:
+        reg.CloseKey(key)
+
+
+def clear_tree(winreg, hive, key_path, scan_only=False, cancel=None):
+    """Delete every value and subkey under hive\\key_path; the key itself stays.
+
+    A missing key gives found=False; PermissionError on the key itself
+    propagates, subkeys that cannot be removed are left in place.
+    """
+    result = RegistryResult()
+    reg = CountingRegistry(winreg, result._count_op)
+    access = winreg.KEY_READ if scan_only else winreg.KEY_ALL_ACCESS
+    try:
+        top = reg.OpenKey(hive, key_path, 0, access)
+    except FileNotFoundError:
+        return result
+    result.found = True
+    try:
+        subkeys, values, _ = reg.QueryInfoKey(top)
+        if not scan_only and hasattr(winreg, "DeleteTree"):
+            # Count the whole tree first (read access below the top), then one call
+            if subkeys:
+                _walk(reg, top, subkeys, result, True, winreg.KEY_READ, cancel)
+            _check(cancel)
+            reg.DeleteTree(top, None)
+            result.values += values
+            return result
+        if scan_only:
+            result.values += values
+        else:
+            for name in _value_names(reg, top, values):
+                _check(cancel)
+                try:
+                    reg.DeleteValue(top, name)
+                    result.values += 1
+                except FileNotFoundError:
+                    pass
+        _walk(reg, top, subkeys, result, scan_only, access, cancel)
+    finally:
+        reg.CloseKey(top)
+    return result
+
+
+def _walk(reg, top, subkeys, result, scan_only, access, cancel):
+    """Delete (or count) every subkey below the open key `top`, leaving `top` open.
+
+    Values of `top` itself are the caller's; those of every subkey are
+    added to result as the subkey goes.
+    """
+    # Depth-first; a frame is [open handle, subkey names left, its name in the parent, its values]
+    stack = [[top, _subkey_names(reg, top, subkeys), None, 0]]
+    try:
+        while stack:
+            _check(cancel)
+            handle, pending, own_name, own_values = stack[-1]
+            if pending:
+                name = pending.pop()
+                try:
+                    child = reg.OpenKey(handle, name, 0, access)
+                except OSError:
+                    continue
+                child_subkeys, child_values, _ = reg.QueryInfoKey(child)
+                if child_subkeys:
+                    stack.append([child, _subkey_names(reg, child, child_subkeys), name, child_values])
+                    continue
+                reg.CloseKey(child)
+                _remove(reg, handle, name, child_values, result, scan_only)
+                continue
+            # Subtree done: the key goes through its parent's handle, values included
+            stack.pop()
+            if stack:
+                reg.CloseKey(handle)
+                _remove(reg, stack[-1][0], own_name, own_values, result, scan_only)
+    finally:
+        for frame in stack[1:]:
+            reg.CloseKey(frame[0])
+
+
+def _remove(reg, parent, name, values, result, scan_only):
+    """Delete (or count) the now childless subkey `name` of `parent`."""
+    if not scan_only:
+        try:
+            reg.DeleteKey(parent, name)
+        except OSError:
+            return
+    result.keys += 1
+    result.values += values
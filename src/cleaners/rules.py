@@ -0,0 +1,240 @@
+"""Declarative cleaning rules.
+
+A Rule is one cleanup item described as data: a list of targets.
+
+    sqlite("History", ["urls", "visits"], where=[("moz_places", "visit_count = 0")],
+           then_delete=["History-journal"],
+           prune=["chromium_history"])        tables cleared in a SQLite file
+    dir_contents("Cache")                     everything inside a directory
+    files("Top Sites*")                       files matching a name pattern
+    registry_values("HKCU/Software/...")      all values under a registry key
+
+A sqlite target's prune names (history_prune.PRUNERS) replace its table
+clears when the run has a HistoryRange, so only matching rows go.
+
+Paths of a browser rule are relative to each profile of that browser (as
+found by profiles.ProfileIndex; dir_contents looks in the profile's cache
+folder, which for Chromium is the profile itself). Paths starting with
+%VAR% are absolute and may contain glob patterns.
+
+compile_rule() resolves a rule against the profile index into concrete
+Actions: targets the profile does not have are dropped, and the rest are
+ordered registry, files, directories, then databases (which BrowserCleaner
+queues on its SqlitePlan so each DB file is opened once however many rules
+touch it). rule_resources() derives the scheduler resources of a rule, so
+items that touch the same files are serialised automatically.
+"""
+
+import fnmatch
+import glob
+import os
+import re
+
+TARGET_SQLITE = "sqlite"
+TARGET_DIR = "dir"
+TARGET_FILES = "files"
+TARGET_REGISTRY = "registry"
+
+# Execution order of a rule's actions; databases last so that they can be
+# merged per file and their companions deleted once they are closed.
+ACTION_ORDER = (TARGET_REGISTRY, TARGET_FILES, TARGET_DIR, TARGET_SQLITE)
+
+_ENV_VAR = re.compile(r"^%([A-Za-z_][A-Za-z0-9_]*)%")
+
+
+class Target:
+    """One thing a rule cleans; build with sqlite(), dir_contents(), files(), registry_values()."""
+
+    __slots__ = ("kind", "path", "tables", "filters", "then_delete", "prunes")
+
+    def __init__(self, kind, path, tables=(), filters=(), then_delete=(), prunes=()):
+        self.kind = kind
+        self.path = path
+        self.tables = tuple(tables)
+        self.filters = tuple(filters)
+        self.then_delete = tuple(then_delete)
+        self.prunes = tuple(prunes)
+
+    def __repr__(self):
+        return f"Target({self.kind}, {self.path!r})"
+
+
+def sqlite(path, tables=(), where=(), then_delete=(), prune=()):
+    """Clear `tables` and delete the (table, where) rows in a SQLite file."""
+    return Target(TARGET_SQLITE, path, tables, where, then_delete, prune)
+
+
+def dir_contents(path):
+    """Delete everything inside a directory, keeping the directory."""
+    return Target(TARGET_DIR, path)
+
+
+def files(pattern):
+    """Delete files (or folders) whose name matches a glob pattern."""
+    return Target(TARGET_FILES, pattern)
+
+
+def registry_values(key):
+    """Delete all values under a registry key ('HKCU/Software/...')."""
+    return Target(TARGET_REGISTRY, key)
+
+
+class Rule:
+    """One cleanup item: `source` ('Chrome') and `name` ('방문 기록') label it."""
+
+    __slots__ = ("item", "source", "name", "targets", "browser")
+
+    def __init__(self, item, source, name, targets, browser=None):
+        self.item = item
+        self.source = source
+        self.name = name
+        self.targets = tuple(targets)
+        self.browser = browser  # profile-relative targets resolve against this browser
+
+    @property
+    def label(self):
+        return f"{self.source} {self.name}"
+
+    @property
+    def has_databases(self):
+        return any(target.kind == TARGET_SQLITE for target in self.targets)
+
+    def __repr__(self):
+        return f"Rule({self.item}, {len(self.targets)} targets)"
+
+
+class RuleTemplate:
+    """A rule for any browser with the same layout: item suffix plus targets."""
+
+    __slots__ = ("suffix", "name", "targets")
+
+    def __init__(self, suffix, name, targets):
+        self.suffix = suffix
+        self.name = name
+        self.targets = tuple(targets)
+
+
+def browser_rules(browsers):
+    """Rules for every browser spec, in spec order: '<browser>_<suffix>'."""
+    rules = []
+    for spec in browsers.values():
+        for template in spec.rules:
+            rules.append(Rule(
+                f"{spec.key}_{template.suffix}", spec.name, template.name, template.targets,
+                browser=spec.key,
+            ))
+    return rules
+
+
+class Action:
+    """A target resolved to a concrete path (one per profile for browser rules)."""
+
+    __slots__ = ("kind", "path", "tables", "filters", "then_delete", "prunes")
+
+    def __init__(self, kind, path, tables=(), filters=(), then_delete=(), prunes=()):
+        self.kind = kind
+        self.path = path
+        self.tables = tables
+        self.filters = filters
+        self.then_delete = then_delete
+        self.prunes = prunes
+
+    @property
+    def key(self):
+        """Identity used to skip a target another rule of the same run already handled."""
+        return self.kind, os.path.normcase(self.path) if self.kind != TARGET_REGISTRY else self.path.lower()
+
+    def __repr__(self):
+        return f"Action({self.kind}, {self.path!r})"
+
+
+def _is_absolute(path):
+    return bool(_ENV_VAR.match(path))
+
+
+def _expand(path, environ=None):
+    """Absolute path for '%VAR%/...', or None if VAR is unset or not absolute."""
+    match = _ENV_VAR.match(path)
+    base = (os.environ if environ is None else environ).get(match.group(1), "")
+    if not base or not os.path.isabs(base):
+        return None
+    rest = path[match.end():].strip("/")
+    return os.path.join(base, *rest.split("/")) if rest else base
+
+
+def _absolute_actions(target, environ=None):
+    pattern = _expand(target.path, environ)
+    if pattern is None:
+        return []
+    paths = sorted(glob.glob(pattern)) if glob.has_magic(pattern) else [pattern]
+    actions = []
+    for path in paths:
+        if target.kind == TARGET_DIR and not os.path.isdir(path):
+            continue
+        if target.kind in (TARGET_SQLITE, TARGET_FILES) and not os.path.lexists(path):
+            continue
+        companions = tuple(
+            os.path.join(os.path.dirname(path), name) for name in target.then_delete
+        )
+        actions.append(Action(target.kind, path, target.tables, target.filters, companions, target.prunes))
+    return actions
+
+
+def _profile_actions(target, profile):
+    if target.kind == TARGET_DIR:
+        path = profile.cache_dir(target.path)
+        return [Action(TARGET_DIR, path)] if path else []
+    if target.kind == TARGET_FILES:
+        return [Action(TARGET_FILES, path) for path in profile.match(target.path)]
+    if target.kind == TARGET_SQLITE:
+        path = profile.file(target.path)
+        if path is None:
+            return []
+        companions = tuple(p for name in target.then_delete for p in profile.match(name))
+        return [Action(TARGET_SQLITE, path, target.tables, target.filters, companions, target.prunes)]
+    return []
+
+
+def compile_rule(rule, index, environ=None):
+    """Concrete Actions of `rule` against ProfileIndex `index`, in execution order.
+
+    environ resolves %VAR% targets (default os.environ; a cleaner passes its
+    backend's).
+    """
+    actions = []
+    for target in rule.targets:
+        if target.kind == TARGET_REGISTRY:
+            actions.append(Action(TARGET_REGISTRY, target.path))
+        elif _is_absolute(target.path):
+            actions.extend(_absolute_actions(target, environ))
+        elif rule.browser is not None:
+            for profile in index.profiles(rule.browser):
+                actions.extend(_profile_actions(target, profile))
+    actions.sort(key=lambda action: ACTION_ORDER.index(action.kind))
+    return actions
+
+
+def _resource_kind(kind):
+    return {TARGET_SQLITE: "db", TARGET_DIR: "dir", TARGET_FILES: "file", TARGET_REGISTRY: "reg"}[kind]
+
+
+def rule_resources(rule, browsers):
+    """Scheduler resource strings (see cleaners.scheduler) of one rule."""
+    spec = browsers.get(rule.browser) if rule.browser else None
+    resources = []
+    for target in rule.targets:
+        kind = _resource_kind(target.kind)
+        if target.kind == TARGET_REGISTRY or _is_absolute(target.path):
+            resources.append(f"{kind}:{target.path}")
+            continue
+        if spec is None:
+            continue
+        base = spec.profile_pattern(cache=target.kind == TARGET_DIR)
+        resources.append(f"{kind}:{base}/{target.path}")
+        resources.extend(f"file:{base}/{name}" for name in target.then_delete)
+    return tuple(dict.fromkeys(resources))
+
+
+def matches(pattern, name):
+    """Case-insensitive glob match of a file name (Windows semantics)."""
+    return fnmatch.fnmatch(name.lower(), pattern.lower())
@@ -0,0 +1,217 @@
+"""Concurrent scheduler for cleanup items.
+
+Every cleaner declares, per item, the resources the item touches (class
+attribute RESOURCES), e.g.
+
+    "db:%LOCALAPPDATA%/Google/Chrome/User Data/*/History"
+    "dir:%TEMP%"
+    "reg:HKCU/Software/Microsoft/Windows/CurrentVersion/Explorer/RunMRU"
+
+Two items conflict when they share a resource or one resource lies inside
+the other (dir:%LOCALAPPDATA% contains dir:%LOCALAPPDATA%/MyPcNow/recovery). db:,
+dir: and file: share one filesystem namespace. Conflicting items are
+chained into one task that runs them in the usual category/item order on a
+single cleaner instance (so BrowserCleaner still merges DB work per file);
+independent tasks run on a bounded thread pool.
+"""
+
+import os
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from .backends import default_backend
+from .profiles import BROWSER_RULES, ProfileIndex
+
+MAX_SCHEDULER_WORKERS = 4
+
+_PATH_KINDS = {"db", "dir", "file"}
+_ENV_VAR = re.compile(r"%([A-Za-z_][A-Za-z0-9_]*)%")
+
+
+def _expand(value, environ=None):
+    """Resolve %VAR% from `environ` (default os.environ; unset variables stay symbolic)."""
+    environ = os.environ if environ is None else environ
+    return _ENV_VAR.sub(lambda m: environ.get(m.group(1), m.group(0)), value)
+
+
+def _resource_key(resource, environ=None):
+    """(namespace, path segments) used for containment checks."""
+    kind, _, ident = resource.partition(":")
+    namespace = "fs" if kind in _PATH_KINDS else kind
+    ident = _expand(ident, environ).replace("\\", "/")
+    if namespace == "fs":
+        ident = os.path.normcase(ident)
+    else:
+        ident = ident.lower()
+    return namespace, tuple(part for part in ident.split("/") if part)
+
+
+def resources_conflict(a, b, environ=None):
+    """True if resource strings a and b overlap."""
+    ns_a, parts_a = _resource_key(a, environ)
+    ns_b, parts_b = _resource_key(b, environ)
+    if ns_a != ns_b:
+        return False
+    shorter = min(len(parts_a), len(parts_b))
+    return parts_a[:shorter] == parts_b[:shorter]
+
+
+class Task:
+    """Items that must run one after another, as ordered (cat_key, [items]) steps."""
+
+    __slots__ = ("steps",)
+
+    def __init__(self):
+        self.steps = []
+
+    def add(self, cat_key, item):
+        if self.steps and self.steps[-1][0] == cat_key:
+            self.steps[-1][1].append(item)
+        else:
+            self.steps.append((cat_key, [item]))
+
+    @property
+    def item_count(self):
+        return sum(len(items) for _, items in self.steps)
+
+
+def plan_tasks(selected_items, categories, environ=None):
+    """Group selected items into independent tasks.
+
+    Items keep the order of `categories`; items without declared resources
+    are serialised with the rest of their category. environ resolves %VAR%
+    in resources (default os.environ).
+    """
+    ordered = []  # (cat_key, item, resources)
+    for cat_key, cat_info in categories.items():
+        declared = getattr(cat_info["cleaner"], "RESOURCES", {})
+        for item in cat_info["items"]:
+            if item in selected_items:
+                resources = declared.get(item) or (f"category:{cat_key}",)
+                ordered.append((cat_key, item, resources))
+
+    # Union-find over conflicting items (at most a few dozen, so O(n^2) is fine)
+    parent = list(range(len(ordered)))
+
+    def find(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    for i in range(len(ordered)):
+        for j in range(i + 1, len(ordered)):
+            if any(resources_conflict(a, b, environ) for a in ordered[i][2] for b in ordered[j][2]):
+                parent[find(j)] = find(i)
+
+    tasks = {}
+    for index, (cat_key, item, _) in enumerate(ordered):
+        tasks.setdefault(find(index), Task()).add(cat_key, item)
+    return list(tasks.values())
+
+
+class Scheduler:
+    """Runs planned tasks on a worker pool and funnels logs and progress back.
+
+    Each step's log lines are buffered and emitted as one block when the step
+    finishes, so concurrent steps never interleave inside a section.
+    on_progress(done_items, total_items) is called after every step; for
+    finer-grained progress pass a ProgressTracker as `progress`, which every
+    cleaner then feeds with per-file events. item_log(cat_key, item, message)
+    receives every line tagged with the item that was running when it was
+    logged (lines from a cleaner's wrap-up are tagged with its last item).
+    metrics (an instrument.RunReport) collects per-item timings and counters,
+    and every item's ItemResult; `results` has those too, with or without
+    metrics.
+    history_range (a history_prune.HistoryRange) limits history cleanup to
+    matching entries, temp_policy (a temp_policy.TempPolicy) temp cleanup to
+    old or large entries. journal (a journal.CleanupJournal) lets cleaners
+    skip directories unchanged since the last run; saving it is up to the
+    caller. backend (a backends.SandboxBackend, ...) is handed to every
+    cleaner; the default is the real machine. The browser profiles the
+    selected items need are discovered once per run (profile_index) and
+    shared by every BrowserCleaner.
+    """
+
+    def __init__(self, categories, log, max_workers=MAX_SCHEDULER_WORKERS,
+                 cancel=None, on_progress=None, progress=None, item_log=None, metrics=None,
+                 history_range=None, temp_policy=None, journal=None, backend=None):
+        self.categories = categories
+        self.log = log
+        self.max_workers = max(1, max_workers)
+        self.cancel = cancel
+        self.on_progress = on_progress
+        self.progress = progress
+        self.item_log = item_log
+        self.metrics = metrics
+        self.history_range = history_range
+        self.temp_policy = temp_policy
+        self.journal = journal
+        self.backend = backend
+        self.profile_index = None  # profiles.ProfileIndex built by run() for the browser items
+        self.completed = {}  # cat_key -> completed item keys
+        self.results = {}  # item key -> instrument.ItemResult
+        self._lock = threading.Lock()
+        self._done_items = 0
+        self._total_items = 0
+
+    def _run_step(self, cat_key, items):
+        cat_info = self.categories[cat_key]
+        lines = []  # (item, message)
+        cleaner = cat_info["cleaner"](
+            log_callback=lambda message: lines.append((cleaner.current_item, message)),
+            backend=self.backend,
+        )
+        cleaner.progress = self.progress
+        cleaner.metrics = self.metrics
+        cleaner.history_range = self.history_range
+        cleaner.temp_policy = self.temp_policy
+        cleaner.journal = self.journal
+        if hasattr(cleaner, "profile_index"):
+            cleaner.profile_index = self.profile_index
+        try:
+            results = cleaner.run(items, cancel=self.cancel)
+        except Exception as e:
+            lines.append((cleaner.current_item or items[0], f"  [오류] {cat_info['name']}: {e}"))
+            results = cleaner.results
+        labels = ", ".join(cat_info["items"][item] for item in items)
+        with self._lock:
+            self.log(f"\n--- {cat_info['icon']} {cat_info['name']}: {labels} ---")
+            for item, line in lines:
+                self.log(line)
+                if self.item_log is not None:
+                    self.item_log(cat_key, item or items[0], line)
+            self.completed.setdefault(cat_key, []).extend(cleaner.completed_items)
+            for result in results.values():
+                self.results[result.item] = result
+                if self.metrics is not None:
+                    self.metrics.add_result(result)
+            self._done_items += len(items)
+            if self.on_progress:
+                self.on_progress(self._done_items, self._total_items)
+
+    def _run_task(self, task):
+        for cat_key, items in task.steps:
+            if self.cancel is not None and self.cancel.cancelled:
+                return
+            self._run_step(cat_key, items)
+
+    def run(self, selected_items):
+        """Run the selected items; returns {cat_key: completed item keys}."""
+        environ = self.backend.environ if self.backend is not None else None
+        tasks = plan_tasks(selected_items, self.categories, environ)
+        # Browser items are split over many tasks: discover their profiles once for all of them
+        browser_items = [item for item in selected_items if item in BROWSER_RULES]
+        if browser_items:
+            self.profile_index = ProfileIndex.for_items(
+                browser_items, (self.backend or default_backend()).env_path,
+            )
+        self._total_items = sum(task.item_count for task in tasks)
+        workers = min(self.max_workers, len(tasks)) or 1
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mypcnow-task") as pool:
+            # Longest chains first so they don't end up as the tail of the run
+            for future in [pool.submit(self._run_task, task)
+                           for task in sorted(tasks, key=lambda t: -t.item_count)]:
+                future.result()
+        return self.completed
@@ -0,0 +1,403 @@
+"""Per-run SQLite session planner.
+
+Several cleanup items touch the same database file (chrome_history and
+chrome_downloads both clear tables in History). Instead of opening, deleting
+and VACUUMing the file once per item, items queue their work here and the
+plan runs it at the end: each file is opened once, all queued deletions run
+in a single transaction and compaction runs at most once.
+
+Compaction is configurable because a full VACUUM rewrites the whole file and
+needs as much free disk space again as the file's size:
+
+    none                - only delete rows; freed pages stay in the file
+    incremental_vacuum  - switch the DB to auto_vacuum=INCREMENTAL (one full
+                          VACUUM the first time), then release free pages
+                          with PRAGMA incremental_vacuum on later runs
+    vacuum              - full VACUUM every time (previous behaviour)
+    threshold           - full VACUUM only when freelist pages exceed
+                          freelist_threshold of the file
+
+With a history_range (see history_prune) a job can carry named prunes
+instead of table clears: matching rows are deleted in short batched
+transactions after the job's own deletions.
+
+A running browser keeps its databases locked. Every connection waits up
+to busy_timeout seconds for a lock; a file that is still locked is put on
+a retry queue and tried again after the other files, with growing delays
+(retry_delays), before it is reported as skipped.
+"""
+
+import os
+import pathlib
+import sqlite3
+import time
+
+from .history_prune import PRUNERS
+
+# Allowlist of safe table names for SQL operations
+ALLOWED_TABLES = frozenset({
+    "urls", "visits", "keyword_search_terms", "downloads",
+    "downloads_url_chains", "segments", "segment_usage",
+    "cookies", "moz_historyvisits", "moz_inputhistory", "moz_cookies",
+    "moz_places",
+})
+
+
+COMPACTION_NONE = "none"
+COMPACTION_INCREMENTAL = "incremental_vacuum"
+COMPACTION_FULL = "vacuum"
+COMPACTION_THRESHOLD = "threshold"
+COMPACTION_STRATEGIES = (
+    COMPACTION_NONE, COMPACTION_INCREMENTAL, COMPACTION_FULL, COMPACTION_THRESHOLD,
+)
+DEFAULT_FREELIST_THRESHOLD = 0.25
+
+DEFAULT_BUSY_TIMEOUT = 2.0  # seconds a connection waits for a lock
+LOCK_RETRY_DELAYS = (0.5, 2.0, 5.0)  # pauses before each retry of a locked file
+
+_AUTO_VACUUM_INCREMENTAL = 2
+_SQLITE_BUSY = 5
+_SQLITE_LOCKED = 6
+_LOCK_MESSAGES = ("database is locked", "database table is locked", "database schema is locked")
+# VM instructions between cancellation polls (well under a millisecond of work).
+_CANCEL_POLL_OPS = 1000
+
+
+def _stopped(cancel):
+    return cancel is not None and cancel.cancelled
+
+
+def _wait(cancel, seconds):
+    """Sleep `seconds`, waking early on cancellation; True if cancelled."""
+    if cancel is None:
+        time.sleep(seconds)
+        return False
+    return cancel.wait(seconds)
+
+
+def is_locked_error(error):
+    """True if a sqlite3 error means another connection holds a lock (SQLITE_BUSY/LOCKED)."""
+    code = getattr(error, "sqlite_errorcode", None)
+    if code is not None:
+        return code & 0xFF in (_SQLITE_BUSY, _SQLITE_LOCKED)
+    return any(message in str(error) for message in _LOCK_MESSAGES)
+
+
+def db_label(path):
+    """'Default/History' style name of a database for log lines."""
+    return os.path.join(os.path.basename(os.path.dirname(path)), os.path.basename(path))
+
+
+class DbResult:
+    """Outcome of one database session."""
+
+    __slots__ = (
+        "path", "ok", "rows_deleted", "bytes_reclaimed", "compaction", "seconds", "attempts", "locked",
+    )
+
+    def __init__(self, path):
+        self.path = path
+        self.ok = False
+        self.rows_deleted = 0
+        self.bytes_reclaimed = 0
+        self.compaction = COMPACTION_NONE  # what actually ran
+        self.seconds = 0.0  # wall time of all sessions (attempts)
+        self.attempts = 0
+        self.locked = False  # the last attempt found the file locked
+
+    def __bool__(self):
+        return self.ok
+
+
+def _db_size(cursor):
+    page_count = cursor.execute("PRAGMA page_count").fetchone()[0]
+    page_size = cursor.execute("PRAGMA page_size").fetchone()[0]
+    return page_count * page_size
+
+
+def _compact(cursor, strategy, freelist_threshold):
+    """Apply the compaction strategy; returns the name of what actually ran."""
+    if strategy == COMPACTION_FULL:
+        cursor.execute("VACUUM")
+        return COMPACTION_FULL
+    if strategy == COMPACTION_INCREMENTAL:
+        mode = cursor.execute("PRAGMA auto_vacuum").fetchone()[0]
+        if mode != _AUTO_VACUUM_INCREMENTAL:
+            # auto_vacuum can only be changed on an existing DB by a VACUUM.
+            cursor.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            cursor.execute("VACUUM")
+            return COMPACTION_FULL
+        # executescript steps the pragma to completion; execute() frees one page.
+        cursor.executescript("PRAGMA incremental_vacuum;")
+        return COMPACTION_INCREMENTAL
+    if strategy == COMPACTION_THRESHOLD:
+        page_count = cursor.execute("PRAGMA page_count").fetchone()[0]
+        freelist = cursor.execute("PRAGMA freelist_count").fetchone()[0]
+        if page_count and freelist / page_count > freelist_threshold:
+            cursor.execute("VACUUM")
+            return COMPACTION_FULL
+    return COMPACTION_NONE
+
+
+class _DbJob:
+    """Merged work for one database file."""
+
+    __slots__ = ("path", "tables", "filters", "prunes", "then_delete", "tags")
+
+    def __init__(self, path):
+        self.path = path
+        self.tables = []
+        self.filters = []
+        self.prunes = []  # history_prune.PRUNERS names
+        self.then_delete = []
+        self.tags = []  # caller labels (item keys) of the work merged here
+
+    def delete_statements(self):
+        statements = [f"DELETE FROM {table}" for table in self.tables]
+        statements += [f"DELETE FROM {table} WHERE {where}" for table, where in self.filters]
+        return statements
+
+
+def check_tables(tables, log):
+    """Drop (and report) table names outside the allowlist."""
+    allowed = []
+    for table in tables:
+        if table not in ALLOWED_TABLES:
+            log(f"  [건너뜀] 허용되지 않은 테이블: {table}")
+            continue
+        allowed.append(table)
+    return allowed
+
+
+def check_filters(filters, log):
+    """Drop (and report) (table, where) filters whose table is outside the allowlist."""
+    allowed_tables = set(check_tables([table for table, _ in filters], log))
+    return [(table, where) for table, where in filters if table in allowed_tables]
+
+
+def connect_readonly(db_path, busy_timeout=DEFAULT_BUSY_TIMEOUT):
+    """Open a database read-only so a scan can never modify or create it."""
+    uri = pathlib.Path(os.path.abspath(db_path)).as_uri() + "?mode=ro"
+    return sqlite3.connect(uri, uri=True, timeout=busy_timeout)
+
+
+def count_rows(db_path, tables=(), filters=(), log=print, prunes=(), history_range=None,
+               busy_timeout=DEFAULT_BUSY_TIMEOUT):
+    """Count rows a clear of `tables` and `filters` (and `prunes`) would delete.
+
+    Uses SELECT count(*) on a read-only connection. Missing tables count as
+    zero; a missing, locked or corrupt database returns 0.
+    """
+    if not os.path.exists(db_path):
+        return 0
+    queries = [f"SELECT count(*) FROM {table}" for table in check_tables(tables, log)]
+    queries += [
+        f"SELECT count(*) FROM {table} WHERE {where}" for table, where in check_filters(filters, log)
+    ]
+    total = 0
+    try:
+        conn = connect_readonly(db_path, busy_timeout)
+        try:
+            for sql in queries:
+                try:
+                    total += conn.execute(sql).fetchone()[0]
+                except sqlite3.OperationalError:
+                    pass
+            for name in prunes if history_range else ():
+                try:
+                    total += PRUNERS[name][1](conn, history_range)
+                except sqlite3.OperationalError:
+                    pass
+        finally:
+            conn.close()
+    except (sqlite3.OperationalError, sqlite3.DatabaseError):
+        return 0
+    return total
+
+
+def _add_unique(target, values):
+    for value in values:
+        if value not in target:
+            target.append(value)
+
+
+class SqlitePlan:
+    """Collects table deletions per database file and executes each file once."""
+
+    def __init__(self, log, delete_file, compaction=COMPACTION_FULL,
+                 freelist_threshold=DEFAULT_FREELIST_THRESHOLD, history_range=None,
+                 busy_timeout=DEFAULT_BUSY_TIMEOUT, retry_delays=LOCK_RETRY_DELAYS):
+        if compaction not in COMPACTION_STRATEGIES:
+            raise ValueError(f"unknown compaction strategy: {compaction}")
+        self.log = log
+        self.delete_file = delete_file
+        self.compaction = compaction
+        self.freelist_threshold = freelist_threshold
+        self.history_range = history_range  # required by jobs with prunes
+        self.busy_timeout = busy_timeout
+        self.retry_delays = tuple(retry_delays)
+        self._jobs = {}  # normalized path -> _DbJob, in first-queued order
+
+    def __len__(self):
+        return len(self._jobs)
+
+    def add(self, db_path, tables=(), filters=(), then_delete=(), tag=None, prunes=()):
+        """Queue table clears, filtered deletes and companion files for db_path.
+
+        tables and the table of each (table, where) filter must be in
+        ALLOWED_TABLES; where clauses are fixed SQL owned by the caller.
+        prunes name history_prune.PRUNERS run with the plan's history_range.
+        then_delete files (journals, caches tied to the DB) are removed after
+        the database has been closed, if its session committed (see
+        execute()). tag labels the work for pending_tags()
+        and the on_job_done callback of execute().
+        """
+        key = os.path.normcase(os.path.abspath(db_path))
+        job = self._jobs.get(key)
+        if job is None:
+            job = self._jobs[key] = _DbJob(db_path)
+        _add_unique(job.tables, check_tables(tables, self.log))
+        _add_unique(job.filters, check_filters(filters, self.log))
+        _add_unique(job.prunes, [name for name in prunes if name in PRUNERS])
+        _add_unique(job.then_delete, then_delete)
+        if tag is not None:
+            _add_unique(job.tags, (tag,))
+
+    def pending_tags(self):
+        """{tag: number of queued files carrying it}."""
+        counts = {}
+        for job in self._jobs.values():
+            for tag in job.tags:
+                counts[tag] = counts.get(tag, 0) + 1
+        return counts
+
+    def _execute_job(self, job, cancel=None, result=None):
+        """One session on job's file; pass the previous DbResult when retrying."""
+        if result is None:  # not `or`: a failed DbResult is falsy
+            result = DbResult(job.path)
+        prunes = job.prunes if self.history_range else []
+        if not (job.tables or job.filters or prunes):
+            return result
+        result.attempts += 1
+        result.locked = False
+        start = time.perf_counter()
+        try:
+            # isolation_level=None: transactions are explicit, so VACUUM and
+            # the auto_vacuum pragma run outside of one. timeout is SQLite's
+            # busy timeout: how long to wait for another process's lock.
+            conn = sqlite3.connect(job.path, isolation_level=None, timeout=self.busy_timeout)
+            try:
+                if cancel is not None:
+                    # Aborts a long DELETE or VACUUM soon after cancellation
+                    conn.set_progress_handler(lambda: _stopped(cancel), _CANCEL_POLL_OPS)
+                cursor = conn.cursor()
+                size_before = _db_size(cursor)
+                cursor.execute("BEGIN")
+                rows = 0
+                for sql in job.delete_statements():
+                    if _stopped(cancel):
+                        break
+                    try:
+                        cursor.execute(sql)
+                        rows += max(cursor.rowcount, 0)
+                    except sqlite3.OperationalError as e:
+                        # A missing table is fine; a lock must not pass as "0 rows"
+                        if is_locked_error(e):
+                            raise
+                        if not conn.in_transaction:
+                            # Interrupted by a cancel: SQLite rolled the whole transaction back
+                            rows = 0
+                            break
+                # Keep what was deleted so far; COMMIT itself must not be interrupted
+                conn.set_progress_handler(None, 0)
+                if conn.in_transaction:
+                    cursor.execute("COMMIT")
+                    result.rows_deleted += rows
+                for name in prunes:
+                    if _stopped(cancel):
+                        break
+                    # Batched transactions; a cancel ends the run between batches
+                    result.rows_deleted += PRUNERS[name][0](conn, self.history_range, cancel)
+                if not _stopped(cancel):
+                    if cancel is not None:
+                        conn.set_progress_handler(lambda: _stopped(cancel), _CANCEL_POLL_OPS)
+                    try:
+                        result.compaction = _compact(cursor, self.compaction, self.freelist_threshold)
+                    except sqlite3.OperationalError as e:
+                        # Deletions are committed; a reader holding the file only skips compaction
+                        if not (_stopped(cancel) or is_locked_error(e)):
+                            raise
+                    result.bytes_reclaimed = max(size_before - _db_size(cursor), 0)
+            finally:
+                conn.close()
+            result.ok = True
+        except (sqlite3.OperationalError, sqlite3.DatabaseError) as e:
+            if is_locked_error(e):
+                # Rolled back (or partly pruned); the retry redoes what is left
+                result.locked = True
+            elif not _stopped(cancel):
+                self.log(f"  [건너뜀] DB 열기 실패: {db_label(job.path)}: {e}")
+        result.seconds += time.perf_counter() - start
+        return result
+
+    def _run_job(self, job, results, cancel, on_job_start, on_job_done, final):
+        """Execute one job; False if it was locked and should be retried later."""
+        if on_job_start is not None:
+            on_job_start(job.tags)
+        result = None
+        if os.path.exists(job.path):
+            result = results[job.path] = self._execute_job(job, cancel, results.get(job.path))
+            if result.locked and not _stopped(cancel):
+                if not final:
+                    if result.attempts == 1:
+                        self.log(f"  [대기] DB 잠김: {db_label(job.path)} - 다른 DB를 먼저 정리한 뒤 다시 시도합니다")
+                    return False
+                self.log(
+                    f"  [건너뜀] DB 잠김: {db_label(job.path)} ({result.attempts}회 시도) "
+                    "- 브라우저를 닫고 다시 실행하세요"
+                )
+        # Side files of a DB a browser still holds (or one left half done) must stay
+        if (result is None or (result.ok and not result.locked)) and not _stopped(cancel):
+            for path in job.then_delete:
+                self.delete_file(path)
+        if on_job_done is not None:
+            on_job_done(job.tags, result)
+        return True
+
+    def execute(self, cancel=None, on_job_done=None, on_job_start=None):
+        """Run every queued job once. Returns {db_path: DbResult} for existing DBs.
+
+        When `cancel` fires, the running statement is interrupted and the
+        remaining files are left untouched. Deletions finished before it are
+        committed, unless SQLite rolled the file's transaction back for the
+        interrupt (it does for a DELETE inside one): then none of its table
+        clears are counted, and only rows of already committed prune batches
+        stay deleted.
+        Locked files are retried after the others (see retry_delays).
+        Companion files are only deleted once the database's session has
+        committed (or the database does not exist): never while it is still
+        locked, and not after a cancel.
+        on_job_start(tags) and on_job_done(tags, result) bracket each file
+        (on_job_start again for every retry); result is the file's DbResult,
+        or None if the file does not exist.
+        """
+        results = {}
+        jobs = list(self._jobs.values())
+        self._jobs.clear()
+        retry = []
+        for job in jobs:
+            if _stopped(cancel):
+                break
+            if not self._run_job(job, results, cancel, on_job_start, on_job_done,
+                                 final=not self.retry_delays):
+                retry.append(job)
+        for attempt, delay in enumerate(self.retry_delays, 1):
+            if not retry or _stopped(cancel) or _wait(cancel, delay):
+                break
+            final = attempt == len(self.retry_delays)
+            retry = [
+                job for job in retry
+                if not _stopped(cancel)
+                and not self._run_job(job, results, cancel, on_job_start, on_job_done, final)
+            ]
+        return results
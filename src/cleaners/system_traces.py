@@ -1,124 +1,146 @@
 """System traces cleaners: temp files, prefetch, thumbnails, recycle bin, clipboard."""
 
 import os
-import shutil
-import ctypes
 
+from .base import BaseCleaner
+from .deletion import (
+    MAX_DELETE_WORKERS, delete_dir_contents, format_bytes, format_worker_stats, scan_dir_contents,
+)
 
-def _safe_env_path(*env_vars):
-    for var in env_vars:
-        val = os.environ.get(var, "")
-        if val and os.path.isabs(val):
-            return val
-    return None
 
+def _kept_note(result):
+    return f", {result.kept}개는 정책에 따라 보존" if result.kept else ""
 
-def _is_admin():
-    """Check if the current process has admin privileges."""
-    try:
-        return ctypes.windll.shell32.IsUserAnAdmin()
-    except Exception:
-        return False
 
+def _freed_note(result):
+    return f", {format_bytes(result.bytes_freed)} 확보" if result.bytes_freed else ""
 
-class SystemTracesCleaner:
+
+class SystemTracesCleaner(BaseCleaner):
     """Cleans system-level traces on Windows."""
 
-    def __init__(self, log_callback=None):
-        self.log = log_callback or print
-
-    def _delete_dir_contents(self, dirpath):
-        count = 0
-        if not dirpath or not os.path.isabs(dirpath) or not os.path.exists(dirpath):
-            return count
-        for item in os.listdir(dirpath):
-            full = os.path.join(dirpath, item)
-            try:
-                if os.path.isfile(full):
-                    os.remove(full)
-                    count += 1
-                elif os.path.isdir(full):
-                    shutil.rmtree(full, onerror=lambda fn, p, ei: None)
-                    count += 1
-            except PermissionError:
-                pass
-            except Exception:
-                pass
-        return count
+    RESOURCES = {
+        "temp_files": ("dir:%TEMP%",),
+        "windows_temp": ("dir:%SYSTEMROOT%/Temp",),
+        "prefetch": ("dir:%SYSTEMROOT%/Prefetch",),
+        "thumbnail_cache": ("dir:%LOCALAPPDATA%/Microsoft/Windows/Explorer",),
+        "recycle_bin": ("shell:recycle_bin",),
+        "clipboard": ("shell:clipboard",),
+    }
+
+    def __init__(self, log_callback=None, delete_workers=None, backend=None):
+        super().__init__(log_callback, backend)
+        self.delete_workers = delete_workers or MAX_DELETE_WORKERS
+
+    def _delete_dir_contents(self, dirpath, match=None, policy=None):
+        """Delete directory contents silently; in-use temp files are expected.
+
+        policy (a TempPolicy) limits the deletion to the entries it selects;
+        the journal is not used then, as kept entries age into the selection.
+        """
+        if not dirpath or not os.path.isabs(dirpath):
+            return delete_dir_contents(None)
+        if not policy and self._journal_unchanged(dirpath):
+            return delete_dir_contents(None)
+        selection = None
+        if policy and os.path.isdir(dirpath):
+            if not self.scan_only:
+                self.log(f"  [정책] {policy.describe()}")
+            selection = policy.selection(dirpath, cancel=self.cancel_token)
+        if self.scan_only:
+            result = scan_dir_contents(dirpath, match=match, cancel=self.cancel_token, policy=selection)
+            self._tally_delete(result)
+            self._checkpoint()
+            return result
+        result = self._record_delete(delete_dir_contents(
+            dirpath, match=match, workers=self.delete_workers, cancel=self.cancel_token,
+            progress=self._file_progress, policy=selection,
+        ))
+        summary = format_worker_stats(result)
+        if summary:
+            self.log(f"  [병렬] {os.path.basename(dirpath)}: {summary}")
+        if not policy:
+            self._journal_record(dirpath, match)
+        self._checkpoint()
+        return result
 
     def clean_temp_files(self):
         """Clear user temp directory (%TEMP%)."""
         self.log("[시스템] 사용자 임시 파일 삭제 중...")
-        temp_dir = _safe_env_path("TEMP", "TMP")
+        temp_dir = self._env_path("TEMP", "TMP")
         if not temp_dir:
             self.log("  [건너뜀] TEMP 환경변수 없음")
             return
-        count = self._delete_dir_contents(temp_dir)
-        self.log(f"  완료: {count}개 임시 파일 삭제됨")
+        result = self._delete_dir_contents(temp_dir, policy=self.temp_policy)
+        self.log(f"  완료: {result.removed}개 임시 파일 삭제됨{_freed_note(result)}{_kept_note(result)}")
 
     def clean_windows_temp(self):
         """Clear Windows temp directory."""
         self.log("[시스템] Windows 임시 파일 삭제 중...")
-        sysroot = _safe_env_path("SYSTEMROOT") or r"C:\Windows"
+        sysroot = self._env_path("SYSTEMROOT") or r"C:\Windows"
         win_temp = os.path.join(sysroot, "Temp")
-        count = self._delete_dir_contents(win_temp)
-        self.log(f"  완료: {count}개 Windows 임시 파일 삭제됨")
+        result = self._delete_dir_contents(win_temp, policy=self.temp_policy)
+        self.log(f"  완료: {result.removed}개 Windows 임시 파일 삭제됨{_freed_note(result)}{_kept_note(result)}")
 
     def clean_prefetch(self):
         """Clear Prefetch files (requires admin)."""
         self.log("[시스템] 프리패치 파일 삭제 중...")
         self.log("  [주의] 프리패치 삭제 후 다음 재부팅 및 앱 실행이 일시적으로 느릴 수 있습니다")
-        if not _is_admin():
+        if not self.backend.is_admin():
             self.log("  [건너뜀] 관리자 권한이 필요합니다")
             return
-        sysroot = _safe_env_path("SYSTEMROOT") or r"C:\Windows"
+        sysroot = self._env_path("SYSTEMROOT") or r"C:\Windows"
         prefetch_dir = os.path.join(sysroot, "Prefetch")
-        count = self._delete_dir_contents(prefetch_dir)
-        self.log(f"  완료: {count}개 프리패치 파일 삭제됨")
+        result = self._delete_dir_contents(prefetch_dir)
+        self.log(f"  완료: {result.removed}개 프리패치 파일 삭제됨{_freed_note(result)}")
 
     def clean_thumbnail_cache(self):
         """Clear Windows thumbnail cache."""
         self.log("[시스템] 썸네일 캐시 삭제 중...")
-        localappdata = _safe_env_path("LOCALAPPDATA")
+        localappdata = self._env_path("LOCALAPPDATA")
         if not localappdata:
             self.log("  [건너뜀] LOCALAPPDATA 환경변수 없음")
             return
         thumb_dir = os.path.join(localappdata, "Microsoft", "Windows", "Explorer")
-        count = 0
-        if os.path.exists(thumb_dir):
-            for item in os.listdir(thumb_dir):
-                if item.startswith("thumbcache_") or item.startswith("iconcache_"):
-                    full = os.path.join(thumb_dir, item)
-                    try:
-                        os.remove(full)
-                        count += 1
-                    except PermissionError:
-                        pass
-        self.log(f"  완료: {count}개 썸네일 캐시 삭제됨")
+        result = self._delete_dir_contents(
+            thumb_dir,
+            match=lambda name: name.startswith("thumbcache_") or name.startswith("iconcache_"),
+        )
+        self.log(f"  완료: {result.removed}개 썸네일 캐시 삭제됨{_freed_note(result)}")
 
     def clean_recycle_bin(self):
         """Empty the Recycle Bin."""
         self.log("[시스템] 휴지통 비우는 중...")
+        if self.scan_only:
+            info = self.backend.recycle_bin_info()
+            if info is not None:
+                self._tally(items=info[0], size=info[1])
+            return
         try:
-            ctypes.windll.shell32.SHEmptyRecycleBinW(None, None, 0x0007)
-            self.log("  완료: 휴지통 비워짐")
+            freed = self.backend.empty_recycle_bin()
+            if freed is None:
+                self.log("  완료: 휴지통 비워짐")
+            else:
+                self._result().add(files=freed[0], size=freed[1])
+                self.log(f"  완료: 휴지통 비워짐 ({freed[0]}개, {format_bytes(freed[1])})")
         except Exception as e:
-            self.log(f"  [오류] 휴지통: {e}")
+            self._error(f"휴지통: {e}")
 
     def clean_clipboard(self):
         """Clear clipboard contents."""
         self.log("[시스템] 클립보드 내용 삭제 중...")
+        if self.scan_only:
+            if self.backend.clipboard_has_data():
+                self._tally(items=1)
+            return
         try:
-            ctypes.windll.user32.OpenClipboard(0)
-            ctypes.windll.user32.EmptyClipboard()
-            ctypes.windll.user32.CloseClipboard()
+            self.backend.clear_clipboard()
             self.log("  완료: 클립보드 비워짐")
         except Exception as e:
-            self.log(f"  [오류] 클립보드: {e}")
+            self._error(f"클립보드: {e}")
 
-    def run(self, selected_items):
-        """Run selected cleanup tasks."""
-        method_map = {
+    def _method_map(self):
+        return {
             "temp_files": self.clean_temp_files,
             "windows_temp": self.clean_windows_temp,
             "prefetch": self.clean_prefetch,
@@ -126,6 +148,3 @@ class SystemTracesCleaner:
             "recycle_bin": self.clean_recycle_bin,
             "clipboard": self.clean_clipboard,
         }
-        for item in selected_items:
-            if item in method_map:
-                method_map[item]()
@@ -0,0 +1,149 @@
+"""Selective temp cleanup: which entries of a temp folder to remove.
+
+By default temp cleanup removes everything it can, including files that a
+running installer is still writing (which then fail with PermissionError
+one by one). A TempPolicy narrows that down:
+
+    older_than   only entries not modified in the last N seconds; a recent
+                 directory is kept whole without being listed
+    larger_than  also entries of at least N bytes, however recent
+    keep_newest  keep the most recently modified N bytes of files
+
+Files matching either older_than or larger_than are removed. The decision
+is made per entry during the deletion walk from DirEntry.stat() (free on
+Windows, where FindNextFile already returned it), so the first two rules
+add no walk of their own. keep_newest cannot be decided before the whole
+folder has been seen, so it first measures it with one scan-only pass:
+file sizes are summed per age bucket (a minute wide for fresh files,
+growing 5% per bucket, so ten years fit in about 300 buckets and memory
+does not grow with the folder) and the youngest buckets that fit in the
+budget are kept. The budget is a hard limit: the bucket that would go
+over it is removed whole, so the kept files add up to at most keep_newest
+(rounded down to a bucket), and directories are listed rather than kept
+whole by their own mtime, as a recent directory can hold old files.
+
+With both older_than and keep_newest, keep_newest wins: a file modified in
+the last N seconds is kept only if it also falls within the newest
+keep_newest bytes.
+"""
+
+import math
+import time
+
+from .deletion import format_bytes, iter_files
+
+_HOUR = 3600
+_BUCKET_SECONDS = 60   # width of the youngest age bucket
+_BUCKET_GROWTH = 1.05  # each older bucket is this much wider
+
+
+class TempPolicy:
+    """User-facing settings of a selective temp cleanup."""
+
+    __slots__ = ("older_than", "larger_than", "keep_newest")
+
+    def __init__(self, older_than=None, larger_than=None, keep_newest=None):
+        self.older_than = older_than    # seconds
+        self.larger_than = larger_than  # bytes
+        self.keep_newest = keep_newest  # bytes
+
+    def __bool__(self):
+        return bool(self.older_than or self.larger_than or self.keep_newest)
+
+    def describe(self):
+        """Korean one-line summary for the log."""
+        parts = []
+        if self.older_than:
+            hours = self.older_than / _HOUR
+            parts.append(f"{hours:g}시간 이내 수정 항목 보존")
+        if self.larger_than:
+            parts.append(f"{format_bytes(self.larger_than)} 이상은 삭제")
+        if self.keep_newest:
+            parts.append(f"최근 {format_bytes(self.keep_newest)} 보존")
+        return ", ".join(parts) if parts else "전체 삭제"
+
+    def to_dict(self):
+        return {
+            "older_than_hours": self.older_than / _HOUR if self.older_than else None,
+            "larger_than_bytes": self.larger_than,
+            "keep_newest_bytes": self.keep_newest,
+        }
+
+    def selection(self, dirpath, cancel=None, now=None):
+        """The EntrySelection for one folder, with its mtime cutoff fixed now."""
+        now = time.time() if now is None else now
+        cutoff = now - self.older_than if self.older_than else None
+        if self.keep_newest:
+            newest = newest_cutoff(dirpath, self.keep_newest, cancel, now)
+            if newest is None:
+                newest = float("-inf")  # everything fits: every file is "recent"
+            # The later cutoff keeps less: the budget caps what older_than keeps
+            cutoff = newest if cutoff is None else max(cutoff, newest)
+        return EntrySelection(cutoff, self.larger_than, descend=bool(self.keep_newest))
+
+    def __repr__(self):
+        return (
+            f"TempPolicy(older_than={self.older_than}, larger_than={self.larger_than}, "
+            f"keep_newest={self.keep_newest})"
+        )
+
+
+class EntrySelection:
+    """Per-entry decision handed to the deletion engine (policy= argument)."""
+
+    __slots__ = ("cutoff", "larger_than", "descend")
+
+    def __init__(self, cutoff=None, larger_than=None, descend=False):
+        self.cutoff = cutoff            # entries modified at or after it are recent
+        self.larger_than = larger_than
+        self.descend = descend          # decide recent directories file by file
+
+    def keeps(self, entry, is_dir):
+        """True if `entry` stays. A kept directory is not descended into."""
+        try:
+            st = entry.stat(follow_symlinks=False)
+        except OSError:
+            return True  # vanished or unreadable: nothing to decide on
+        recent = self.cutoff is not None and st.st_mtime >= self.cutoff
+        if is_dir:
+            # Only a size rule or a byte budget needs to look inside a recent directory
+            return recent and not (self.larger_than or self.descend)
+        if self.larger_than and st.st_size >= self.larger_than:
+            return False
+        if self.cutoff is None:
+            return bool(self.larger_than)  # size rule only: small files stay
+        return recent
+
+
+def _age_bucket(age):
+    if age < _BUCKET_SECONDS:
+        return 0
+    return 1 + int(math.log(age / _BUCKET_SECONDS, _BUCKET_GROWTH))
+
+
+def _bucket_start(bucket):
+    """Youngest age that falls into `bucket`."""
+    return 0 if bucket == 0 else _BUCKET_SECONDS * _BUCKET_GROWTH ** (bucket - 1)
+
+
+def newest_cutoff(dirpath, budget, cancel=None, now=None):
+    """mtime from which the newest files of dirpath fit in `budget` bytes.
+
+    Files modified at or after it add up to at most `budget`; the bucket
+    that would overflow is left out whole. Returns None when everything fits.
+    """
+    now = time.time() if now is None else now
+    per_bucket = {}
+    for entry in iter_files(dirpath, cancel):
+        try:
+            st = entry.stat(follow_symlinks=False)
+        except OSError:
+            continue
+        bucket = _age_bucket(max(now - st.st_mtime, 0))
+        per_bucket[bucket] = per_bucket.get(bucket, 0) + st.st_size
+    total = 0
+    for bucket in sorted(per_bucket):
+        total += per_bucket[bucket]
+        if total > budget:
+            return now - _bucket_start(bucket)
+    return None
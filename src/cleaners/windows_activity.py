@@ -1,78 +1,70 @@
 """Windows search history, activity timeline, recent files, jump lists cleaners."""
 
 import os
-import shutil
 
+from .base import BaseCleaner
+from .deletion import delete_dir_contents, error_logger, scan_dir_contents
 
-def _safe_env_path(*env_vars):
-    for var in env_vars:
-        val = os.environ.get(var, "")
-        if val and os.path.isabs(val):
-            return val
-    return None
 
+def _is_activities_cache(name):
+    return name.startswith("ActivitiesCache") and (
+        name.endswith(".db") or name.endswith(".db-wal") or name.endswith(".db-shm")
+    )
 
-class WindowsActivityCleaner:
-    """Cleans Windows activity traces."""
 
-    def __init__(self, log_callback=None):
-        self.log = log_callback or print
+class WindowsActivityCleaner(BaseCleaner):
+    """Cleans Windows activity traces."""
 
-    def _delete_dir_contents(self, dirpath):
-        count = 0
-        if not dirpath or not os.path.isabs(dirpath) or not os.path.exists(dirpath):
-            return count
-        for item in os.listdir(dirpath):
-            full = os.path.join(dirpath, item)
-            try:
-                if os.path.isfile(full):
-                    os.remove(full)
-                    count += 1
-                elif os.path.isdir(full):
-                    shutil.rmtree(full, onerror=lambda fn, p, ei: self.log(f"  [오류] 삭제 실패: {os.path.basename(p)}"))
-                    count += 1
-            except PermissionError:
-                self.log(f"  [건너뜀] 사용 중: {os.path.basename(full)}")
-            except Exception as e:
-                self.log(f"  [오류] {os.path.basename(full)}: {e}")
-        return count
+    RESOURCES = {
+        "search_history": (
+            "reg:HKCU/Software/Microsoft/Windows/CurrentVersion/Search/Flighting",
+            "dir:%LOCALAPPDATA%/Packages/Microsoft.Windows.Search_cw5n1h2txyewy/LocalState/DeviceSearchCache",
+        ),
+        "activity_timeline": ("dir:%LOCALAPPDATA%/ConnectedDevicesPlatform",),
+        "recent_files": ("dir:%APPDATA%/Microsoft/Windows/Recent",),
+        "jump_lists": (
+            "dir:%APPDATA%/Microsoft/Windows/Recent/AutomaticDestinations",
+            "dir:%APPDATA%/Microsoft/Windows/Recent/CustomDestinations",
+        ),
+        "run_history": ("reg:HKCU/Software/Microsoft/Windows/CurrentVersion/Explorer/RunMRU",),
+        "explorer_history": ("reg:HKCU/Software/Microsoft/Windows/CurrentVersion/Explorer/TypedPaths",),
+    }
+
+    def __init__(self, log_callback=None, backend=None):
+        super().__init__(log_callback, backend)
+        self._on_delete_error = error_logger(self.log)
+
+    def _delete_dir_contents(self, dirpath, match=None, quiet=False):
+        if not dirpath or not os.path.isabs(dirpath):
+            return delete_dir_contents(None)
+        if self.scan_only:
+            result = scan_dir_contents(dirpath, match=match, cancel=self.cancel_token)
+            self._tally_delete(result)
+            self._checkpoint()
+            return result
+        if self._journal_unchanged(dirpath):
+            return delete_dir_contents(None)
+        on_error = None if quiet else self._on_delete_error
+        result = self._record_delete(delete_dir_contents(
+            dirpath, on_error=on_error, match=match, cancel=self.cancel_token,
+            progress=self._file_progress,
+        ))
+        self._journal_record(dirpath, match)
+        self._checkpoint()
+        return result
 
     def _delete_registry_values_by_name(self, hive, key_path, value_names=None):
-        """Delete specific values (or all if value_names is None) under a registry key."""
-        try:
-            import winreg
-            with winreg.OpenKey(hive, key_path, 0, winreg.KEY_ALL_ACCESS) as key:
-                if value_names:
-                    count = 0
-                    for name in value_names:
-                        try:
-                            winreg.DeleteValue(key, name)
-                            count += 1
-                        except FileNotFoundError:
-                            pass
-                    return count > 0
-                else:
-                    while True:
-                        try:
-                            name, _, _ = winreg.EnumValue(key, 0)
-                            winreg.DeleteValue(key, name)
-                        except OSError:
-                            break
-            return True
-        except FileNotFoundError:
-            return False
-        except PermissionError:
-            self.log(f"  [건너뜀] 권한 부족: {key_path}")
-            return False
-        except ImportError:
-            self.log("  [건너뜀] winreg 모듈 없음 (Windows 전용)")
-            return False
+        """Delete specific values (or all if value_names is None) under a registry key.
+
+        Returns the registry.RegistryResult; .values is what was deleted (or counted).
+        """
+        return self._clear_registry(hive, key_path, names=value_names or None)
 
     def clean_search_history(self):
         """Clear Windows Search history (history values only, not settings)."""
         self.log("[Windows] 검색 기록 삭제 중...")
         try:
-            import winreg
+            winreg = self._winreg()
             # Only delete search history-related values, not configuration settings
             self._delete_registry_values_by_name(
                 winreg.HKEY_CURRENT_USER,
@@ -80,7 +72,7 @@ class WindowsActivityCleaner:
             )
 
             # Clear search cache data
-            localappdata = _safe_env_path("LOCALAPPDATA")
+            localappdata = self._env_path("LOCALAPPDATA")
             if localappdata:
                 search_data = os.path.join(
                     localappdata,
@@ -92,65 +84,50 @@ class WindowsActivityCleaner:
 
             self.log("  완료: 검색 기록 정리됨")
         except Exception as e:
-            self.log(f"  [오류] 검색 기록: {e}")
+            self._error(f"검색 기록: {e}")
 
     def clean_activity_timeline(self):
         """Clear Windows Activity Timeline / Activity History."""
         self.log("[Windows] 활동 타임라인 삭제 중...")
         try:
-            localappdata = _safe_env_path("LOCALAPPDATA")
+            localappdata = self._env_path("LOCALAPPDATA")
             if not localappdata:
                 self.log("  [건너뜀] LOCALAPPDATA 환경변수 없음")
                 return
             activity_dir = os.path.join(localappdata, "ConnectedDevicesPlatform")
             count = 0
-            if os.path.exists(activity_dir):
-                for item in os.listdir(activity_dir):
-                    full = os.path.join(activity_dir, item)
-                    if os.path.isdir(full):
-                        for f in os.listdir(full):
-                            if f.startswith("ActivitiesCache") and (
-                                f.endswith(".db") or f.endswith(".db-wal") or f.endswith(".db-shm")
-                            ):
-                                try:
-                                    os.remove(os.path.join(full, f))
-                                    count += 1
-                                except PermissionError:
-                                    pass
+            if os.path.isdir(activity_dir):
+                with os.scandir(activity_dir) as it:
+                    subdirs = [e.path for e in it if e.is_dir(follow_symlinks=False)]
+                for full in subdirs:
+                    count += self._delete_dir_contents(
+                        full, match=_is_activities_cache, quiet=True
+                    ).removed
 
             self.log(f"  완료: {count}개 항목 삭제됨")
         except Exception as e:
-            self.log(f"  [오류] 활동 타임라인: {e}")
+            self._error(f"활동 타임라인: {e}")
 
     def clean_recent_files(self):
         """Clear Recent files list."""
         self.log("[Windows] 최근 파일 목록 삭제 중...")
-        appdata = _safe_env_path("APPDATA")
+        appdata = self._env_path("APPDATA")
         if not appdata:
             self.log("  [건너뜀] APPDATA 환경변수 없음")
             return
         recent_dir = os.path.join(appdata, "Microsoft", "Windows", "Recent")
-        count = 0
-        if os.path.exists(recent_dir):
-            for item in os.listdir(recent_dir):
-                if item.lower() in ("automaticdestinations", "customdestinations"):
-                    continue  # handled separately in clean_jump_lists
-                full = os.path.join(recent_dir, item)
-                try:
-                    if os.path.isfile(full):
-                        os.remove(full)
-                        count += 1
-                    elif os.path.isdir(full):
-                        shutil.rmtree(full, onerror=lambda fn, p, ei: None)
-                        count += 1
-                except PermissionError:
-                    pass
+        # Jump list folders are handled separately in clean_jump_lists
+        count = self._delete_dir_contents(
+            recent_dir,
+            match=lambda name: name.lower() not in ("automaticdestinations", "customdestinations"),
+            quiet=True,
+        ).removed
         self.log(f"  완료: {count}개 최근 파일 항목 삭제됨")
 
     def clean_jump_lists(self):
         """Clear Jump Lists (taskbar recent/frequent)."""
         self.log("[Windows] 점프 목록 삭제 중...")
-        appdata = _safe_env_path("APPDATA")
+        appdata = self._env_path("APPDATA")
         if not appdata:
             self.log("  [건너뜀] APPDATA 환경변수 없음")
             return
@@ -160,38 +137,39 @@ class WindowsActivityCleaner:
             os.path.join(appdata, "Microsoft", "Windows", "Recent", "CustomDestinations"),
         ]
         for jd in jump_dirs:
-            count += self._delete_dir_contents(jd)
+            count += self._delete_dir_contents(jd).removed
         self.log(f"  완료: {count}개 점프 목록 삭제됨")
 
     def clean_run_history(self):
         """Clear Run dialog history from registry."""
         self.log("[Windows] 실행(Run) 기록 삭제 중...")
         try:
-            import winreg
+            winreg = self._winreg()
             key_path = r"Software\Microsoft\Windows\CurrentVersion\Explorer\RunMRU"
-            if self._delete_registry_values_by_name(winreg.HKEY_CURRENT_USER, key_path):
-                self.log("  완료: 실행 기록 삭제됨")
+            result = self._delete_registry_values_by_name(winreg.HKEY_CURRENT_USER, key_path)
+            if result.values:
+                self.log(f"  완료: 실행 기록 {result.values}개 삭제됨 (레지스트리 호출 {result.ops}회)")
             else:
                 self.log("  완료: 삭제할 기록 없음")
         except Exception as e:
-            self.log(f"  [오류] 실행 기록: {e}")
+            self._error(f"실행 기록: {e}")
 
     def clean_explorer_history(self):
         """Clear Explorer address bar history from registry."""
         self.log("[Windows] 탐색기 주소 기록 삭제 중...")
         try:
-            import winreg
+            winreg = self._winreg()
             key_path = r"Software\Microsoft\Windows\CurrentVersion\Explorer\TypedPaths"
-            if self._delete_registry_values_by_name(winreg.HKEY_CURRENT_USER, key_path):
-                self.log("  완료: 탐색기 주소 기록 삭제됨")
+            result = self._delete_registry_values_by_name(winreg.HKEY_CURRENT_USER, key_path)
+            if result.values:
+                self.log(f"  완료: 탐색기 주소 기록 {result.values}개 삭제됨 (레지스트리 호출 {result.ops}회)")
             else:
                 self.log("  완료: 삭제할 기록 없음")
         except Exception as e:
-            self.log(f"  [오류] 탐색기 주소 기록: {e}")
+            self._error(f"탐색기 주소 기록: {e}")
 
-    def run(self, selected_items):
-        """Run selected cleanup tasks."""
-        method_map = {
+    def _method_map(self):
+        return {
             "search_history": self.clean_search_history,
             "activity_timeline": self.clean_activity_timeline,
             "recent_files": self.clean_recent_files,
@@ -199,6 +177,3 @@ class WindowsActivityCleaner:
             "run_history": self.clean_run_history,
             "explorer_history": self.clean_explorer_history,
         }
-        for item in selected_items:
-            if item in method_map:
-                method_map[item]()
@@ -0,0 +1,104 @@
+"""Queue-backed log sink shared by the cleanup worker threads and the GUI.
+
+Workers call write() (a lock-free queue put); the Tk thread calls drain()
+on a fixed timer and inserts the whole batch into the textbox in one go,
+so a run that logs thousands of lines no longer floods the event loop.
+Every drained line is also appended to a per-run log file, which keeps the
+full log while the textbox only shows the most recent lines.
+"""
+
+import os
+import queue
+import tempfile
+import time
+
+LOG_DIR_NAME = os.path.join("MyPcNow", "logs")
+KEEP_LOG_FILES = 10
+
+
+def default_log_dir():
+    """%LOCALAPPDATA%\\MyPcNow\\logs, or the temp directory if it is unset."""
+    base = os.environ.get("LOCALAPPDATA") or tempfile.gettempdir()
+    return os.path.join(base, LOG_DIR_NAME)
+
+
+def _run_stamp(name):
+    """'20260101_120000' for mypcnow_20260101_120000.log and its sidecar files."""
+    return name[len("mypcnow_"):len("mypcnow_") + 15]
+
+
+def _prune_old_logs(log_dir, keep):
+    """Keep the files of the newest `keep` runs (log plus sidecars)."""
+    try:
+        names = [n for n in os.listdir(log_dir) if n.startswith("mypcnow_")]
+    except OSError:
+        return
+    stamps = sorted({_run_stamp(name) for name in names})
+    old = set(stamps[:-keep] if keep else stamps)
+    for name in names:
+        if _run_stamp(name) in old:
+            try:
+                os.remove(os.path.join(log_dir, name))
+            except OSError:
+                pass
+
+
+class LogSink:
+    """Thread-safe message queue with an optional full-log file."""
+
+    def __init__(self, log_dir=None):
+        self.log_dir = log_dir or default_log_dir()
+        self.log_path = None
+        self._queue = queue.SimpleQueue()
+        self._file = None
+
+    def start_file(self):
+        """Start a new log file for the next run; returns its path (None if unavailable)."""
+        self.close_file()
+        try:
+            os.makedirs(self.log_dir, exist_ok=True)
+            _prune_old_logs(self.log_dir, KEEP_LOG_FILES - 1)
+            path = os.path.join(self.log_dir, time.strftime("mypcnow_%Y%m%d_%H%M%S.log"))
+            self._file = open(path, "a", encoding="utf-8")
+            self.log_path = path
+        except OSError:
+            self._file = None
+            self.log_path = None
+        return self.log_path
+
+    def sidecar_path(self, suffix):
+        """Path next to the current log file, e.g. suffix '_metrics.json' (None without a file)."""
+        if not self.log_path:
+            return None
+        return os.path.splitext(self.log_path)[0] + suffix
+
+    def write(self, message):
+        """Queue a message; safe to call from any thread."""
+        self._queue.put(message)
+
+    def drain(self, limit=None):
+        """Take up to `limit` queued messages (all if None) and append them to the file."""
+        messages = []
+        while limit is None or len(messages) < limit:
+            try:
+                messages.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        if messages and self._file is not None:
+            try:
+                self._file.write("\n".join(messages) + "\n")
+                self._file.flush()
+            except OSError:
+                pass
+        return messages
+
+    def close_file(self):
+        """Write whatever is still queued to the file and close it."""
+        if self._file is None:
+            return
+        self.drain()
+        try:
+            self._file.close()
+        except OSError:
+            pass
+        self._file = None
@@ -0,0 +1,143 @@
+"""Locked browser databases: busy timeout, retry queue and skip reporting.
+
+A second Python process opens a History DB and holds an exclusive lock
+on it, the way a running browser does, while SqlitePlan cleans it
+together with an unlocked DB.
+"""
+
+import os
+import sqlite3
+import subprocess
+import sys
+
+import pytest
+
+from cleaners.sqlite_session import SqlitePlan
+
+ROWS = 2000
+BUSY_TIMEOUT = 0.2
+RETRY_DELAYS = (0.4, 0.8)
+
+# Runs in the lock holder process: lock, report, hold until stdin closes, release.
+_HOLDER = """
+import sqlite3, sys
+conn = sqlite3.connect(sys.argv[1], isolation_level=None)
+conn.execute("BEGIN EXCLUSIVE")
+print("locked", flush=True)
+sys.stdin.read()
+conn.execute("COMMIT")
+conn.close()
+"""
+
+
+def build_db(path):
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE urls (id INTEGER PRIMARY KEY, url TEXT, title TEXT)")
+    conn.executemany(
+        "INSERT INTO urls (url, title) VALUES (?, ?)",
+        ((f"https://example.com/{i}", f"page {i}") for i in range(ROWS)),
+    )
+    conn.commit()
+    conn.close()
+
+
+def row_count(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM urls").fetchone()[0]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def dbs(tmp_path):
+    """(locked DB, its companion file, free DB), all populated."""
+    locked_db = str(tmp_path / "Locked History")
+    free_db = str(tmp_path / "Free History")
+    build_db(locked_db)
+    build_db(free_db)
+    companion = tmp_path / "Locked History-journal-cache"
+    companion.write_bytes(b"x")
+    return locked_db, str(companion), free_db
+
+
+@pytest.fixture
+def hold_lock():
+    """Start a holder process on a path; returns a function that releases it."""
+    holders = []
+
+    def start(path):
+        holder = subprocess.Popen(
+            [sys.executable, "-c", _HOLDER, path],
+            stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True,
+        )
+        holders.append(holder)
+        assert holder.stdout.readline().strip() == "locked", "lock holder failed to start"
+
+        def release():
+            holder.stdin.close()
+            holder.wait(timeout=10)
+        return release
+
+    yield start
+    for holder in holders:
+        if holder.poll() is None:
+            holder.kill()
+            holder.wait()
+
+
+def make_plan(log, locked_db, companion, free_db):
+    plan = SqlitePlan(
+        log.append, delete_file=os.remove,
+        busy_timeout=BUSY_TIMEOUT, retry_delays=RETRY_DELAYS,
+    )
+    # Locked DB first: it must not hold up the one queued after it
+    plan.add(locked_db, ["urls"], then_delete=[companion], tag="locked")
+    plan.add(free_db, ["urls"], tag="free")
+    return plan
+
+
+def test_held_lock_is_retried_then_skipped_and_left_intact(dbs, hold_lock):
+    locked_db, companion, free_db = dbs
+    log, done = [], []
+    plan = make_plan(log, locked_db, companion, free_db)
+    release = hold_lock(locked_db)
+
+    results = plan.execute(on_job_done=lambda tags, result: done.append(tags[0]))
+    release()
+
+    result = results[locked_db]
+    assert done == ["free", "locked"]
+    assert row_count(free_db) == 0
+    assert not result.ok
+    assert result.locked
+    assert result.attempts == len(RETRY_DELAYS) + 1
+    assert row_count(locked_db) == ROWS
+    assert os.path.exists(companion)
+    assert any("[대기] DB 잠김" in line for line in log)
+    assert any("[건너뜀] DB 잠김" in line for line in log)
+
+
+def test_released_lock_is_cleaned_on_retry(dbs, hold_lock):
+    locked_db, companion, free_db = dbs
+    log, done = [], []
+    plan = make_plan(log, locked_db, companion, free_db)
+    release = hold_lock(locked_db)
+
+    def on_job_done(tags, result):
+        done.append(tags[0])
+        if tags == ["free"]:
+            # Let go while the locked DB waits for its first retry
+            release()
+
+    results = plan.execute(on_job_done=on_job_done)
+
+    result = results[locked_db]
+    assert done == ["free", "locked"]
+    assert result.ok
+    assert not result.locked
+    assert result.attempts == 2
+    assert result.rows_deleted == ROWS
+    assert row_count(locked_db) == 0
+    assert not os.path.exists(companion)
+    assert not any("[건너뜀]" in line for line in log)